@@ -7,11 +7,18 @@ This script analyzes Notion database entries from the past 3 weeks to:
 2. Calculate statistics on each filter's trigger rate
 3. Identify time-based patterns
 4. Generate recommendations for filter adjustments
+
+The default columnar mode reads structured gate columns from the run
+history store (falling back to a concurrent Notion export) and adds filter
+co-occurrence and threshold what-if curves; ``--mode legacy`` keeps the
+original page-by-page Summary parsing.
 """
 
 import sys
 import os
 import json
+import time
+import argparse
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
@@ -24,6 +31,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src
 from notion_client import Client
 from src.utils.config import config
 from src.utils.logger import get_logger
+from src.analysis import filter_analytics
 
 logger = get_logger(__name__)
 
@@ -450,23 +458,198 @@ class NotionFilterAnalyzer:
         return None
 
 
+class ColumnarFilterAnalyzer(NotionFilterAnalyzer):
+    """Filter analytics over run-history columns, with vectorized groupby."""
+    
+    def __init__(self, pair: Optional[str] = None, source: str = "auto", history_store=None):
+        """
+        Initialize the analyzer.
+        
+        Args:
+            pair: Only analyze this pair (all pairs when omitted)
+            source: "history", "notion", or "auto" (history, then Notion if empty)
+            history_store: RunHistoryStore to read (created from config if omitted)
+        """
+        self.jst = pytz.timezone("Asia/Tokyo")
+        self.pair = pair
+        self.source = source
+        self.history_store = history_store
+        self.filter_thresholds = {
+            "atr_min": filter_analytics.THRESHOLDS["atr_min"],
+            "spread_max": filter_analytics.THRESHOLDS["spread_max"],
+            "buildup_min_width": filter_analytics.THRESHOLDS["buildup_min_width"],
+            "buildup_min_bars": filter_analytics.THRESHOLDS["buildup_min_bars"],
+            "news_window_hours": [9, 15, 22]  # JST
+        }
+    
+    def load_runs(self, weeks_back: int) -> Tuple[pd.DataFrame, str]:
+        """
+        Load the gate columns of recent runs.
+        
+        Args:
+            weeks_back: Number of weeks to look back
+            
+        Returns:
+            Tuple of (runs frame, source actually used)
+        """
+        end = datetime.now(self.jst).date()
+        start = end - timedelta(weeks=weeks_back)
+        
+        if self.source in ("auto", "history"):
+            if self.history_store is None:
+                from src.io.history import RunHistoryStore
+                self.history_store = RunHistoryStore()
+            df = self.history_store.read_runs_with_outcomes(
+                self.pair, start, end,
+                columns=filter_analytics.COLUMNS + ["pair", "date"]
+            )
+            if not df.empty or self.source == "history":
+                return df, "history"
+        
+        from src.io.notion_batch import NotionBatchIO
+        pages = NotionBatchIO().query_date_range(config.notion_db_id, start, end)
+        df = filter_analytics.frame_from_pages(pages)
+        if self.pair and not df.empty:
+            df = df[df["pair"] == self.pair]
+        return df, "notion"
+    
+    def run_analysis(self, weeks_back: int = 3) -> Dict:
+        """
+        Run the columnar filter analysis.
+        
+        Args:
+            weeks_back: Number of weeks to analyze
+            
+        Returns:
+            Results in the legacy layout plus ``co_occurrence`` and ``what_if``
+        """
+        logger.info(f"Starting columnar filter analysis for past {weeks_back} weeks")
+        
+        df, source = self.load_runs(weeks_back)
+        if df.empty:
+            logger.error("No runs found")
+            return {"error": "No runs found"}
+        
+        started = time.perf_counter()
+        report = filter_analytics.summarize(df)
+        
+        # Legacy layout: counts and percentages over rejected runs
+        bits = filter_analytics.reason_bits(df)
+        rejected = bits[bits.any(axis=1)]
+        counts = rejected.sum()
+        percentage = (counts / max(len(rejected), 1) * 100).round(1)
+        averages = report["averages_when_rejected"]
+        hours = df["minute_jst"] // 60
+        no_trade = df["setup"] == "No-Trade"
+        no_trade_hourly = hours[no_trade].value_counts().sort_index()
+        
+        analysis = {
+            "source": source,
+            "total_entries": len(df),
+            "no_trade_entries": int(no_trade.sum()),
+            "trade_entries": int((~no_trade).sum()),
+            "filter_triggers": {
+                "atr_violations": {
+                    "count": int(counts["atr"]),
+                    "percentage": float(percentage["atr"]),
+                    "avg_value": averages["atr"],
+                    "threshold": self.filter_thresholds["atr_min"]
+                },
+                "spread_violations": {
+                    "count": int(counts["spread"]),
+                    "percentage": float(percentage["spread"]),
+                    "avg_value": averages["spread"],
+                    "threshold": self.filter_thresholds["spread_max"]
+                },
+                "news_window_violations": {
+                    "count": int(counts["news_window"]),
+                    "percentage": float(percentage["news_window"]),
+                    "threshold_hours": self.filter_thresholds["news_window_hours"]
+                },
+                "buildup_violations": {
+                    "count": int(counts["build_up"]),
+                    "percentage": float(percentage["build_up"]),
+                    "avg_width": averages["build_up"],
+                    "avg_bars": averages["build_up_bars"],
+                    "min_width_threshold": self.filter_thresholds["buildup_min_width"],
+                    "min_bars_threshold": self.filter_thresholds["buildup_min_bars"]
+                }
+            },
+            "time_patterns": {
+                "hourly_distribution": {int(h): int(c) for h, c in hours.value_counts().sort_index().items()},
+                "no_trade_hourly": {int(h): int(c) for h, c in no_trade_hourly.items()},
+                "peak_no_trade_hours": [
+                    (int(h), int(c)) for h, c in no_trade_hourly.sort_values(ascending=False, kind="stable").head(5).items()
+                ]
+            },
+            "setup_distribution": df["setup"].value_counts().to_dict(),
+            "trigger_rates": report["trigger_rates"],
+            "trigger_rates_by_hour": report["trigger_rates_by_hour"],
+            "co_occurrence": report["co_occurrence"],
+            "co_occurrence_given_row": report["co_occurrence_given_row"],
+            "what_if": report["what_if"]
+        }
+        analysis["recommendations"] = self.generate_recommendations(analysis)
+        
+        analysis["analysis_date"] = datetime.now(self.jst).isoformat()
+        analysis["weeks_analyzed"] = weeks_back
+        analysis["date_range"] = {
+            "start": str(df["date"].min()) if df["date"].notna().any() else "Unknown",
+            "end": str(df["date"].max()) if df["date"].notna().any() else "Unknown"
+        }
+        analysis["compute_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        
+        return analysis
+
+
+def print_columnar_report(results: Dict) -> None:
+    """Print the co-occurrence matrix and what-if curves of a columnar analysis."""
+    print("\n🔗 FILTER CO-OCCURRENCE (runs rejected by both)")
+    print("=" * 40)
+    matrix = pd.DataFrame(results["co_occurrence"])
+    print(matrix.to_string())
+    
+    print("\n📐 THRESHOLD WHAT-IF (other gates as recorded)")
+    print("=" * 40)
+    current = filter_analytics.THRESHOLDS
+    for gate, rows in results["what_if"].items():
+        curve = pd.DataFrame(rows).set_index(gate)
+        if curve.empty:
+            continue
+        print(f"\n{gate} (current {current[gate]}):")
+        print(curve.to_string(float_format=lambda v: f"{v:.3f}"))
+
+
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description="Analyze which quality gates filter out trades")
+    parser.add_argument("--mode", choices=["columnar", "legacy"], default="columnar",
+                        help="columnar: run history columns; legacy: parse Notion summaries")
+    parser.add_argument("--source", choices=["auto", "history", "notion"], default="auto",
+                        help="Columnar data source (auto falls back to Notion when the history is empty)")
+    parser.add_argument("--weeks", type=int, default=3, help="Weeks to analyze")
+    parser.add_argument("--pair", help="Only analyze this pair (e.g., USDJPY)")
+    args = parser.parse_args()
+    
     print("🔍 FX Filter Analysis - Notion Database Analyzer")
     print("=" * 60)
     
     # Validate configuration
-    if not config.notion_api_key or not config.notion_db_id:
+    needs_notion = args.mode == "legacy" or args.source == "notion"
+    if needs_notion and (not config.notion_api_key or not config.notion_db_id):
         print("❌ Error: Notion API key or database ID not configured")
         print("Please set NOTION_API_KEY and NOTION_DB_ID environment variables")
         return
     
     try:
         # Initialize analyzer
-        analyzer = NotionFilterAnalyzer()
+        if args.mode == "legacy":
+            analyzer = NotionFilterAnalyzer()
+        else:
+            analyzer = ColumnarFilterAnalyzer(pair=args.pair, source=args.source)
         
         # Run analysis
-        results = analyzer.run_analysis(weeks_back=3)
+        results = analyzer.run_analysis(weeks_back=args.weeks)
         
         if "error" in results:
             print(f"❌ Analysis failed: {results['error']}")
@@ -477,6 +660,8 @@ def main():
         print("=" * 60)
         
         print(f"📅 Analysis Period: {results['date_range']['start']} to {results['date_range']['end']}")
+        if "source" in results:
+            print(f"🗄️  Source: {results['source']} (computed in {results['compute_ms']} ms)")
         print(f"📈 Total Entries: {results['total_entries']}")
         print(f"🚫 No-Trade Entries: {results['no_trade_entries']} ({results['no_trade_entries']/results['total_entries']*100:.1f}%)")
         print(f"✅ Trade Entries: {results['trade_entries']} ({results['trade_entries']/results['total_entries']*100:.1f}%)")
@@ -511,6 +696,9 @@ def main():
             percentage = count / results['total_entries'] * 100
             print(f"  {setup}: {count} ({percentage:.1f}%)")
         
+        if "what_if" in results:
+            print_columnar_report(results)
+        
         print("\n💡 RECOMMENDATIONS")
         print("=" * 40)
         
@@ -0,0 +1 @@
+"""Performance benchmarks on synthetic OHLCV data (see ``python -m benchmarks --help``)."""
@@ -0,0 +1,124 @@
+"""
+Benchmark suite CLI.
+
+    python -m benchmarks run [--bars 200] [--pairs USDJPY,EURUSD] [--save-baseline NAME]
+    python -m benchmarks compare [--baseline NAME] [--results FILE] [--tolerance 0.15]
+
+``compare`` re-runs the suite with the baseline's parameters unless a
+results file is given, and exits with status 1 when any case got slower.
+"""
+
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Offline: dummy credentials satisfy config validation, nothing is persisted
+for name in ("TWELVEDATA_API_KEY", "S3_BUCKET", "NOTION_API_KEY", "NOTION_DB_ID"):
+    os.environ.setdefault(name, "benchmark")
+os.environ.update({
+    "SLACK_WEBHOOK_URL": "",
+    "HISTORY_ENABLED": "false",
+    "HEARTBEAT_ENABLED": "false",
+    "PROFILE_ENABLED": "false",
+    "CHART_CACHE_SIZE": "0",
+    "CHART_CACHE_S3": "false",
+    "LOG_LEVEL": os.environ.get("BENCH_LOG_LEVEL", "WARNING"),
+})
+
+from benchmarks.harness import (
+    baseline_path, compare, load_results, measure, print_comparison,
+    print_timings, results_document, save_results
+)
+
+RESULTS_PATH = os.path.join("benchmarks", "results", "latest.json")
+
+
+def run_suite(bars: int, pairs, repeat: int, seed: int, only=None) -> dict:
+    """Run every case for every pair and return a results document."""
+    from benchmarks.cases import build_cases
+    from benchmarks.synthetic import synthetic_market
+
+    timings = {}
+    for pair in pairs:
+        market = synthetic_market(pair, bars=bars, seed=seed)
+        for case in build_cases(pair, market, only):
+            print(f"  {case.name} ...", file=sys.stderr, flush=True)
+            timings[case.name] = measure(case, repeat)
+
+    return results_document(timings, {
+        "bars": bars, "pairs": list(pairs), "repeat": repeat, "seed": seed, "cases": only
+    })
+
+
+def cmd_run(args) -> int:
+    results = run_suite(args.bars, args.pairs.split(","), args.repeat, args.seed, args.case)
+    print_timings(results["results"])
+    save_results(results, args.output)
+    print(f"\nResults written to {args.output}")
+    if args.save_baseline:
+        path = baseline_path(args.save_baseline)
+        save_results(results, path)
+        print(f"Baseline written to {path}")
+    return 0
+
+
+def cmd_compare(args) -> int:
+    path = baseline_path(args.baseline)
+    if not os.path.exists(path):
+        print(f"Baseline not found: {path} (create it with: python -m benchmarks run --save-baseline {args.baseline})")
+        return 2
+    baseline = load_results(path)
+
+    if args.results:
+        current = load_results(args.results)
+    else:
+        params = baseline["params"]
+        current = run_suite(params["bars"], params["pairs"], params["repeat"], params["seed"], params.get("cases"))
+        save_results(current, args.output)
+    if current["params"] != baseline["params"]:
+        print(f"Warning: parameters differ (baseline {baseline['params']}, current {current['params']})")
+    if current["environment"].get("platform") != baseline["environment"].get("platform"):
+        print(f"Warning: baseline was taken on {baseline['environment'].get('platform')}")
+
+    rows = compare(baseline, current, args.tolerance, args.min_delta_ms)
+    print(f"Baseline {path} (commit {baseline['environment'].get('commit')}, {baseline['created_at']})")
+    print_comparison(rows, args.tolerance)
+
+    slower = [row["case"] for row in rows if row["status"] == "slower"]
+    if slower:
+        print(f"\n{len(slower)} case(s) slower than baseline: {', '.join(slower)}")
+        return 1
+    print("\nNo slowdowns beyond tolerance")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FX analysis benchmark suite")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser("run", help="Run the suite and write results")
+    run.add_argument("--bars", type=int, default=200, help="Bars per timeframe (production fetches 200)")
+    run.add_argument("--pairs", default="USDJPY", help="Comma-separated pairs (see benchmarks.synthetic.PAIRS)")
+    run.add_argument("--repeat", type=int, default=10, help="Timed samples per case")
+    run.add_argument("--seed", type=int, default=0, help="Synthetic data seed")
+    run.add_argument("--case", action="append", help="Only run these cases (repeatable)")
+    run.add_argument("--output", default=RESULTS_PATH, help="Results JSON path")
+    run.add_argument("--save-baseline", metavar="NAME", help="Also store the results as baseline NAME")
+    run.set_defaults(func=cmd_run)
+
+    cmp = subparsers.add_parser("compare", help="Compare against a baseline, exit 1 on slowdowns")
+    cmp.add_argument("--baseline", default="local", help="Baseline name in benchmarks/baselines/ or a JSON path")
+    cmp.add_argument("--results", help="Compare this results file instead of running the suite")
+    cmp.add_argument("--tolerance", type=float, default=0.15, help="Allowed relative slowdown (0.15 = 15%%)")
+    cmp.add_argument("--min-delta-ms", type=float, default=0.05, help="Ignore differences below this")
+    cmp.add_argument("--output", default=RESULTS_PATH, help="Where fresh results are written")
+    cmp.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
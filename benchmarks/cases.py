@@ -0,0 +1,123 @@
+"""Benchmark cases: analysis, charts, guard, sink payloads and the offline pipeline."""
+
+import json
+from types import SimpleNamespace
+from typing import Dict, List
+
+import pandas as pd
+
+from src.analysis.core_v2 import FXAnalyzerV2
+from src.charting.cache import ChartCache
+from src.charting.mpl import ChartGenerator
+from src.guards.linguistic import LinguisticGuard
+from src.io.notion_v2 import NotionClientV2
+from src.io.slack_v2 import SlackClientV2
+from src.runner.main_v2 import FXAnalysisRunnerV2
+
+from benchmarks.harness import Case
+
+CASES = (
+    "calculate_indicators",
+    "analyze",
+    "generate_chart",
+    "linguistic_check_dict",
+    "notion_payload",
+    "slack_payload",
+    "pipeline",
+)
+
+CHART_URLS = {
+    "5m": "https://example-bucket.s3.amazonaws.com/charts/bench_5m.png",
+    "1h": "https://example-bucket.s3.amazonaws.com/charts/bench_1h.png",
+}
+NOTION_URL = "https://notion.so/00000000000000000000000000000000"
+
+
+class _OfflinePages:
+    """Stand-in for ``client.pages`` that serializes the request instead of sending it."""
+
+    def create(self, **payload) -> Dict:
+        json.dumps(payload, default=str)
+        return {"id": "00000000-0000-0000-0000-000000000000"}
+
+
+def offline_notion() -> NotionClientV2:
+    """Notion client whose pages are built and serialized, never sent."""
+    client = NotionClientV2()
+    client.client = SimpleNamespace(pages=_OfflinePages())
+    return client
+
+
+class OfflineSlack(SlackClientV2):
+    """Slack client that builds and serializes the payload without posting it."""
+
+    def send_analysis_notification(self, analysis, notion_url=None, chart_urls=None) -> bool:
+        json.dumps(self.build_payload(analysis, notion_url))
+        return True
+
+
+def _fresh(market: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """Copies of the frames, so indicator engines are built as on a new fetch."""
+    return {tf: df.copy() for tf, df in market.items()}
+
+
+def build_cases(pair: str, market: Dict[str, pd.DataFrame], only: List[str] = None) -> List[Case]:
+    """
+    Build the cases for one pair's synthetic market.
+
+    Analysis cases get fresh DataFrame copies per call, so the shared
+    indicator engine cache starts cold as it does on each run. Charts and
+    payloads reuse one analysis of the market; the chart cache is disabled
+    so every call renders.
+
+    Args:
+        pair: Trading pair
+        market: Dict mapping timeframe to synthetic OHLCV
+        only: Case names to include (default: all of CASES)
+
+    Returns:
+        Cases named "{case}/{pair}"
+    """
+    selected = set(only or CASES)
+    analyzer = FXAnalyzerV2(pair=pair)
+    analysis = analyzer.analyze(_fresh(market))
+    frame = market["5m"]
+    tf_analysis = analysis.get("timeframes", {}).get("5m", {})
+    cases = []
+
+    if "calculate_indicators" in selected:
+        cases.append(Case("calculate_indicators", analyzer.calculate_indicators, lambda: (frame.copy(),)))
+
+    if "analyze" in selected:
+        cases.append(Case("analyze", analyzer.analyze, lambda: (_fresh(market),)))
+
+    if "generate_chart" in selected:
+        generator = ChartGenerator(pair=pair, cache=ChartCache(max_entries=0, s3_enabled=False))
+        cases.append(Case(
+            "generate_chart",
+            lambda: generator.generate_chart(frame, "5m", tf_analysis.get("indicators"), tf_analysis.get("setup"))
+        ))
+
+    if "linguistic_check_dict" in selected:
+        guard = LinguisticGuard()
+        cases.append(Case("linguistic_check_dict", lambda: guard.check_dict(analysis)))
+
+    if "notion_payload" in selected:
+        notion = offline_notion()
+        cases.append(Case("notion_payload", lambda: json.dumps({
+            "properties": notion._build_properties(analysis),
+            "children": notion._build_content_blocks(analysis, CHART_URLS),
+        }, default=str)))
+
+    if "slack_payload" in selected:
+        slack = OfflineSlack()
+        cases.append(Case("slack_payload", lambda: json.dumps(slack.build_payload(analysis, NOTION_URL))))
+
+    if "pipeline" in selected:
+        runner = FXAnalysisRunnerV2(pair=pair, clients={"notion": offline_notion(), "slack": OfflineSlack()})
+        runner.chart_generator.cache = ChartCache(max_entries=0, s3_enabled=False)
+        cases.append(Case("pipeline", runner.run, lambda: (_fresh(market),)))
+
+    for case in cases:
+        case.name = f"{case.name}/{pair}"
+    return cases
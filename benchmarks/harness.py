@@ -0,0 +1,182 @@
+"""Timing, result files and baseline comparison for the benchmark suite."""
+
+import gc
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_DIR = os.path.join(ROOT, "benchmarks", "baselines")
+
+# Fast cases repeat inside one sample until it takes about this long
+MIN_SAMPLE_MS = 20
+MAX_NUMBER = 1000
+
+
+@dataclass
+class Case:
+    """One timed operation; ``setup`` builds fresh arguments outside the timer."""
+
+    name: str
+    fn: Callable
+    setup: Optional[Callable[[], Tuple]] = None
+
+
+def measure(case: Case, repeat: int, warmup: int = 1) -> Dict:
+    """
+    Time a case.
+
+    Fast cases are called several times per sample (calibrated on the
+    warm-up to about MIN_SAMPLE_MS) so timer resolution and noise do not
+    dominate; reported times are per call.
+
+    Args:
+        case: Case to run
+        repeat: Timed samples
+        warmup: Untimed calls first (imports, caches, fonts)
+
+    Returns:
+        Timing summary in milliseconds
+    """
+    def call() -> float:
+        args = case.setup() if case.setup else ()
+        started = time.perf_counter()
+        case.fn(*args)
+        return time.perf_counter() - started
+
+    gc.collect()
+    warm = min(call() for _ in range(max(1, warmup)))
+    number = max(1, min(MAX_NUMBER, math.ceil(MIN_SAMPLE_MS / 1000 / max(warm, 1e-7))))
+
+    times = sorted(sum(call() for _ in range(number)) / number * 1000 for _ in range(repeat))
+    return {
+        "runs": repeat,
+        "number": number,
+        "median_ms": round(statistics.median(times), 4),
+        "min_ms": round(times[0], 4),
+        "mean_ms": round(statistics.mean(times), 4),
+        "p95_ms": round(times[max(0, math.ceil(len(times) * 0.95) - 1)], 4),
+        "stdev_ms": round(statistics.stdev(times), 4) if len(times) > 1 else 0.0,
+    }
+
+
+def environment() -> Dict:
+    """Machine and revision the results were taken on."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=5
+        ).stdout.strip()
+    except Exception:
+        commit = ""
+    return {
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def baseline_path(name: str) -> str:
+    """Resolve a baseline name (or an explicit .json path)."""
+    if name.endswith(".json"):
+        return name
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def save_results(results: Dict, path: str) -> None:
+    """Write a results document as JSON."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+
+
+def load_results(path: str) -> Dict:
+    """Read a results document."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def results_document(timings: Dict[str, Dict], params: Dict) -> Dict:
+    """Wrap timings with the parameters and environment they were taken with."""
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": environment(),
+        "params": params,
+        "results": timings,
+    }
+
+
+def compare(
+    baseline: Dict,
+    current: Dict,
+    tolerance: float = 0.15,
+    min_delta_ms: float = 0.05,
+    metric: str = "median_ms"
+) -> List[Dict]:
+    """
+    Compare two results documents case by case.
+
+    A case is "slower" when it exceeds the baseline by more than
+    ``tolerance`` (relative) and ``min_delta_ms`` (absolute, so sub-
+    millisecond cases do not flag on timer noise); "faster" mirrors it.
+
+    Args:
+        baseline: Baseline results document
+        current: New results document
+        tolerance: Allowed relative slowdown (0.15 = 15%)
+        min_delta_ms: Ignore differences smaller than this
+        metric: Timing field compared
+
+    Returns:
+        Rows with case, baseline/current values, ratio and status
+        ("ok", "slower", "faster", "new" or "missing")
+    """
+    before = baseline.get("results", {})
+    after = current.get("results", {})
+    rows = []
+    for name in list(before) + [name for name in after if name not in before]:
+        old = before.get(name, {}).get(metric)
+        new = after.get(name, {}).get(metric)
+        row = {"case": name, "baseline": old, "current": new, "ratio": None}
+        if old is None:
+            row["status"] = "new"
+        elif new is None:
+            row["status"] = "missing"
+        else:
+            row["ratio"] = round(new / old, 3) if old else None
+            if new > old * (1 + tolerance) and new - old > min_delta_ms:
+                row["status"] = "slower"
+            elif new < old / (1 + tolerance) and old - new > min_delta_ms:
+                row["status"] = "faster"
+            else:
+                row["status"] = "ok"
+        rows.append(row)
+    return rows
+
+
+def print_timings(timings: Dict[str, Dict]) -> None:
+    """Print a timing table."""
+    width = max([len(name) for name in timings] + [4])
+    print(f"{'case':<{width}}{'median ms':>12}{'min ms':>10}{'p95 ms':>10}{'runs':>6}")
+    for name, t in timings.items():
+        print(f"{name:<{width}}{t['median_ms']:>12.3f}{t['min_ms']:>10.3f}{t['p95_ms']:>10.3f}{t['runs']:>6}")
+
+
+def print_comparison(rows: List[Dict], tolerance: float) -> None:
+    """Print a comparison table."""
+    width = max([len(row["case"]) for row in rows] + [4])
+    print(f"{'case':<{width}}{'baseline':>11}{'current':>11}{'ratio':>8}  status (tolerance {tolerance:.0%})")
+    for row in rows:
+        old = f"{row['baseline']:.3f}" if row["baseline"] is not None else "-"
+        new = f"{row['current']:.3f}" if row["current"] is not None else "-"
+        ratio = f"{row['ratio']:.2f}x" if row["ratio"] is not None else "-"
+        print(f"{row['case']:<{width}}{old:>11}{new:>11}{ratio:>8}  {row['status'].upper() if row['status'] == 'slower' else row['status']}")
@@ -0,0 +1,120 @@
+"""Synthetic OHLCV series with FX-like sessions, volatility clustering and trends."""
+
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+# Reference price, pip size and typical daily range (pips) per pair
+PAIRS = {
+    "USDJPY": {"price": 150.0, "pip": 0.01, "daily_pips": 90},
+    "EURJPY": {"price": 162.0, "pip": 0.01, "daily_pips": 110},
+    "GBPJPY": {"price": 190.0, "pip": 0.01, "daily_pips": 150},
+    "EURUSD": {"price": 1.08, "pip": 0.0001, "daily_pips": 70},
+    "GBPUSD": {"price": 1.27, "pip": 0.0001, "daily_pips": 90},
+    "AUDUSD": {"price": 0.66, "pip": 0.0001, "daily_pips": 60},
+}
+
+# Relative volatility by JST hour: quiet late Asia, Tokyo open, London open,
+# London/New York overlap
+SESSION_VOL = np.array([
+    1.1, 0.8, 0.6, 0.5, 0.4, 0.4, 0.5, 0.7, 0.9, 1.2, 1.0, 0.9,
+    0.8, 0.8, 0.9, 1.0, 1.3, 1.4, 1.3, 1.2, 1.3, 1.7, 1.9, 1.6,
+])
+
+TIMEFRAMES = {"1m": 1, "5m": 5, "15m": 15, "30m": 30, "1h": 60, "4h": 240}
+
+DEFAULT_END = "2025-01-10 15:00"
+
+
+def _trading_minutes(minutes: int, end: pd.Timestamp) -> pd.DatetimeIndex:
+    """The last ``minutes`` JST minutes before ``end`` while FX trades (Mon 07:00 to Sat 06:00)."""
+    calendar = minutes * 7 // 5 + 4 * 1440
+    index = pd.date_range(end=end, periods=calendar, freq="1min", tz="Asia/Tokyo", inclusive="left")
+    weekday, hour = index.dayofweek, index.hour
+    closed = (weekday == 6) | ((weekday == 5) & (hour >= 6)) | ((weekday == 0) & (hour < 7))
+    return index[~closed][-minutes:]
+
+
+def synthetic_market(
+    pair: str = "USDJPY",
+    bars: int = 200,
+    timeframes: Iterable[str] = ("5m", "1h"),
+    seed: int = 0,
+    end: Optional[str] = None
+) -> Dict[str, pd.DataFrame]:
+    """
+    Generate consistent OHLCV frames for several timeframes of one pair.
+
+    A one-minute path is simulated and resampled, so the 1h bars are made
+    of the same prices as the 5m bars. Per-minute volatility follows the
+    JST session profile times a slowly varying (clustered) factor, drift
+    switches regime every few hours so trends and ranges alternate, and
+    shocks are fat-tailed. Tick volume scales with volatility.
+
+    Args:
+        pair: Pair from PAIRS (sets price level and pip-scaled volatility)
+        bars: Bars per timeframe
+        timeframes: Timeframe labels from TIMEFRAMES
+        seed: Random seed (same seed, same series)
+        end: Last bar boundary, JST (defaults to DEFAULT_END, a Friday)
+
+    Returns:
+        Dict mapping timeframe to a DataFrame indexed by bar open time (JST)
+        with open/high/low/close/volume columns
+
+    Raises:
+        ValueError: If the simulated path leaves +-30% of the reference price
+    """
+    spec = PAIRS[pair]
+    timeframes = list(timeframes)
+    rng = np.random.default_rng(seed)
+    minutes = bars * max(TIMEFRAMES[tf] for tf in timeframes)
+    index = _trading_minutes(minutes, pd.Timestamp(end or DEFAULT_END, tz="Asia/Tokyo"))
+    n = len(index)
+
+    # Volatility: session profile x clustered regime factor. The recursive
+    # EWM starts at 0 (adjust=False), so the log factor stays within about
+    # +-1 (stationary std ~0.3) instead of beginning as a raw N(0, 1) draw
+    shocks = rng.normal(0, 1, n)
+    shocks[0] = 0.0
+    log_cluster = pd.Series(shocks).ewm(alpha=0.005, adjust=False).mean().to_numpy() * 6
+    cluster = np.exp(np.clip(log_cluster, -1.5, 1.5))
+    sigma = spec["daily_pips"] * spec["pip"] / np.sqrt(1440) * SESSION_VOL[index.hour] * cluster
+
+    # Drift regimes (trend or range) lasting about four hours
+    regime = np.cumsum(rng.random(n) < 1 / 240)
+    drift = rng.normal(0, 0.05, regime[-1] + 1)[regime] * rng.random(regime[-1] + 1)[regime]
+
+    returns = rng.standard_t(4, n) / np.sqrt(2)
+    close = spec["price"] + np.cumsum(sigma * (drift + returns))
+    open_ = np.r_[spec["price"], close[:-1]]
+    wicks = np.abs(rng.normal(0, 0.5, (2, n))) * sigma
+    minute_bars = pd.DataFrame({
+        "open": open_,
+        "high": np.maximum(open_, close) + wicks[0],
+        "low": np.minimum(open_, close) - wicks[1],
+        "close": close,
+        "volume": rng.poisson(40 * SESSION_VOL[index.hour] * np.sqrt(cluster)),
+    }, index=index)
+
+    # Keep the path in a plausible band around the reference price, so gates,
+    # pip math and chart scaling see realistic inputs
+    low, high = close.min(), close.max()
+    if not 0.7 * spec["price"] < low <= high < 1.3 * spec["price"]:
+        raise ValueError(
+            f"synthetic {pair} path left the plausible range ({low:.4f}..{high:.4f}); use another seed"
+        )
+
+    market = {}
+    for tf in timeframes:
+        frame = minute_bars.resample(f"{TIMEFRAMES[tf]}min", label="left", closed="left").agg({
+            "open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"
+        }).dropna()
+        market[tf] = frame.iloc[-bars:].round(6)
+    return market
+
+
+def synthetic_ohlcv(pair: str = "USDJPY", bars: int = 200, timeframe: str = "5m", seed: int = 0) -> pd.DataFrame:
+    """One timeframe of ``synthetic_market``."""
+    return synthetic_market(pair, bars, (timeframe,), seed)[timeframe]
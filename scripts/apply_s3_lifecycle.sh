@@ -64,5 +64,6 @@ echo -e "${GREEN}=== S3 Lifecycle Configuration Complete ===${NC}"
 echo ""
 echo "Applied rules:"
 echo "  • charts/: Move to Glacier after 30 days, delete after 90 days"
+echo "  • charts/_cache/: Delete render cache entries after 7 days"
 echo "  • results/: Delete after 180 days"
 echo "  • stats/: Delete after 365 days"
\ No newline at end of file
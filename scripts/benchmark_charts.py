@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""Compare chart renderers (mplfinance vs. Agg) on synthetic bars."""
+
+import os
+import sys
+import argparse
+import statistics
+import time
+import tracemalloc
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from src.charting.cache import ChartCache
+from src.charting.mpl import ChartGenerator, RENDERERS
+
+INDICATORS = {
+    "ema25_slope_deg": 32.5,
+    "atr20": 8.4,
+    "spread": 0.3,
+    "build_up": {"width_pips": 12.0, "bars": 14},
+}
+
+
+def synthetic_bars(n: int, freq: str = "5min", seed: int = 0) -> pd.DataFrame:
+    """Random-walk OHLC bars in JST."""
+    rng = np.random.default_rng(seed)
+    close = 150 + np.cumsum(rng.normal(0, 0.02, n))
+    open_ = np.r_[close[0], close[:-1]]
+    wick = np.abs(rng.normal(0, 0.015, (2, n)))
+    index = pd.date_range("2025-01-06 09:00", periods=n, freq=freq, tz="Asia/Tokyo")
+    return pd.DataFrame({
+        "open": open_,
+        "high": np.maximum(open_, close) + wick[0],
+        "low": np.minimum(open_, close) - wick[1],
+        "close": close,
+    }, index=index)
+
+
+def bench(renderer: str, frames: List[pd.DataFrame], repeat: int) -> Dict:
+    """Render every frame ``repeat`` times, bypassing the render cache."""
+    generator = ChartGenerator(pair="USDJPY", cache=ChartCache(max_entries=0, s3_enabled=False), renderer=renderer)
+    # Warm-up: imports, fonts, style and (for Agg) the reused figure
+    generator.render_chart(frames[0], "5m", INDICATORS)
+
+    times, sizes = [], []
+    for _ in range(repeat):
+        for df in frames:
+            started = time.perf_counter()
+            chart_bytes = generator.render_chart(df, "5m", INDICATORS)
+            times.append((time.perf_counter() - started) * 1000)
+            sizes.append(len(chart_bytes))
+
+    # Separate pass: tracing slows rendering down several times
+    tracemalloc.start()
+    for df in frames:
+        generator.render_chart(df, "5m", INDICATORS)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "renderer": renderer,
+        "median_ms": statistics.median(times),
+        "p95_ms": sorted(times)[int(len(times) * 0.95) - 1],
+        "png_kb": statistics.mean(sizes) / 1024,
+        "peak_mb": peak / 1024 / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chart renderers")
+    parser.add_argument("--bars", type=int, default=300, help="Bars per chart")
+    parser.add_argument("--charts", type=int, default=5, help="Distinct charts per round")
+    parser.add_argument("--repeat", type=int, default=4, help="Rounds")
+    parser.add_argument("--renderer", choices=RENDERERS, action="append", help="Renderers to run (default: all)")
+    args = parser.parse_args()
+
+    base = synthetic_bars(args.bars + args.charts)
+    frames = [base.iloc[i:i + args.bars] for i in range(args.charts)]
+
+    results = [bench(renderer, frames, args.repeat) for renderer in args.renderer or RENDERERS]
+
+    print(f"\n{args.bars} bars, {args.charts * args.repeat} charts per renderer")
+    print(f"{'renderer':<12}{'median ms':>11}{'p95 ms':>9}{'PNG KB':>9}{'peak MB':>9}")
+    for r in results:
+        print(f"{r['renderer']:<12}{r['median_ms']:>11.1f}{r['p95_ms']:>9.1f}{r['png_kb']:>9.1f}{r['peak_mb']:>9.1f}")
+
+    if len(results) == 2:
+        print(f"\nSpeed-up: {results[0]['median_ms'] / results[1]['median_ms']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
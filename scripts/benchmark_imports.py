@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""Measure runner import time with `python -X importtime`, optionally against a git ref."""
+
+import os
+import re
+import sys
+import argparse
+import statistics
+import subprocess
+import tarfile
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)")
+
+
+def measure(tree: str, module: str) -> Tuple[float, float, Dict[str, int]]:
+    """
+    Import ``module`` in a fresh interpreter.
+
+    Returns:
+        (wall ms, cumulative import ms of module, cumulative us per top-level package)
+    """
+    env = dict(os.environ, PYTHONPATH=tree)
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=tree, env=env, capture_output=True, text=True
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    module_ms = 0.0
+    packages: Dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        match = LINE.match(line)
+        if not match:
+            continue
+        cumulative, name = int(match.group(2)), match.group(3)
+        if name == module:
+            module_ms = cumulative / 1000
+        # Top-level packages only (their cumulative time covers submodules)
+        if "." not in name and not name.startswith("_") and name != "src":
+            packages[name] = max(packages.get(name, 0), cumulative)
+    return wall_ms, module_ms, packages
+
+
+def export_ref(ref: str, dest: str) -> None:
+    """Extract ``src/`` at a git ref into ``dest``."""
+    archive = os.path.join(dest, "src.tar")
+    subprocess.run(["git", "archive", "--format=tar", "-o", archive, ref, "src"], cwd=ROOT, check=True)
+    with tarfile.open(archive) as tar:
+        tar.extractall(dest)
+
+
+def run_tree(label: str, tree: str, module: str, repeat: int) -> Dict:
+    """Repeat the measurement and keep medians."""
+    # Warm-up run so bytecode compilation is not counted
+    measure(tree, module)
+    walls, modules, samples = [], [], []
+    for _ in range(repeat):
+        wall_ms, module_ms, packages = measure(tree, module)
+        walls.append(wall_ms)
+        modules.append(module_ms)
+        samples.append(packages)
+    packages = {
+        name: statistics.median(s.get(name, 0) for s in samples) / 1000
+        for name in set().union(*samples)
+    }
+    return {
+        "label": label,
+        "wall_ms": statistics.median(walls),
+        "import_ms": statistics.median(modules),
+        "packages": packages,
+    }
+
+
+def print_report(results: List[Dict], top: int) -> None:
+    print(f"\n{'tree':<14}{'import ms':>12}{'process ms':>12}")
+    for r in results:
+        print(f"{r['label']:<14}{r['import_ms']:>12.1f}{r['wall_ms']:>12.1f}")
+
+    if len(results) == 2:
+        before, after = results
+        saved = before["import_ms"] - after["import_ms"]
+        print(f"\nImport time saved: {saved:.1f} ms ({saved / before['import_ms'] * 100:.0f}%)")
+
+    print(f"\nHeaviest third-party imports (ms, top {top}):")
+    names = sorted(results[0]["packages"], key=lambda n: -results[0]["packages"][n])[:top]
+    header = "".join(f"{r['label']:>14}" for r in results)
+    print(f"{'package':<16}{header}")
+    for name in names:
+        row = "".join(f"{r['packages'].get(name, 0):>14.1f}" for r in results)
+        print(f"{name:<16}{row}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark import time of an entry point")
+    parser.add_argument("--module", default="src.runner.main_v2", help="Module to import")
+    parser.add_argument("--baseline", help="Git ref to compare against (e.g. HEAD~1)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per tree (median is reported)")
+    parser.add_argument("--top", type=int, default=10, help="Packages to list")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.baseline:
+            export_ref(args.baseline, tmp)
+            results.append(run_tree(args.baseline, tmp, args.module, args.repeat))
+        results.append(run_tree("working tree", ROOT, args.module, args.repeat))
+
+    print_report(results, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,14 @@ import uuid
 import math
 import os
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import pytz
 import pandas as pd
 
 from src.utils.logger import get_logger
 from src.guards.linguistic import LinguisticGuard
+from src.analysis.indicators import IndicatorEngine, engine_for
+from src.analysis.gates import describe_reasons, evaluate_gates, gate_columns
 
 logger = get_logger(__name__)
 
@@ -28,6 +30,10 @@ class FXAnalyzerV2:
         "No-Trade": "No Trade"
     }
     
+    # EV calculation parameters (Beta distribution priors)
+    SETUP_ALPHA = {"A": 3, "B": 2.5, "C": 2, "D": 2, "E": 3.5, "F": 1.5}
+    SETUP_BETA = {"A": 2, "B": 2, "C": 3, "D": 3, "E": 1.5, "F": 3}
+    
     def __init__(self, pair: str = "USDJPY"):
         """Initialize the enhanced analyzer."""
         self.pair = pair
@@ -35,21 +41,30 @@ class FXAnalyzerV2:
         self.linguistic_guard = LinguisticGuard()
         
         # EV calculation parameters (Beta distribution)
-        self.setup_alpha = {"A": 3, "B": 2.5, "C": 2, "D": 2, "E": 3.5, "F": 1.5}
-        self.setup_beta = {"A": 2, "B": 2, "C": 3, "D": 3, "E": 1.5, "F": 3}
-        
-    def analyze(self, data: Dict[str, pd.DataFrame]) -> Dict:
+        self.setup_alpha = dict(self.SETUP_ALPHA)
+        self.setup_beta = dict(self.SETUP_BETA)
+        
+    def analyze(
+        self,
+        data: Dict[str, pd.DataFrame],
+        engines: Optional[Dict[str, IndicatorEngine]] = None,
+        now: Optional[datetime] = None
+    ) -> Dict:
         """
         Main analysis entry point with schema compliance.
         
         Args:
             data: Dict mapping timeframe to DataFrame
+            engines: Long-lived indicator engines per timeframe whose latest
+                bars match ``data`` (looked up from the shared cache when omitted)
+            now: Decision time for the gates, timestamp and run_id (defaults to
+                the current time; replays pass the bar close time)
             
         Returns:
             Schema-compliant analysis result
         """
         # Generate run_id with SESSION if available
-        jst_now = datetime.now(self.jst)
+        jst_now = now.astimezone(self.jst) if now is not None else datetime.now(self.jst)
         session = os.environ.get('SESSION', 'default')
         if session != 'default':
             run_id = f"{jst_now:%Y%m%d-%H%M}-{session}"
@@ -94,14 +109,15 @@ class FXAnalyzerV2:
             return result
         
         # Step 1: Calculate indicators for both timeframes
-        indicators_5m = self.calculate_indicators(df_5m)
-        indicators_1h = self.calculate_indicators(df_1h)
+        engines = engines or {}
+        indicators_5m = self.calculate_indicators(df_5m, engines.get("5m"))
+        indicators_1h = self.calculate_indicators(df_1h, engines.get("1h"))
         
         # Primary indicators are from 5m
         result["indicators"] = indicators_5m
         
         # Step 2: Apply quality gates
-        filters, gate_passed, no_trade_reasons = self.apply_quality_gates(indicators_5m)
+        filters, gate_passed, no_trade_reasons = self.apply_quality_gates(indicators_5m, now=jst_now)
         result["filters"] = filters
         
         # Track if this is a No-Trade situation but continue analysis
@@ -117,13 +133,15 @@ class FXAnalyzerV2:
         # For No-Trade, find the best hypothetical setup for analysis
         if is_no_trade:
             # Find what setup WOULD have been chosen if quality gates passed
-            hypothetical_setup, hypothetical_rationale = self._determine_setup_v2(indicators_5m, env_trend, df_5m)
+            hypothetical_setup, hypothetical_rationale = self._determine_setup_v2(indicators_5m, env_trend, df_5m, engines.get("5m"))
+            setup = "No-Trade"
+            rationale = hypothetical_rationale
             result["setup"] = "No-Trade"
             result["hypothetical_setup"] = hypothetical_setup
             result["rationale"] = hypothetical_rationale
             result["analysis_mode"] = "hypothetical"
         else:
-            setup, rationale = self._determine_setup_v2(indicators_5m, env_trend, df_5m)
+            setup, rationale = self._determine_setup_v2(indicators_5m, env_trend, df_5m, engines.get("5m"))
             result["setup"] = setup
             result["rationale"] = rationale
             result["analysis_mode"] = "live"
@@ -185,37 +203,33 @@ class FXAnalyzerV2:
         
         return result
     
-    def calculate_indicators(self, df: pd.DataFrame) -> Dict:
-        """Calculate technical indicators."""
+    def calculate_indicators(self, df: pd.DataFrame, engine: Optional[IndicatorEngine] = None) -> Dict:
+        """
+        Calculate technical indicators.
+        
+        Args:
+            df: OHLC DataFrame
+            engine: Indicator engine for ``df`` (looked up from the shared
+                cache when omitted)
+        """
         if len(df) < 25:
             return {}
         
-        # EMA calculation
-        ema25 = df["close"].ewm(span=25, adjust=False).mean()
-        current_ema = ema25.iloc[-1]
+        engine = engine or engine_for(df)
         
-        # EMA slope (in degrees)
-        if len(ema25) >= 10:
-            ema_change = ema25.iloc[-1] - ema25.iloc[-10]
-            ema_slope_deg = math.degrees(math.atan(ema_change / 10))
-        else:
-            ema_slope_deg = 0
+        # EMA (maintained incrementally by the engine)
+        current_ema = engine.ema_last(25)
         
-        # ATR calculation
-        high_low = df["high"] - df["low"]
-        high_close = abs(df["high"] - df["close"].shift())
-        low_close = abs(df["low"] - df["close"].shift())
-        tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-        atr20 = tr.rolling(window=20).mean().iloc[-1]
+        # EMA slope (in degrees)
+        ema_change = current_ema - engine.ema_last(25, offset=10)
+        ema_slope_deg = math.degrees(math.atan(ema_change / 10))
         
-        # Convert ATR to pips
-        if "JPY" in self.pair:
-            atr20_pips = atr20 * 100
-        else:
-            atr20_pips = atr20 * 10000
+        # ATR (20-bar mean of true range) converted to pips
+        atr20 = engine.atr(20)
+        atr20_pips = atr20 * self._pip_factor()
         
         # Current price
-        current_price = df["close"].iloc[-1]
+        current_price = float(engine.close[-1])
         
         # Spread (simplified)
         spread = 0.1  # Default 0.1 pip
@@ -224,7 +238,7 @@ class FXAnalyzerV2:
         round_numbers = self._find_round_numbers(current_price)
         
         # Build-up detection
-        build_up = self._detect_buildup(df)
+        build_up = self._detect_buildup(df, engine)
         
         return {
             "current_price": current_price,
@@ -236,78 +250,46 @@ class FXAnalyzerV2:
             "build_up": build_up
         }
     
-    def apply_quality_gates(self, indicators: Dict) -> Tuple[Dict, bool, List[str]]:
+    def _pip_factor(self) -> int:
+        """Price-to-pips multiplier for this pair."""
+        return 100 if "JPY" in self.pair else 10000
+    
+    def apply_quality_gates(
+        self,
+        indicators: Dict,
+        now: Optional[datetime] = None
+    ) -> Tuple[Dict, bool, List[str]]:
         """
         Apply quality gates (Q01).
         
+        Args:
+            indicators: Indicators from ``calculate_indicators``
+            now: Decision time (defaults to the current JST time)
+        
         Returns:
             Tuple of (filters_dict, passed, no_trade_reasons)
         """
+        now = now or datetime.now(self.jst)
+        columns = gate_columns([indicators])
+        
+        # News window: only the first 30 minutes of session opens are
+        # restricted (we run 30 minutes after open)
+        gates = evaluate_gates(minutes=[now.hour * 60 + now.minute], **columns)
+        
         filters = {
-            "atr_ok": True,
-            "spread_ok": True,
-            "news_window_ok": True,
-            "build_up_ok": True
+            "atr_ok": bool(gates["atr_ok"][0]),
+            "spread_ok": bool(gates["spread_ok"][0]),
+            "news_window_ok": bool(gates["news_window_ok"][0]),
+            "build_up_ok": bool(gates["build_up_ok"][0])
         }
-        no_trade_reasons = []
-        
-        # Gate 1: ATR check
-        if indicators.get("atr20", 0) < 7:
-            filters["atr_ok"] = False
-            no_trade_reasons.append(f"ATR too low: {indicators.get('atr20', 0):.1f}p < 7p")
-        
-        # Gate 2: Spread check
-        if indicators.get("spread", 0) > 2:
-            filters["spread_ok"] = False
-            no_trade_reasons.append(f"Spread too wide: {indicators.get('spread', 0):.1f}p > 2p")
-        
-        # Gate 3: News window - Only restrict the first 30 minutes of session opens
-        # Since we run 30 minutes after open, we check for the actual volatile period
-        current_time = datetime.now(self.jst)
-        current_hour = current_time.hour
-        current_minute = current_time.minute
-        
-        # Define actual volatile windows (first 30 minutes of each session)
-        news_windows = [
-            (9, 0, 9, 30),    # Tokyo: 9:00-9:30
-            (15, 30, 16, 0),  # London: 15:30-16:00 (actual London open time)
-            (22, 0, 22, 30),  # NY: 22:00-22:30
-        ]
-        
-        in_news_window = False
-        for start_h, start_m, end_h, end_m in news_windows:
-            if start_h == end_h:
-                if current_hour == start_h and start_m <= current_minute < end_m:
-                    in_news_window = True
-                    break
-            else:  # Handles London case (15:30-16:00)
-                if (current_hour == start_h and current_minute >= start_m) or \
-                   (current_hour == end_h and current_minute < end_m):
-                    in_news_window = True
-                    break
-        
-        if in_news_window:
-            filters["news_window_ok"] = False
-            no_trade_reasons.append("Within news window (first 30min of session open)")
+        no_trade_reasons = describe_reasons(
+            int(gates["reasons"][0]),
+            atr=columns["atr"][0],
+            spread=columns["spread"][0],
+            build_up_score=int(gates["build_up_score"][0])
+        )
         
-        # Gate 4: Build-up quality (need 2/3 conditions)
-        build_up = indicators.get("build_up", {})
-        build_up_score = 0
-        if build_up.get("width_pips", 0) >= 10:
-            build_up_score += 1
-        if build_up.get("bars", 0) >= 10:
-            build_up_score += 1
-        if build_up.get("ema_inside", False):
-            build_up_score += 1
-        
-        if build_up_score < 2:
-            filters["build_up_ok"] = False
-            no_trade_reasons.append(f"Build-up quality insufficient: {build_up_score}/3")
-        
-        # Overall gate decision
-        gate_passed = all(filters.values())
-        
-        return filters, gate_passed, no_trade_reasons
+        return filters, bool(gates["gate_passed"][0]), no_trade_reasons
     
     def _determine_environment(self, indicators_1h: Dict) -> str:
         """Determine market environment from 1h timeframe."""
@@ -324,7 +306,13 @@ class FXAnalyzerV2:
         else:
             return "ranging"
     
-    def _determine_setup_v2(self, indicators: Dict, env_trend: str, df: pd.DataFrame) -> Tuple[str, List[str]]:
+    def _determine_setup_v2(
+        self,
+        indicators: Dict,
+        env_trend: str,
+        df: pd.DataFrame,
+        engine: Optional[IndicatorEngine] = None
+    ) -> Tuple[str, List[str]]:
         """
         Enhanced setup determination with decision tree (Q01).
         """
@@ -349,7 +337,7 @@ class FXAnalyzerV2:
                 rationale.append(f"Strong EMA slope: {ema_slope:.1f}°")
                 rationale.append(f"1h trend alignment: {env_trend}")
                 rationale.append(f"ATR supportive: {atr:.1f}p")
-            elif self._check_pullback(df):
+            elif self._check_pullback(df, engine):
                 setup = "B"  # PB Pullback
                 rationale.append("Pullback to EMA in uptrend")
                 rationale.append(f"1h bullish environment: {env_trend}")
@@ -392,19 +380,19 @@ class FXAnalyzerV2:
         
         return setup, rationale
     
-    def _check_pullback(self, df: pd.DataFrame) -> bool:
+    def _check_pullback(self, df: pd.DataFrame, engine: Optional[IndicatorEngine] = None) -> bool:
         """Check if price pulled back to EMA."""
         if len(df) < 25:
             return False
         
-        ema25 = df["close"].ewm(span=25, adjust=False).mean()
-        recent_low = df["low"].iloc[-5:].min()
-        current_close = df["close"].iloc[-1]
-        ema_current = ema25.iloc[-1]
+        engine = engine or engine_for(df)
+        recent_low = engine.low[-5:].min()
+        current_close = engine.close[-1]
+        ema_current = engine.ema_last(25)
         
         # Pullback condition: recent low touched EMA and bounced
-        return (recent_low <= ema_current * 1.001 and 
-                current_close > ema_current)
+        return bool(recent_low <= ema_current * 1.001 and 
+                    current_close > ema_current)
     
     def _check_failed_break(self, df: pd.DataFrame) -> bool:
         """Check for failed breakout pattern."""
@@ -526,31 +514,23 @@ class FXAnalyzerV2:
                     levels.append(round(level, 5))
             return levels
     
-    def _detect_buildup(self, df: pd.DataFrame) -> Dict:
-        """Detect build-up pattern."""
+    def _detect_buildup(self, df: pd.DataFrame, engine: Optional[IndicatorEngine] = None) -> Dict:
+        """Detect build-up pattern over the last 20 bars."""
         if len(df) < 20:
             return {"width_pips": 0, "bars": 0, "ema_inside": False}
         
-        recent = df.iloc[-20:]
+        engine = engine or engine_for(df)
         
-        high_range = recent["high"].max()
-        low_range = recent["low"].min()
-        width_pips = (high_range - low_range) * (100 if "JPY" in self.pair else 10000)
+        high_range = engine.range_high(20)
+        low_range = engine.range_low(20)
+        width_pips = (high_range - low_range) * self._pip_factor()
         
-        # Count consecutive bars in range
-        bars_in_range = 0
-        for i in range(len(recent) - 1, -1, -1):
-            if recent["high"].iloc[i] <= high_range and recent["low"].iloc[i] >= low_range:
-                bars_in_range += 1
-            else:
-                break
+        # Every bar of the window lies inside its own high/low range
+        bars_in_range = min(20, len(engine))
         
-        # Check if EMA is inside range
-        ema25 = recent["close"].ewm(span=25, adjust=False).mean()
-        ema_inside = False
-        if len(ema25) > 0:
-            ema_current = ema25.iloc[-1]
-            ema_inside = low_range <= ema_current <= high_range
+        # Check if the EMA25 of the window's own closes is inside the range
+        ema_current = engine.window_ema_last(25, 20)
+        ema_inside = low_range <= ema_current <= high_range
         
         return {
             "width_pips": round(width_pips, 1),
@@ -561,10 +541,11 @@ class FXAnalyzerV2:
     def _prepare_notion_properties(self, analysis: Dict) -> Dict:
         """Prepare Notion database properties."""
         setup_name = self.SETUPS.get(analysis["setup"], "No-Trade")
+        decided_at = datetime.fromisoformat(analysis["timestamp_jst"])
         
         return {
-            "Name": f"{self.pair} - {setup_name} - {datetime.now(self.jst).strftime('%Y-%m-%d %H:%M')}",
-            "Date": datetime.now(self.jst).isoformat(),
+            "Name": f"{self.pair} - {setup_name} - {decided_at.strftime('%Y-%m-%d %H:%M')}",
+            "Date": decided_at.isoformat(),
             "Currency": self.pair,
             "Timeframe": analysis["timeframe"],
             "Setup": setup_name,
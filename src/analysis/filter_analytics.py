@@ -0,0 +1,292 @@
+"""Vectorized quality-gate analytics over run-history columns."""
+
+import re
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+import pandas as pd
+
+from src.analysis.gates import REASON_ATR, REASON_BUILD_UP, REASON_NEWS, REASON_SPREAD
+
+# (name, reason bit) of each quality gate, in reporting order
+FILTERS = [
+    ("atr", REASON_ATR),
+    ("spread", REASON_SPREAD),
+    ("news_window", REASON_NEWS),
+    ("build_up", REASON_BUILD_UP),
+]
+
+# Current gate thresholds (defaults of ``evaluate_gates``)
+THRESHOLDS = {
+    "atr_min": 7.0,
+    "spread_max": 2.0,
+    "buildup_min_width": 10.0,
+    "buildup_min_bars": 10,
+    "buildup_min_score": 2,
+}
+
+# Columns the analytics read from the run history
+COLUMNS = [
+    "run_id", "timestamp", "minute_jst", "setup", "reasons",
+    "atr20", "spread", "buildup_width_pips", "buildup_bars", "buildup_ema_inside",
+]
+
+
+def reason_bits(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Expand the ``reasons`` bit column into one boolean column per filter.
+
+    Rows without a recorded reason code (e.g. failed runs) are dropped.
+    """
+    reasons = df["reasons"].dropna().astype(np.uint8).to_numpy()
+    return pd.DataFrame(
+        {name: (reasons & bit) > 0 for name, bit in FILTERS},
+        index=df["reasons"].dropna().index
+    )
+
+
+def trigger_rates(df: pd.DataFrame, by: Optional[str] = None) -> pd.DataFrame:
+    """
+    Share of runs each filter rejected.
+
+    Args:
+        df: Run history frame with ``reasons`` (and the ``by`` column)
+        by: Optional column to group by (e.g. "hour", "pair", "setup")
+
+    Returns:
+        Rates per filter plus ``any`` and ``runs``, one row per group
+        (a single "all" row when ``by`` is omitted)
+    """
+    bits = reason_bits(df)
+    bits["any"] = bits.any(axis=1)
+    keys = df.loc[bits.index, by] if by else pd.Series("all", index=bits.index, name="group")
+    grouped = bits.groupby(keys, sort=True)
+    rates = grouped.mean()
+    rates["runs"] = grouped.size()
+    return rates
+
+
+def co_occurrence(df: pd.DataFrame, normalize: bool = False) -> pd.DataFrame:
+    """
+    How often each pair of filters rejects the same run.
+
+    Args:
+        df: Run history frame with ``reasons``
+        normalize: Divide each row by its diagonal (P(column | row fired))
+
+    Returns:
+        Square frame indexed by filter name; the diagonal holds trigger counts
+    """
+    bits = reason_bits(df).to_numpy(dtype=np.int64)
+    counts = bits.T @ bits
+    names = [name for name, _ in FILTERS]
+    matrix = pd.DataFrame(counts, index=names, columns=names)
+    if normalize:
+        diagonal = np.diag(counts).astype(np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            matrix = pd.DataFrame(counts / diagonal[:, None], index=names, columns=names)
+    return matrix
+
+
+def _passed_other_gates(reasons: np.ndarray, bit: int) -> np.ndarray:
+    """Runs that passed every gate except (possibly) ``bit``."""
+    return (reasons & ~np.uint8(bit)) == 0
+
+
+def threshold_curve(
+    df: pd.DataFrame,
+    gate: str,
+    grid: Iterable[float],
+    thresholds: Optional[Dict] = None
+) -> pd.DataFrame:
+    """
+    Re-run one gate over a grid of thresholds, holding the others as recorded.
+
+    Every (row, threshold) pair is evaluated in one broadcast comparison.
+
+    Args:
+        df: Run history frame (optionally with ``result``/``pnl_pips`` outcomes)
+        gate: "atr_min", "spread_max", "buildup_min_width" or "buildup_min_bars"
+        grid: Threshold values to try
+        thresholds: Current thresholds (defaults to ``THRESHOLDS``)
+
+    Returns:
+        Frame indexed by threshold with ``gate_pass_rate`` and
+        ``all_pass_rate`` (plus ``trades``, ``win_rate`` and
+        ``avg_pnl_pips`` over evaluated trades when outcomes are present)
+    """
+    thresholds = {**THRESHOLDS, **(thresholds or {})}
+    grid = np.asarray(list(grid), dtype=np.float64)
+
+    if gate == "atr_min":
+        column, bit = "atr20", REASON_ATR
+    elif gate == "spread_max":
+        column, bit = "spread", REASON_SPREAD
+    elif gate in ("buildup_min_width", "buildup_min_bars"):
+        column = "buildup_width_pips" if gate == "buildup_min_width" else "buildup_bars"
+        bit = REASON_BUILD_UP
+    else:
+        raise ValueError(f"Unknown gate threshold: {gate}")
+
+    df = df[df[column].notna() & df["reasons"].notna()]
+    values = df[column].to_numpy(dtype=np.float64)[:, None]
+
+    if gate == "atr_min":
+        gate_ok = ~(values < grid)
+    elif gate == "spread_max":
+        gate_ok = ~(values > grid)
+    else:
+        width = df["buildup_width_pips"].to_numpy(dtype=np.float64)[:, None]
+        bars = df["buildup_bars"].to_numpy(dtype=np.float64)[:, None]
+        ema_inside = df["buildup_ema_inside"].fillna(False).to_numpy(dtype=bool)[:, None]
+        if gate == "buildup_min_width":
+            width_ok, bars_ok = width >= grid, bars >= thresholds["buildup_min_bars"]
+        else:
+            width_ok, bars_ok = width >= thresholds["buildup_min_width"], bars >= grid
+        score = width_ok.astype(np.int8) + bars_ok.astype(np.int8) + ema_inside.astype(np.int8)
+        gate_ok = score >= thresholds["buildup_min_score"]
+
+    others_ok = _passed_other_gates(df["reasons"].to_numpy(dtype=np.uint8), bit)[:, None]
+    all_ok = gate_ok & others_ok
+
+    curve = pd.DataFrame({
+        "gate_pass_rate": gate_ok.mean(axis=0) if len(df) else np.nan,
+        "all_pass_rate": all_ok.mean(axis=0) if len(df) else np.nan,
+    }, index=pd.Index(grid, name=gate))
+
+    if "result" in df.columns:
+        evaluated = df["result"].isin(["TP", "SL", "Timeout"]).to_numpy()[:, None]
+        admitted = all_ok & evaluated
+        wins = (df["result"] == "TP").to_numpy()[:, None]
+        pnl = df["pnl_pips"].fillna(0).to_numpy(dtype=np.float64)[:, None]
+        trades = admitted.sum(axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            curve["trades"] = trades
+            curve["win_rate"] = (admitted & wins).sum(axis=0) / trades
+            curve["avg_pnl_pips"] = (admitted * pnl).sum(axis=0) / trades
+
+    return curve
+
+
+def default_grids() -> Dict[str, np.ndarray]:
+    """Threshold grids around the current values."""
+    return {
+        "atr_min": np.arange(3.0, 10.5, 0.5),
+        "spread_max": np.arange(0.5, 4.25, 0.25),
+        "buildup_min_width": np.arange(4.0, 16.5, 1.0),
+        "buildup_min_bars": np.arange(4.0, 21.0, 1.0),
+    }
+
+
+def summarize(df: pd.DataFrame, grids: Optional[Dict[str, Iterable[float]]] = None) -> Dict:
+    """
+    Full filter report over a run history frame.
+
+    Args:
+        df: Runs with ``COLUMNS`` (plus ``pair``/``date`` and optional outcomes)
+        grids: Threshold grids for the what-if curves (``default_grids()`` if omitted)
+
+    Returns:
+        Dictionary with trigger rates (overall, by hour/setup/pair), filter
+        co-occurrence and what-if curves, all as plain JSON-able values
+    """
+    df = df.assign(hour=df["minute_jst"] // 60)
+    grids = grids or default_grids()
+    gated = df[df["reasons"].notna()]
+    rejected = gated[gated["reasons"].astype(np.uint8) != 0]
+
+    overall = trigger_rates(df)
+    report = {
+        "runs": int(len(df)),
+        "gated_runs": int(len(gated)),
+        "rejected_runs": int(len(rejected)),
+        "trigger_rates": overall.iloc[0].to_dict() if len(overall) else {},
+        "trigger_rates_by_hour": trigger_rates(df, by="hour").to_dict(orient="index"),
+        "trigger_rates_by_setup": trigger_rates(df, by="setup").to_dict(orient="index"),
+        "co_occurrence": co_occurrence(df).to_dict(orient="index"),
+        "co_occurrence_given_row": co_occurrence(df, normalize=True).round(3).to_dict(orient="index"),
+        "averages_when_rejected": _averages(rejected),
+        "what_if": {
+            gate: threshold_curve(df, gate, grid).round(4).reset_index().to_dict(orient="records")
+            for gate, grid in grids.items()
+        },
+    }
+    if "pair" in df.columns:
+        report["trigger_rates_by_pair"] = trigger_rates(df, by="pair").to_dict(orient="index")
+    return report
+
+
+def _averages(rejected: pd.DataFrame) -> Dict[str, Optional[float]]:
+    """Mean gate inputs of the runs each filter rejected."""
+    bits = reason_bits(rejected)
+    averages = {}
+    for key, name, column in (
+        ("atr", "atr", "atr20"),
+        ("spread", "spread", "spread"),
+        ("build_up", "build_up", "buildup_width_pips"),
+        ("build_up_bars", "build_up", "buildup_bars"),
+    ):
+        values = rejected.loc[bits.index[bits[name].to_numpy()], column]
+        averages[key] = round(float(values.mean()), 2) if values.notna().any() else None
+    return averages
+
+
+def frame_from_pages(pages: List[Dict]) -> pd.DataFrame:
+    """
+    Build a run history frame from exported Notion pages.
+
+    Pages carry no numeric gate inputs, so the reason bits come from the
+    ``NoTradeReason`` tags and ATR/spread/build-up values are extracted
+    from the ``Summary`` text with column-wise regexes (NaN when absent).
+
+    Args:
+        pages: Notion page objects from the analysis database
+
+    Returns:
+        Frame with ``COLUMNS`` plus ``pair``, ``date``, ``result`` and ``pnl_pips``
+    """
+    reason_tags = {"ATR<7": REASON_ATR, "Spread>2": REASON_SPREAD, "NewsWindow": REASON_NEWS, "BuildUpWeak": REASON_BUILD_UP}
+
+    def text(prop: Optional[Dict]) -> Optional[str]:
+        items = (prop or {}).get("rich_text") or (prop or {}).get("title") or []
+        return items[0]["text"]["content"] if items else None
+
+    def select(prop: Optional[Dict]) -> Optional[str]:
+        return ((prop or {}).get("select") or {}).get("name")
+
+    records = []
+    for page in pages:
+        props = page.get("properties", {})
+        tags = [o.get("name") for o in (props.get("NoTradeReason") or {}).get("multi_select", [])]
+        currency = (props.get("Currency") or {}).get("multi_select") or []
+        setup = select(props.get("Setup"))
+        records.append({
+            "run_id": text(props.get("RunId")),
+            "created_time": page.get("created_time"),
+            "date": ((props.get("Date") or {}).get("date") or {}).get("start"),
+            "pair": currency[0]["name"] if currency else None,
+            "setup": setup,
+            "reasons": sum(reason_tags.get(tag, 0) for tag in set(tags)),
+            "summary": text(props.get("Summary")) or "",
+            "result": select(props.get("AutoResult")),
+            "pnl_pips": (props.get("PnL_pips") or {}).get("number"),
+        })
+
+    df = pd.DataFrame.from_records(records)
+    if df.empty:
+        return pd.DataFrame(columns=COLUMNS + ["pair", "date", "result", "pnl_pips"])
+
+    timestamp = pd.to_datetime(df.pop("created_time"), utc=True)
+    local = timestamp.dt.tz_convert("Asia/Tokyo")
+    summary = df.pop("summary")
+    build_up = summary.str.extract(r"([0-9.]+)p\s*x\s*([0-9]+)\s*bars", flags=re.IGNORECASE)
+
+    df["timestamp"] = timestamp
+    df["minute_jst"] = (local.dt.hour * 60 + local.dt.minute).astype(np.int16)
+    df["atr20"] = pd.to_numeric(summary.str.extract(r"ATR[^0-9]*([0-9.]+)p", flags=re.IGNORECASE)[0], errors="coerce")
+    df["spread"] = pd.to_numeric(summary.str.extract(r"Spread[^0-9]*([0-9.]+)p", flags=re.IGNORECASE)[0], errors="coerce")
+    df["buildup_width_pips"] = pd.to_numeric(build_up[0], errors="coerce")
+    df["buildup_bars"] = pd.to_numeric(build_up[1], errors="coerce")
+    df["buildup_ema_inside"] = None
+    # Only No-Trade pages are tagged, so other pages passed every gate
+    df["reasons"] = df["reasons"].where(df["setup"].notna()).astype("float64")
+    return df
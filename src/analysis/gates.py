@@ -0,0 +1,150 @@
+"""Vectorized quality gates (Q01) over column arrays."""
+
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+
+# Volatile windows (first 30 minutes of each session open), JST
+NEWS_WINDOWS = [
+    (9, 0, 9, 30),    # Tokyo: 9:00-9:30
+    (15, 30, 16, 0),  # London: 15:30-16:00 (actual London open time)
+    (22, 0, 22, 30),  # NY: 22:00-22:30
+]
+
+# Reason codes (bit flags, combined per row)
+REASON_ATR = 1
+REASON_SPREAD = 2
+REASON_NEWS = 4
+REASON_BUILD_UP = 8
+
+
+def _build_news_table() -> np.ndarray:
+    """Minute-of-day lookup table: True inside a news window."""
+    table = np.zeros(24 * 60, dtype=bool)
+    for start_h, start_m, end_h, end_m in NEWS_WINDOWS:
+        table[start_h * 60 + start_m:end_h * 60 + end_m] = True
+    return table
+
+
+NEWS_WINDOW_TABLE = _build_news_table()
+
+
+def minute_of_day(timestamps, tz: str = "Asia/Tokyo") -> np.ndarray:
+    """
+    Convert timestamps to JST minute-of-day.
+
+    Args:
+        timestamps: Datetime-like array or index (naive values are taken as JST)
+        tz: Timezone the news windows are defined in
+
+    Returns:
+        int16 array in [0, 1440)
+    """
+    index = pd.DatetimeIndex(timestamps)
+    index = index.tz_localize(tz) if index.tz is None else index.tz_convert(tz)
+    return (index.hour * 60 + index.minute).to_numpy(dtype=np.int16)
+
+
+def evaluate_gates(
+    atr: Sequence[float],
+    spread: Sequence[float],
+    width_pips: Sequence[float],
+    bars: Sequence[float],
+    ema_inside: Sequence[bool],
+    minutes: Sequence[int],
+    atr_min: float = 7.0,
+    spread_max: float = 2.0,
+    buildup_min_width: float = 10.0,
+    buildup_min_bars: int = 10,
+    buildup_min_score: int = 2
+) -> Dict[str, np.ndarray]:
+    """
+    Apply the quality gates to many rows (bars, pairs) in one pass.
+
+    Args:
+        atr: ATR20 in pips
+        spread: Spread in pips
+        width_pips: Build-up width in pips
+        bars: Build-up bar count
+        ema_inside: EMA25 inside the build-up range
+        minutes: JST minute-of-day of each decision (see ``minute_of_day``)
+        atr_min: Minimum ATR
+        spread_max: Maximum spread
+        buildup_min_width: Width needed for a build-up point
+        buildup_min_bars: Bars needed for a build-up point
+        buildup_min_score: Build-up points needed (out of 3)
+
+    Returns:
+        Dict of arrays: ``atr_ok``, ``spread_ok``, ``news_window_ok``,
+        ``build_up_ok``, ``build_up_score``, ``gate_passed`` and ``reasons``
+        (REASON_* bit flags of the failed gates)
+    """
+    atr = np.asarray(atr, dtype=np.float64)
+    width_pips = np.asarray(width_pips, dtype=np.float64)
+    bars = np.asarray(bars, dtype=np.float64)
+
+    # Comparisons are written as in the scalar gates, so NaN passes them
+    atr_ok = ~(atr < atr_min)
+    spread_ok = ~(np.asarray(spread, dtype=np.float64) > spread_max)
+    news_window_ok = ~NEWS_WINDOW_TABLE[np.asarray(minutes, dtype=np.int64)]
+    build_up_score = (
+        (width_pips >= buildup_min_width).astype(np.int8)
+        + (bars >= buildup_min_bars).astype(np.int8)
+        + np.asarray(ema_inside, dtype=bool).astype(np.int8)
+    )
+    build_up_ok = build_up_score >= buildup_min_score
+
+    reasons = (
+        np.where(atr_ok, 0, REASON_ATR)
+        | np.where(spread_ok, 0, REASON_SPREAD)
+        | np.where(news_window_ok, 0, REASON_NEWS)
+        | np.where(build_up_ok, 0, REASON_BUILD_UP)
+    ).astype(np.uint8)
+
+    return {
+        "atr_ok": atr_ok,
+        "spread_ok": spread_ok,
+        "news_window_ok": news_window_ok,
+        "build_up_ok": build_up_ok,
+        "build_up_score": build_up_score,
+        "gate_passed": reasons == 0,
+        "reasons": reasons,
+    }
+
+
+def gate_columns(indicators: List[Dict]) -> Dict[str, np.ndarray]:
+    """
+    Collect gate inputs from analyzer indicator dicts (e.g., one per pair).
+
+    Returns:
+        Dict with ``atr``, ``spread``, ``width_pips``, ``bars`` and ``ema_inside``
+    """
+    build_ups = [ind.get("build_up", {}) for ind in indicators]
+    return {
+        "atr": np.array([ind.get("atr20", 0) for ind in indicators], dtype=np.float64),
+        "spread": np.array([ind.get("spread", 0) for ind in indicators], dtype=np.float64),
+        "width_pips": np.array([b.get("width_pips", 0) for b in build_ups], dtype=np.float64),
+        "bars": np.array([b.get("bars", 0) for b in build_ups], dtype=np.float64),
+        "ema_inside": np.array([bool(b.get("ema_inside", False)) for b in build_ups]),
+    }
+
+
+def describe_reasons(
+    code: int,
+    atr: float,
+    spread: float,
+    build_up_score: int,
+    atr_min: float = 7.0,
+    spread_max: float = 2.0
+) -> List[str]:
+    """Human-readable no-trade reasons for one row's reason code."""
+    reasons = []
+    if code & REASON_ATR:
+        reasons.append(f"ATR too low: {atr:.1f}p < {atr_min:g}p")
+    if code & REASON_SPREAD:
+        reasons.append(f"Spread too wide: {spread:.1f}p > {spread_max:g}p")
+    if code & REASON_NEWS:
+        reasons.append("Within news window (first 30min of session open)")
+    if code & REASON_BUILD_UP:
+        reasons.append(f"Build-up quality insufficient: {build_up_score}/3")
+    return reasons
@@ -0,0 +1,264 @@
+"""Incremental technical indicator engine shared by analysis and charting."""
+
+import threading
+import weakref
+from typing import Dict, Iterable, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+
+class IndicatorEngine:
+    """
+    EMA / ATR / rolling-range state for one OHLC bar series.
+
+    Bars live in growable NumPy buffers. Loading a DataFrame computes every
+    indicator in one vectorized pass; ``update`` then appends a single closed
+    bar in O(1), so a long-lived series never recomputes its history.
+
+    EMAs follow ``ewm(span=period, adjust=False)`` and ATR is the simple
+    moving average of true range, matching the pandas formulas used before.
+    """
+
+    EMA_PERIODS = (25, 100, 200)
+    ATR_PERIOD = 20
+    RANGE_WINDOW = 20
+
+    def __init__(self, ema_periods: Optional[Iterable[int]] = None, capacity: int = 512):
+        """
+        Initialize an empty engine.
+
+        Args:
+            ema_periods: EMA spans to maintain (defaults to 25/100/200)
+            capacity: Initial buffer size (grows automatically)
+        """
+        self.ema_periods = tuple(ema_periods or self.EMA_PERIODS)
+        self._alpha = {p: 2.0 / (p + 1.0) for p in self.ema_periods}
+        self._n = 0
+        self._alloc(max(capacity, 1))
+        self.first_timestamp = None
+        self.last_timestamp = None
+
+    def _alloc(self, capacity: int) -> None:
+        """(Re)allocate buffers, keeping existing bars."""
+        def grow(old: Optional[np.ndarray]) -> np.ndarray:
+            new = np.empty(capacity, dtype=np.float64)
+            if old is not None:
+                new[:self._n] = old[:self._n]
+            return new
+
+        self._open = grow(getattr(self, "_open", None))
+        self._high = grow(getattr(self, "_high", None))
+        self._low = grow(getattr(self, "_low", None))
+        self._close = grow(getattr(self, "_close", None))
+        self._tr = grow(getattr(self, "_tr", None))
+        old_ema = getattr(self, "_ema", {})
+        self._ema = {p: grow(old_ema.get(p)) for p in self.ema_periods}
+        self._capacity = capacity
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, ema_periods: Optional[Iterable[int]] = None) -> "IndicatorEngine":
+        """Build an engine from an OHLC DataFrame in one vectorized pass."""
+        engine = cls(ema_periods=ema_periods, capacity=max(len(df) * 2, 512))
+        engine.extend(df)
+        return engine
+
+    def __len__(self) -> int:
+        return self._n
+
+    def extend(self, df: pd.DataFrame) -> None:
+        """
+        Append a block of bars, computing their indicators vectorized.
+
+        Args:
+            df: OHLC DataFrame whose bars all come after the stored ones
+        """
+        m = len(df)
+        if m == 0:
+            return
+
+        n = self._n
+        if n + m > self._capacity:
+            self._alloc(max(self._capacity * 2, n + m))
+
+        o = df["open"].to_numpy(dtype=np.float64)
+        h = df["high"].to_numpy(dtype=np.float64)
+        l = df["low"].to_numpy(dtype=np.float64)
+        c = df["close"].to_numpy(dtype=np.float64)
+
+        # True range against the previous close (first bar ever: high - low)
+        prev_close = np.empty(m)
+        prev_close[1:] = c[:-1]
+        prev_close[0] = self._close[n - 1] if n else np.nan
+        tr = np.fmax(h - l, np.fmax(np.abs(h - prev_close), np.abs(l - prev_close)))
+
+        self._open[n:n + m] = o
+        self._high[n:n + m] = h
+        self._low[n:n + m] = l
+        self._close[n:n + m] = c
+        self._tr[n:n + m] = tr
+
+        for period in self.ema_periods:
+            series = pd.Series(c)
+            if n:
+                # Seed the recursion with the last stored EMA value
+                seeded = pd.concat([pd.Series([self._ema[period][n - 1]]), series], ignore_index=True)
+                values = seeded.ewm(span=period, adjust=False).mean().to_numpy()[1:]
+            else:
+                values = series.ewm(span=period, adjust=False).mean().to_numpy()
+            self._ema[period][n:n + m] = values
+
+        self._n = n + m
+        if self.first_timestamp is None:
+            self.first_timestamp = df.index[0]
+        self.last_timestamp = df.index[-1]
+
+    def update(self, open_: float, high: float, low: float, close: float, timestamp=None) -> None:
+        """Append one closed bar in O(1)."""
+        n = self._n
+        if n + 1 > self._capacity:
+            self._alloc(self._capacity * 2)
+
+        if n:
+            prev_close = self._close[n - 1]
+            tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        else:
+            tr = high - low
+
+        self._open[n] = open_
+        self._high[n] = high
+        self._low[n] = low
+        self._close[n] = close
+        self._tr[n] = tr
+
+        for period in self.ema_periods:
+            alpha = self._alpha[period]
+            self._ema[period][n] = close if n == 0 else alpha * close + (1 - alpha) * self._ema[period][n - 1]
+
+        self._n = n + 1
+        if self.first_timestamp is None:
+            self.first_timestamp = timestamp
+        self.last_timestamp = timestamp
+
+    def sync(self, df: pd.DataFrame) -> None:
+        """
+        Bring the engine up to date with a DataFrame that extends its bars.
+
+        Only bars after ``last_timestamp`` are appended; if ``df`` is not an
+        extension of the stored series the engine is rebuilt from it.
+        """
+        n = self._n
+        if (n and len(df) >= n
+                and df.index[0] == self.first_timestamp
+                and df.index[n - 1] == self.last_timestamp):
+            self.extend(df.iloc[n:])
+            return
+
+        self._n = 0
+        self.first_timestamp = None
+        self.last_timestamp = None
+        self.extend(df)
+
+    # Accessors
+
+    @property
+    def open(self) -> np.ndarray:
+        return self._open[:self._n]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self._high[:self._n]
+
+    @property
+    def low(self) -> np.ndarray:
+        return self._low[:self._n]
+
+    @property
+    def close(self) -> np.ndarray:
+        return self._close[:self._n]
+
+    @property
+    def true_range(self) -> np.ndarray:
+        return self._tr[:self._n]
+
+    def ema(self, period: int) -> np.ndarray:
+        """Full EMA series for a maintained period."""
+        return self._ema[period][:self._n]
+
+    def ema_last(self, period: int, offset: int = 1) -> float:
+        """EMA value ``offset`` bars from the end (1 = latest)."""
+        return float(self._ema[period][self._n - offset])
+
+    def window_ema_last(self, period: int, window: int) -> float:
+        """
+        EMA of only the last ``window`` closes, seeded at the first of them
+        (``closes[-window:].ewm(span=period, adjust=False)``, latest value).
+        """
+        closes = self._close[max(0, self._n - window):self._n]
+        return float(window_ema_weights(period, len(closes)) @ closes)
+
+    def atr(self, period: int = ATR_PERIOD) -> float:
+        """Average true range over the last ``period`` bars (NaN if too short)."""
+        if self._n < period:
+            return float("nan")
+        return float(self._tr[self._n - period:self._n].mean())
+
+    def range_high(self, window: int = RANGE_WINDOW) -> float:
+        """Highest high of the last ``window`` bars."""
+        return float(self._high[max(0, self._n - window):self._n].max())
+
+    def range_low(self, window: int = RANGE_WINDOW) -> float:
+        """Lowest low of the last ``window`` bars."""
+        return float(self._low[max(0, self._n - window):self._n].min())
+
+
+def window_ema_weights(period: int, window: int) -> np.ndarray:
+    """
+    Weights that turn ``window`` closes (oldest first) into the last value of
+    their EMA seeded at the first close, i.e. ``ewm(span=period, adjust=False)``.
+    """
+    alpha = 2.0 / (period + 1.0)
+    weights = alpha * (1.0 - alpha) ** np.arange(window - 1, -1, -1, dtype=np.float64)
+    if window:
+        weights[0] = (1.0 - alpha) ** (window - 1)
+    return weights
+
+
+# Engines for DataFrames seen in this process, so the analyzer and the chart
+# generator compute each indicator once per bar. DataFrames are treated as
+# immutable once passed in.
+_engine_cache: Dict[int, Tuple[weakref.ref, IndicatorEngine]] = {}
+_engine_cache_lock = threading.Lock()
+
+
+def _evict(ref: weakref.ref, key: int) -> None:
+    """Drop a cache entry once its DataFrame is garbage collected."""
+    with _engine_cache_lock:
+        entry = _engine_cache.get(key)
+        if entry is not None and entry[0] is ref:
+            del _engine_cache[key]
+
+
+def engine_for(df: pd.DataFrame) -> IndicatorEngine:
+    """
+    Get the indicator engine for a DataFrame, building it on first use.
+
+    Args:
+        df: OHLC DataFrame
+
+    Returns:
+        Engine whose bars are exactly the rows of ``df``
+    """
+    key = id(df)
+    with _engine_cache_lock:
+        entry = _engine_cache.get(key)
+        if entry is not None:
+            ref, engine = entry
+            if (ref() is df and len(engine) == len(df)
+                    and (len(df) == 0 or engine.last_timestamp == df.index[-1])):
+                return engine
+
+    engine = IndicatorEngine.from_frame(df)
+    ref = weakref.ref(df, lambda r, key=key: _evict(r, key))
+    with _engine_cache_lock:
+        _engine_cache[key] = (ref, engine)
+    return engine
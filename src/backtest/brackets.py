@@ -0,0 +1,113 @@
+"""Vectorized TP/SL bracket resolution over OHLC arrays."""
+
+from typing import Dict, Union
+import numpy as np
+
+# Outcome codes
+OUTCOME_TP = 1
+OUTCOME_SL = -1
+OUTCOME_TIMEOUT = 0
+OUTCOME_NO_DATA = 2
+
+OUTCOME_NAMES = {
+    OUTCOME_TP: "TP",
+    OUTCOME_SL: "SL",
+    OUTCOME_TIMEOUT: "Timeout",
+    OUTCOME_NO_DATA: "NoFill",
+}
+
+ArrayLike = Union[np.ndarray, float, int]
+
+
+def resolve_brackets(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    entry_idx: np.ndarray,
+    direction: ArrayLike,
+    tp_price: ArrayLike,
+    sl_price: ArrayLike,
+    max_bars: ArrayLike,
+    tp_first: bool = False
+) -> Dict[str, np.ndarray]:
+    """
+    Find the first TP or SL touch of many trades at once.
+
+    For every trade the bars ``entry_idx + 1 .. entry_idx + max_bars`` are
+    gathered into one 2D window and the first crossing is located with
+    ``argmax`` over the boolean hit masks, so no Python loop runs per bar.
+
+    Args:
+        high: Bar highs
+        low: Bar lows
+        close: Bar closes (used to mark timed-out trades to market)
+        entry_idx: Index of the entry bar of each trade (entry at its close)
+        direction: +1 for long, -1 for short (scalar or per trade)
+        tp_price: Take-profit price (scalar or per trade)
+        sl_price: Stop-loss price (scalar or per trade)
+        max_bars: Bars until timeout (scalar or per trade)
+        tp_first: When both levels are touched in the same bar, count it as
+            TP (optimistic) instead of SL (conservative)
+
+    Returns:
+        Dict of per-trade arrays: ``outcome`` (OUTCOME_* codes),
+        ``exit_idx`` (bar index of the exit, -1 if no data) and
+        ``exit_price`` (TP/SL level, or the close at timeout)
+    """
+    entry_idx = np.asarray(entry_idx, dtype=np.int64)
+    k = len(entry_idx)
+    n = len(high)
+
+    direction = np.broadcast_to(np.asarray(direction, dtype=np.int8), (k,))
+    tp_price = np.broadcast_to(np.asarray(tp_price, dtype=np.float64), (k,))
+    sl_price = np.broadcast_to(np.asarray(sl_price, dtype=np.float64), (k,))
+    max_bars = np.broadcast_to(np.asarray(max_bars, dtype=np.int64), (k,))
+
+    outcome = np.full(k, OUTCOME_NO_DATA, dtype=np.int8)
+    exit_idx = np.full(k, -1, dtype=np.int64)
+    exit_price = np.full(k, np.nan)
+
+    if k == 0 or n == 0:
+        return {"outcome": outcome, "exit_idx": exit_idx, "exit_price": exit_price}
+
+    width = max(int(max_bars.max()), 1)
+    offsets = np.arange(1, width + 1)
+    idx = entry_idx[:, None] + offsets[None, :]
+    valid = (idx < n) & (offsets[None, :] <= max_bars[:, None])
+    idx = np.minimum(idx, n - 1)
+
+    h = high[idx]
+    l = low[idx]
+    is_long = (direction > 0)[:, None]
+
+    tp_hit = np.where(is_long, h >= tp_price[:, None], l <= tp_price[:, None]) & valid
+    sl_hit = np.where(is_long, l <= sl_price[:, None], h >= sl_price[:, None]) & valid
+
+    # First touch of each level (width means "never")
+    tp_at = np.where(tp_hit.any(axis=1), tp_hit.argmax(axis=1), width)
+    sl_at = np.where(sl_hit.any(axis=1), sl_hit.argmax(axis=1), width)
+
+    if tp_first:
+        tp_wins = tp_at <= sl_at
+    else:
+        tp_wins = tp_at < sl_at
+    hit_tp = (tp_at < width) & tp_wins
+    hit_sl = (sl_at < width) & ~hit_tp
+
+    outcome[hit_tp] = OUTCOME_TP
+    exit_idx[hit_tp] = entry_idx[hit_tp] + 1 + tp_at[hit_tp]
+    exit_price[hit_tp] = tp_price[hit_tp]
+
+    outcome[hit_sl] = OUTCOME_SL
+    exit_idx[hit_sl] = entry_idx[hit_sl] + 1 + sl_at[hit_sl]
+    exit_price[hit_sl] = sl_price[hit_sl]
+
+    # Timeouts: close of the last bar inside the window
+    bars_seen = valid.sum(axis=1)
+    timed_out = ~hit_tp & ~hit_sl & (bars_seen > 0)
+    last = entry_idx[timed_out] + bars_seen[timed_out]
+    outcome[timed_out] = OUTCOME_TIMEOUT
+    exit_idx[timed_out] = last
+    exit_price[timed_out] = close[last]
+
+    return {"outcome": outcome, "exit_idx": exit_idx, "exit_price": exit_price}
@@ -0,0 +1,452 @@
+"""Vectorized backtest of the FXAnalyzerV2 quality gates and setup tree."""
+
+import argparse
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.utils.logger import get_logger
+from src.analysis.core_v2 import FXAnalyzerV2
+from src.analysis.indicators import IndicatorEngine, window_ema_weights
+from src.analysis.gates import evaluate_gates, minute_of_day
+from src.backtest.brackets import (
+    resolve_brackets,
+    OUTCOME_TP,
+    OUTCOME_SL,
+    OUTCOME_NO_DATA,
+    OUTCOME_NAMES,
+)
+
+logger = get_logger(__name__)
+
+SETUPS = ["A", "B", "C", "D", "E", "F"]
+
+# Mirrors FXAnalyzerV2._create_plan
+SETUP_TIMEOUT_MIN = {"A": 60, "B": 45, "C": 30, "D": 30, "E": 90, "F": 30}
+
+# The live plan has no side, so the backtest trades continuation setups long,
+# reversal setups short and range scalps back toward the EMA
+SETUP_DIRECTION = {"A": 1, "B": 1, "E": 1, "C": -1, "D": -1}
+
+
+@dataclass
+class BacktestParams:
+    """Tunable thresholds of the quality gates and EV model."""
+
+    atr_min: float = 7.0
+    spread_max: float = 2.0
+    buildup_min_width: float = 10.0
+    buildup_min_bars: int = 10
+    buildup_min_score: int = 2
+    setup_alpha: Dict[str, float] = field(default_factory=lambda: dict(FXAnalyzerV2.SETUP_ALPHA))
+    setup_beta: Dict[str, float] = field(default_factory=lambda: dict(FXAnalyzerV2.SETUP_BETA))
+    min_ev_R: Optional[float] = None  # Skip signals whose EV is below this
+    non_overlapping: bool = True  # Ignore signals while a trade is open
+    tp_first: bool = False  # Same-bar TP and SL counts as SL unless set
+
+
+def _rolling(values: np.ndarray, window: int, func) -> np.ndarray:
+    """Trailing rolling reduction; the first ``window - 1`` entries are NaN."""
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        out[window - 1:] = func(sliding_window_view(values, window), axis=1)
+    return out
+
+
+def _shift(values: np.ndarray, periods: int) -> np.ndarray:
+    """Shift an array forward by ``periods`` entries, padding with NaN."""
+    out = np.full(len(values), np.nan)
+    if periods < len(values):
+        out[periods:] = values[:len(values) - periods]
+    return out
+
+
+def _bar_minutes(index: pd.DatetimeIndex) -> float:
+    """Typical bar length of an index in minutes."""
+    if len(index) < 2:
+        return 5.0
+    return float(pd.Series(index).diff().median().total_seconds() / 60)
+
+
+def _ema_slope_deg(ema: np.ndarray) -> np.ndarray:
+    """EMA slope in degrees over the last 10 bars (as calculate_indicators)."""
+    return np.degrees(np.arctan((ema - _shift(ema, 9)) / 10))
+
+
+def compute_features(df_5m: pd.DataFrame, df_1h: pd.DataFrame, pair: str = "USDJPY") -> pd.DataFrame:
+    """
+    Compute every per-bar input of the gates and setup tree in one pass.
+
+    Each row holds what ``FXAnalyzerV2.analyze`` would have seen at the close
+    of that 5m bar. Indicators run over the full history rather than the live
+    200-bar window, which only changes the EMA seed in the first few bars.
+
+    Args:
+        df_5m: 5-minute OHLC bars (tz-aware JST index)
+        df_1h: 1-hour OHLC bars (tz-aware JST index)
+        pair: Trading pair (selects the pip size)
+
+    Returns:
+        DataFrame of feature columns indexed like ``df_5m``
+    """
+    pip_factor = 100 if "JPY" in pair else 10000
+    round_step = 0.5 if "JPY" in pair else 0.005
+
+    engine = IndicatorEngine.from_frame(df_5m, ema_periods=(25,))
+    close, high, low = engine.close, engine.high, engine.low
+    ema = engine.ema(25)
+    n = len(engine)
+    pos = np.arange(n)
+
+    atr_pips = _rolling(engine.true_range, 20, np.mean) * pip_factor
+    range_high = _rolling(high, 20, np.max)
+    range_low = _rolling(low, 20, np.min)
+    # EMA25 of each build-up window's own closes (FXAnalyzerV2._detect_buildup)
+    window_ema = _rolling(close, 20, lambda windows, axis: windows @ window_ema_weights(25, 20))
+
+    # Pullback: last 5 lows touched the EMA and price closed above it
+    pullback = (_rolling(low, 5, np.min) <= ema * 1.001) & (close > ema)
+
+    # Failed break: spike above the prior 15-bar high, close back below it
+    prior_high = _shift(_rolling(high, 15, np.max), 5)
+    spike_high = _rolling(high, 5, np.max)
+    failed_break = (spike_high > prior_high * 1.002) & (close < prior_high) & (pos >= 19)
+
+    nearest_round = np.round(close / round_step) * round_step
+    near_round = np.abs(close - nearest_round) * pip_factor < 20
+
+    # Decisions happen at the close of each bar
+    bar_minutes = _bar_minutes(df_5m.index)
+    decision_time = df_5m.index + pd.Timedelta(minutes=bar_minutes)
+    decision_minutes = minute_of_day(decision_time)
+
+    spread = df_5m["spread"].to_numpy(dtype=np.float64) if "spread" in df_5m.columns else np.full(n, 0.1)
+
+    features = pd.DataFrame({
+        "high": high,
+        "low": low,
+        "close": close,
+        "ema25": ema,
+        "ema25_slope_deg": _ema_slope_deg(ema),
+        "atr20": atr_pips,
+        "spread": spread,
+        "width_pips": (range_high - range_low) * pip_factor,
+        "bars": np.where(pos >= 19, 20, 0),
+        "ema_inside": (range_low <= window_ema) & (window_ema <= range_high),
+        "pullback": pullback & (pos >= 24),
+        "failed_break": failed_break,
+        "near_round": near_round,
+        "minute_of_day": decision_minutes,
+        "valid": pos >= 24,  # calculate_indicators needs 25 bars
+    }, index=df_5m.index)
+
+    # 1h environment: slope of the last 1h bar closed at decision time
+    if len(df_1h) > 0:
+        engine_1h = IndicatorEngine.from_frame(df_1h, ema_periods=(25,))
+        slope_1h = _ema_slope_deg(engine_1h.ema(25))
+        slope_1h[np.arange(len(engine_1h)) < 24] = 0.0  # Too few bars: ranging
+        hour_minutes = _bar_minutes(df_1h.index)
+        env = pd.DataFrame({
+            "close_time": df_1h.index + pd.Timedelta(minutes=hour_minutes),
+            "slope_1h": slope_1h,
+        })
+        merged = pd.merge_asof(
+            pd.DataFrame({"decision_time": decision_time}),
+            env,
+            left_on="decision_time",
+            right_on="close_time",
+            direction="backward"
+        )
+        features["slope_1h"] = merged["slope_1h"].fillna(0.0).to_numpy()
+    else:
+        features["slope_1h"] = 0.0
+
+    features.attrs["bar_minutes"] = bar_minutes
+    features.attrs["pip_factor"] = pip_factor
+    return features
+
+
+def evaluate_signals(features: pd.DataFrame, params: BacktestParams) -> pd.DataFrame:
+    """
+    Apply the quality gates, setup tree, plan and EV model to every bar.
+
+    Args:
+        features: Output of ``compute_features``
+        params: Gate thresholds and EV priors
+
+    Returns:
+        DataFrame with gate flags, setup, plan and EV per bar
+    """
+    f = features
+    atr = f["atr20"].to_numpy()
+    width = f["width_pips"].to_numpy()
+    bars = f["bars"].to_numpy()
+
+    # Quality gates
+    gates = evaluate_gates(
+        atr=atr,
+        spread=f["spread"].to_numpy(),
+        width_pips=width,
+        bars=bars,
+        ema_inside=f["ema_inside"].to_numpy(),
+        minutes=f["minute_of_day"].to_numpy(),
+        atr_min=params.atr_min,
+        spread_max=params.spread_max,
+        buildup_min_width=params.buildup_min_width,
+        buildup_min_bars=params.buildup_min_bars,
+        buildup_min_score=params.buildup_min_score
+    )
+    gate_passed = gates["gate_passed"]
+
+    # Setup decision tree (as _determine_setup_v2)
+    slope_1h = f["slope_1h"].to_numpy()
+    slope_5m = f["ema25_slope_deg"].to_numpy()
+    bullish = slope_1h > 5
+    bearish = slope_1h < -5
+    ranging = ~bullish & ~bearish
+    setup = np.select(
+        [
+            bullish & (width > 15) & (bars > 15),
+            bullish & (slope_5m > 10),
+            bullish & f["pullback"].to_numpy(),
+            bearish & f["failed_break"].to_numpy(),
+            bearish & (width > 15),
+            ranging & (width > 10) & (width < 20),
+        ],
+        ["A", "E", "B", "D", "C", "F"],
+        default="No-Trade"
+    )
+    has_setup = setup != "No-Trade"
+
+    # Confluence: three tree reasons + round number + favorable ATR
+    confluence = np.where(has_setup, 3 + f["near_round"].to_numpy() + (atr > 10), 0)
+
+    # Plan (as _create_plan)
+    scale = np.where(atr > 15, 1.25, np.where(atr < 10, 0.75, 1.0))
+    tp_pips = np.round(np.where(setup == "F", 10.0, 20.0 * scale), 1)
+    sl_pips = np.round(10.0 * scale, 1)
+    timeout_min = pd.Series(setup).map(SETUP_TIMEOUT_MIN).fillna(0).to_numpy()
+
+    # EV (as _calculate_ev)
+    alpha = pd.Series(setup).map(params.setup_alpha).fillna(2).to_numpy(dtype=float)
+    beta = pd.Series(setup).map(params.setup_beta).fillna(2).to_numpy(dtype=float)
+    win_rate = alpha / (alpha + beta) * 0.9
+    win_rate = np.where(confluence < 3, win_rate * 0.8, np.where(confluence >= 5, win_rate * 1.1, win_rate))
+    win_rate = np.clip(win_rate, 0.1, 0.9)
+    r_multiple = tp_pips / sl_pips
+    ev_R = np.where(has_setup, win_rate * r_multiple - (1 - win_rate), 0.0)
+
+    direction = pd.Series(setup).map(SETUP_DIRECTION).to_numpy()
+    range_dir = np.where(f["close"].to_numpy() < f["ema25"].to_numpy(), 1, -1)
+    direction = np.where(setup == "F", range_dir, np.nan_to_num(direction)).astype(np.int8)
+
+    signal = f["valid"].to_numpy() & gate_passed & has_setup
+    if params.min_ev_R is not None:
+        signal &= ev_R >= params.min_ev_R
+
+    return pd.DataFrame({
+        "atr_ok": gates["atr_ok"],
+        "spread_ok": gates["spread_ok"],
+        "news_window_ok": gates["news_window_ok"],
+        "build_up_ok": gates["build_up_ok"],
+        "gate_passed": gate_passed,
+        "gate_reasons": gates["reasons"],
+        "setup": setup,
+        "confluence": confluence,
+        "tp_pips": tp_pips,
+        "sl_pips": sl_pips,
+        "timeout_min": timeout_min,
+        "ev_R": ev_R,
+        "direction": direction,
+        "signal": signal,
+    }, index=features.index)
+
+
+def simulate_trades(features: pd.DataFrame, signals: pd.DataFrame, params: BacktestParams) -> pd.DataFrame:
+    """
+    Simulate TP/SL/timeout brackets for every signal bar.
+
+    Entries fill at the close of the signal bar; all brackets are resolved
+    together with ``resolve_brackets``.
+
+    Args:
+        features: Output of ``compute_features``
+        signals: Output of ``evaluate_signals``
+        params: Backtest parameters
+
+    Returns:
+        DataFrame with one row per trade
+    """
+    pip_factor = features.attrs.get("pip_factor", 100)
+    bar_minutes = features.attrs.get("bar_minutes", 5.0)
+
+    entry_idx = np.flatnonzero(signals["signal"].to_numpy())
+    sig = signals.iloc[entry_idx]
+    close = features["close"].to_numpy()
+
+    direction = sig["direction"].to_numpy()
+    entry_price = close[entry_idx]
+    tp_price = entry_price + direction * sig["tp_pips"].to_numpy() / pip_factor
+    sl_price = entry_price - direction * sig["sl_pips"].to_numpy() / pip_factor
+    max_bars = np.ceil(sig["timeout_min"].to_numpy() / bar_minutes).astype(np.int64)
+
+    resolved = resolve_brackets(
+        features["high"].to_numpy(), features["low"].to_numpy(), close, entry_idx, direction, tp_price, sl_price, max_bars,
+        tp_first=params.tp_first
+    )
+
+    outcome = resolved["outcome"]
+    exit_price = resolved["exit_price"]
+    sl_pips = sig["sl_pips"].to_numpy()
+    pnl_pips = direction * (exit_price - entry_price) * pip_factor
+    r = np.where(outcome == OUTCOME_TP, sig["tp_pips"].to_numpy() / sl_pips,
+                 np.where(outcome == OUTCOME_SL, -1.0, pnl_pips / sl_pips))
+
+    trades = pd.DataFrame({
+        "entry_time": features.index[entry_idx],
+        "setup": sig["setup"].to_numpy(),
+        "direction": direction,
+        "entry_price": entry_price,
+        "tp_pips": sig["tp_pips"].to_numpy(),
+        "sl_pips": sl_pips,
+        "ev_R": sig["ev_R"].to_numpy(),
+        "outcome": [OUTCOME_NAMES[o] for o in outcome],
+        "exit_idx": resolved["exit_idx"],
+        "pnl_pips": np.round(pnl_pips, 1),
+        "r_multiple": r,
+        "entry_idx": entry_idx,
+    })
+    trades = trades[outcome != OUTCOME_NO_DATA]
+
+    if params.non_overlapping and len(trades):
+        # Greedy pass over signals only: skip entries while a trade is open
+        keep = np.zeros(len(trades), dtype=bool)
+        open_until = -1
+        for i, (entry, exit_) in enumerate(zip(trades["entry_idx"].to_numpy(), trades["exit_idx"].to_numpy())):
+            if entry > open_until:
+                keep[i] = True
+                open_until = exit_
+        trades = trades[keep]
+
+    return trades.reset_index(drop=True)
+
+
+def summarize(trades: pd.DataFrame, signals: pd.DataFrame) -> Dict:
+    """
+    Summarize trades per setup.
+
+    Args:
+        trades: Output of ``simulate_trades``
+        signals: Output of ``evaluate_signals``
+
+    Returns:
+        Report dict with overall and per-setup win rate and R
+    """
+    def stats(group: pd.DataFrame) -> Dict:
+        count = len(group)
+        wins = int((group["outcome"] == "TP").sum())
+        return {
+            "trades": count,
+            "wins": wins,
+            "losses": int((group["outcome"] == "SL").sum()),
+            "timeouts": int((group["outcome"] == "Timeout").sum()),
+            "win_rate": round(wins / count, 4) if count else 0.0,
+            "avg_R": round(float(group["r_multiple"].mean()), 4) if count else 0.0,
+            "total_R": round(float(group["r_multiple"].sum()), 2),
+            "total_pips": round(float(group["pnl_pips"].sum()), 1),
+        }
+
+    gate_cols = ["atr_ok", "spread_ok", "news_window_ok", "build_up_ok", "gate_passed"]
+    return {
+        "bars": len(signals),
+        "signals": int(signals["signal"].sum()),
+        "gate_pass_rates": {c: round(float(signals[c].mean()), 4) for c in gate_cols} if len(signals) else {},
+        "overall": stats(trades),
+        "setups": {setup: stats(trades[trades["setup"] == setup]) for setup in SETUPS},
+    }
+
+
+class Backtester:
+    """Replay stored bars through the v2 gates and setup tree."""
+
+    def __init__(self, df_5m: pd.DataFrame, df_1h: pd.DataFrame, pair: str = "USDJPY"):
+        """
+        Precompute features once; ``run`` can then be called per parameter set.
+
+        Args:
+            df_5m: 5-minute OHLC bars
+            df_1h: 1-hour OHLC bars
+            pair: Trading pair
+        """
+        self.pair = pair
+        started = time.perf_counter()
+        self.features = compute_features(df_5m, df_1h, pair)
+        logger.info(
+            "Computed backtest features",
+            pair=pair,
+            bars=len(df_5m),
+            elapsed_ms=int((time.perf_counter() - started) * 1000)
+        )
+
+    @classmethod
+    def from_store(
+        cls,
+        symbol: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        store=None
+    ) -> "Backtester":
+        """Load 5m/1h bars from the bar store."""
+        from src.data_fetcher.bar_store import BarStore
+
+        store = store or BarStore()
+        frames = []
+        for interval in ("5min", "1h"):
+            df = store.read(symbol, interval)
+            if df.empty:
+                raise ValueError(f"No stored {interval} bars for {symbol}")
+            frames.append(df.loc[start:end])
+        return cls(frames[0], frames[1], pair=symbol.replace("/", ""))
+
+    def run(self, params: Optional[BacktestParams] = None) -> Dict:
+        """
+        Run the backtest for one parameter set.
+
+        Returns:
+            Dict with "summary" (report dict) and "trades" (DataFrame)
+        """
+        params = params or BacktestParams()
+        started = time.perf_counter()
+
+        signals = evaluate_signals(self.features, params)
+        trades = simulate_trades(self.features, signals, params)
+        summary = summarize(trades, signals)
+        summary["elapsed_ms"] = int((time.perf_counter() - started) * 1000)
+
+        return {"summary": summary, "trades": trades}
+
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Backtest v2 setups over stored bars")
+    parser.add_argument("--symbol", default="USD/JPY", help="Symbol in the bar store (default: USD/JPY)")
+    parser.add_argument("--start", help="First date to include (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Last date to include (YYYY-MM-DD)")
+    parser.add_argument("--trades-csv", help="Write individual trades to this CSV file")
+    args = parser.parse_args()
+
+    backtester = Backtester.from_store(args.symbol, args.start, args.end)
+    result = backtester.run()
+
+    if args.trades_csv:
+        result["trades"].to_csv(args.trades_csv, index=False)
+
+    print(json.dumps(result["summary"], indent=2))
+
+
+if __name__ == "__main__":
+    main()
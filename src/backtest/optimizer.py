@@ -0,0 +1,234 @@
+"""Parallel parameter sweep over the quality-gate thresholds."""
+
+import argparse
+import itertools
+import multiprocessing
+import random
+import time
+from dataclasses import asdict
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+from src.utils.logger import get_logger
+from src.backtest.engine import Backtester, BacktestParams, evaluate_signals, simulate_trades, summarize
+
+logger = get_logger(__name__)
+
+DEFAULT_GRID = {
+    "atr_min": [5.0, 6.0, 7.0, 8.0, 9.0],
+    "spread_max": [1.5, 2.0, 3.0],
+    "buildup_min_width": [6.0, 8.0, 10.0, 12.0],
+    "buildup_min_bars": [5, 10, 15],
+    "buildup_min_score": [1, 2, 3],
+}
+
+# Worker-side features, rebuilt once from shared memory
+_worker_features: Optional[pd.DataFrame] = None
+_worker_shm: Optional[shared_memory.SharedMemory] = None
+
+
+class SharedFeatures:
+    """Backtest features packed into one shared-memory block."""
+
+    def __init__(self, features: pd.DataFrame):
+        """Copy the feature columns into a new shared-memory block."""
+        self.columns = list(features.columns)
+        self.dtypes = [str(features[c].dtype) for c in self.columns]
+        self.shape = (len(self.columns), len(features))
+        self.index_ns = features.index.asi8.copy()
+        self.tz = str(features.index.tz) if features.index.tz is not None else None
+        self.attrs = dict(features.attrs)
+
+        self.shm = shared_memory.SharedMemory(create=True, size=max(8, 8 * self.shape[0] * self.shape[1]))
+        block = np.ndarray(self.shape, dtype=np.float64, buffer=self.shm.buf)
+        for row, column in enumerate(self.columns):
+            block[row] = features[column].to_numpy(dtype=np.float64)
+
+    def spec(self) -> Dict:
+        """Picklable description used by workers to attach."""
+        return {
+            "name": self.shm.name,
+            "columns": self.columns,
+            "dtypes": self.dtypes,
+            "shape": self.shape,
+            "index_ns": self.index_ns,
+            "tz": self.tz,
+            "attrs": self.attrs,
+        }
+
+    def close(self) -> None:
+        """Release the shared-memory block."""
+        self.shm.close()
+        self.shm.unlink()
+
+
+def _attach_features(spec: Dict) -> None:
+    """Pool initializer: map the shared block and rebuild the features frame."""
+    global _worker_features, _worker_shm
+    _worker_shm = shared_memory.SharedMemory(name=spec["name"])
+    block = np.ndarray(spec["shape"], dtype=np.float64, buffer=_worker_shm.buf)
+
+    index = pd.DatetimeIndex(spec["index_ns"])
+    index = index.tz_localize("UTC").tz_convert(spec["tz"]) if spec["tz"] else index
+    _worker_features = pd.DataFrame(
+        {c: block[i].astype(dtype, copy=False) for i, (c, dtype) in enumerate(zip(spec["columns"], spec["dtypes"]))},
+        index=index
+    )
+    _worker_features.attrs.update(spec["attrs"])
+
+
+def make_params(overrides: Dict) -> BacktestParams:
+    """
+    Build BacktestParams from flat overrides.
+
+    Keys are BacktestParams fields, or ``alpha.<setup>`` / ``beta.<setup>``
+    for the Beta priors.
+    """
+    params = BacktestParams()
+    for key, value in overrides.items():
+        if key.startswith("alpha."):
+            params.setup_alpha[key.split(".", 1)[1]] = value
+        elif key.startswith("beta."):
+            params.setup_beta[key.split(".", 1)[1]] = value
+        elif hasattr(params, key):
+            setattr(params, key, value)
+        else:
+            raise ValueError(f"Unknown parameter: {key}")
+    return params
+
+
+def _evaluate(overrides: Dict) -> Dict:
+    """Run one backtest in a worker and flatten its summary."""
+    params = make_params(overrides)
+    signals = evaluate_signals(_worker_features, params)
+    trades = simulate_trades(_worker_features, signals, params)
+    summary = summarize(trades, signals)
+
+    row = dict(overrides)
+    row.update({
+        "trades": summary["overall"]["trades"],
+        "win_rate": summary["overall"]["win_rate"],
+        "avg_R": summary["overall"]["avg_R"],
+        "total_R": summary["overall"]["total_R"],
+        "total_pips": summary["overall"]["total_pips"],
+        "gate_pass_rate": summary["gate_pass_rates"].get("gate_passed", 0.0),
+    })
+    return row
+
+
+def expand_grid(grid: Dict[str, List], samples: Optional[int] = None, seed: int = 0) -> List[Dict]:
+    """
+    Expand a parameter grid into combinations.
+
+    Args:
+        grid: Parameter name to candidate values
+        samples: Draw this many random combinations instead of the full grid
+        seed: Random seed for sampling
+
+    Returns:
+        List of override dicts
+    """
+    keys = list(grid)
+    combos = [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+    if samples is not None and samples < len(combos):
+        combos = random.Random(seed).sample(combos, samples)
+    return combos
+
+
+def sweep(
+    backtester: Backtester,
+    grid: Optional[Dict[str, List]] = None,
+    samples: Optional[int] = None,
+    workers: Optional[int] = None,
+    objective: str = "total_R",
+    min_trades: int = 20
+) -> pd.DataFrame:
+    """
+    Backtest many threshold combinations across a process pool.
+
+    Features are computed once and shared with the workers through shared
+    memory, so each task only re-evaluates gates, signals and brackets.
+
+    Args:
+        backtester: Backtester holding precomputed features
+        grid: Parameter grid (defaults to DEFAULT_GRID)
+        samples: Random-search budget (full grid when omitted)
+        workers: Pool size (defaults to CPU count)
+        objective: Column to rank by (descending)
+        min_trades: Combinations with fewer trades are ranked last
+
+    Returns:
+        Results table ranked best first
+    """
+    combos = expand_grid(grid or DEFAULT_GRID, samples)
+    workers = workers or multiprocessing.cpu_count()
+    started = time.perf_counter()
+
+    shared = SharedFeatures(backtester.features)
+    try:
+        ctx = multiprocessing.get_context("spawn")
+        with ctx.Pool(processes=workers, initializer=_attach_features, initargs=(shared.spec(),)) as pool:
+            rows = pool.map(_evaluate, combos, chunksize=max(1, len(combos) // (workers * 4)))
+    finally:
+        shared.close()
+
+    results = pd.DataFrame(rows)
+    results["eligible"] = results["trades"] >= min_trades
+    results = results.sort_values(["eligible", objective], ascending=[False, False]).reset_index(drop=True)
+    results.insert(0, "rank", range(1, len(results) + 1))
+
+    logger.info(
+        "Parameter sweep completed",
+        combinations=len(combos),
+        workers=workers,
+        elapsed_ms=int((time.perf_counter() - started) * 1000)
+    )
+
+    return results
+
+
+def _parse_grid_arg(values: List[str]) -> Dict[str, List]:
+    """Parse repeated ``name=v1,v2,...`` arguments."""
+    grid = {}
+    for item in values:
+        name, _, raw = item.partition("=")
+        grid[name] = [float(v) if "." in v else int(v) for v in raw.split(",")]
+    return grid
+
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Sweep quality-gate thresholds over stored bars")
+    parser.add_argument("--symbol", default="USD/JPY", help="Symbol in the bar store (default: USD/JPY)")
+    parser.add_argument("--start", help="First date to include (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Last date to include (YYYY-MM-DD)")
+    parser.add_argument("--grid", action="append", default=[],
+                        help="Parameter values, e.g. atr_min=5,6,7 or alpha.A=2,3 (repeatable)")
+    parser.add_argument("--random", type=int, help="Random-search budget instead of the full grid")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--objective", default="total_R", help="Ranking column (default: total_R)")
+    parser.add_argument("--min-trades", type=int, default=20, help="Minimum trades to rank (default: 20)")
+    parser.add_argument("--out", default="sweep_results.csv", help="Results CSV (default: sweep_results.csv)")
+    parser.add_argument("--top", type=int, default=20, help="Rows to print (default: 20)")
+    args = parser.parse_args()
+
+    backtester = Backtester.from_store(args.symbol, args.start, args.end)
+    results = sweep(
+        backtester,
+        grid=_parse_grid_arg(args.grid) if args.grid else None,
+        samples=args.random,
+        workers=args.workers,
+        objective=args.objective,
+        min_trades=args.min_trades
+    )
+
+    results.to_csv(args.out, index=False)
+    print(results.head(args.top).to_string(index=False))
+    print(f"\nFull results saved to: {args.out}")
+    print(f"Baseline: {asdict(BacktestParams())}")
+
+
+if __name__ == "__main__":
+    main()
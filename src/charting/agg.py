@@ -0,0 +1,221 @@
+"""Fast candlestick renderer drawing straight to a reused Agg canvas."""
+
+import io
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.figure import Figure
+from matplotlib.patches import Patch
+from matplotlib.ticker import FuncFormatter, MaxNLocator
+from PIL import Image
+
+# Dark theme shared with the mplfinance style in src.charting.mpl
+BACKGROUND = '#0a0e27'
+GRID_COLOR = '#333333'
+UP_COLOR = '#00E5FF'
+DOWN_COLOR = '#FF5252'
+CANDLE_ALPHA = 0.9
+BODY_WIDTH = 0.6
+
+# (period, color) of the EMA lines, drawn when there are at least `period` bars
+EMA_LINES = [(25, 'white'), (100, 'yellow'), (200, '#FF5252')]
+
+# Axes placement in figure fraction; the right margin holds ticks and the price
+# tag, with the "Price" label past both (same layout as src.charting.mpl)
+AXES_RECT = (0.03, 0.08, 0.83, 0.84)
+PRICE_LABEL_X = 1.1
+
+
+class AggCandleRenderer:
+    """
+    Render candlestick charts without mplfinance or pyplot.
+
+    One Figure/FigureCanvasAgg and its artists are built once; each chart
+    only swaps in new vertex arrays, so no per-chart figure, style, legend
+    or font setup is paid. Not thread-safe: callers serialize renders.
+    """
+
+    def __init__(self, figsize: Tuple[float, float] = (12, 6), dpi: int = 100):
+        """
+        Build the figure and its artists.
+
+        Args:
+            figsize: Figure size in inches
+            dpi: Output resolution
+        """
+        self.dpi = dpi
+        self.figure = Figure(figsize=figsize, dpi=dpi, facecolor=BACKGROUND)
+        self.canvas = FigureCanvasAgg(self.figure)
+
+        ax = self.ax = self.figure.add_axes(AXES_RECT)
+        ax.set_facecolor(BACKGROUND)
+        for side in ('top', 'bottom', 'right'):
+            ax.spines[side].set_color(GRID_COLOR)
+        ax.spines['left'].set_visible(False)
+        ax.yaxis.tick_right()
+        ax.yaxis.set_label_position('right')
+        ax.set_ylabel('Price', rotation=270, color='white')
+        ax.yaxis.set_label_coords(PRICE_LABEL_X, 0.5)
+        ax.tick_params(axis='y', colors='white', labelright=True, labelleft=False, labelsize=10)
+        ax.tick_params(axis='x', colors='white', labelsize=10)
+        ax.grid(True, linestyle='--', linewidth=0.5, alpha=0.2, color=GRID_COLOR)
+        ax.set_axisbelow(True)
+
+        self._times: Sequence[pd.Timestamp] = []
+        ax.xaxis.set_major_locator(MaxNLocator(nbins=8, integer=True))
+        ax.xaxis.set_major_formatter(FuncFormatter(self._format_time))
+
+        self.wicks = LineCollection([], linewidths=1.0, alpha=CANDLE_ALPHA)
+        self.bodies = PolyCollection([], linewidths=0.5, alpha=CANDLE_ALPHA)
+        ax.add_collection(self.wicks)
+        ax.add_collection(self.bodies)
+
+        self.ema_lines = [
+            ax.plot([], [], color=color, linewidth=1.5, alpha=0.9)[0]
+            for _, color in EMA_LINES
+        ]
+        self.price_line = ax.axhline(0, color='white', linestyle='--', linewidth=1, alpha=0.5)
+
+        # x in axes fraction, y in data: just right of the plot at the price
+        self.price_label = ax.text(
+            1.01, 0, '',
+            transform=ax.get_yaxis_transform(),
+            ha='left',
+            va='center',
+            bbox=dict(boxstyle='round,pad=0.3', facecolor=UP_COLOR, edgecolor='none', alpha=0.8),
+            color='white',
+            fontsize=9,
+            fontweight='bold',
+            clip_on=False
+        )
+        self.info_box = ax.text(
+            0.95, 0.98, '',
+            transform=ax.transAxes,
+            fontsize=8,
+            ha='right',
+            va='top',
+            bbox=dict(boxstyle='round,pad=0.3', facecolor=BACKGROUND, edgecolor=GRID_COLOR, alpha=0.9),
+            color='white'
+        )
+        self.title = ax.set_title('', color='white', fontsize=12, fontweight='bold')
+
+        self._legend_count = None
+
+    def _format_time(self, x: float, pos=None) -> str:
+        """Tick label of the bar at integer position ``x``."""
+        i = int(round(x))
+        if 0 <= i < len(self._times):
+            return self._times[i].strftime('%m/%d %H:%M')
+        return ''
+
+    def _set_legend(self, count: int) -> None:
+        """Show the first ``count`` EMA entries (rebuilt only when that changes)."""
+        if count == self._legend_count:
+            return
+        self._legend_count = count
+        legend = self.ax.get_legend()
+        if legend is not None:
+            legend.remove()
+        if count:
+            handles = [Patch(color=color, label=f'EMA{period}') for period, color in EMA_LINES[:count]]
+            self.ax.legend(
+                handles=handles,
+                loc='upper left',
+                frameon=True,
+                facecolor=BACKGROUND,
+                edgecolor=GRID_COLOR,
+                labelcolor='white',
+                fontsize=8,
+                framealpha=0.9
+            )
+
+    def render(
+        self,
+        df: pd.DataFrame,
+        title: str,
+        emas: Optional[List[np.ndarray]] = None,
+        info_lines: Optional[List[str]] = None
+    ) -> bytes:
+        """
+        Draw one chart and encode it as PNG.
+
+        Args:
+            df: OHLC DataFrame with datetime index (at least one row)
+            title: Chart title
+            emas: EMA arrays in ``EMA_LINES`` order (only the available ones)
+            info_lines: Lines of the indicator info box
+
+        Returns:
+            PNG image as bytes
+        """
+        o = df['open'].to_numpy(dtype=np.float64)
+        h = df['high'].to_numpy(dtype=np.float64)
+        l = df['low'].to_numpy(dtype=np.float64)
+        c = df['close'].to_numpy(dtype=np.float64)
+        n = len(c)
+        x = np.arange(n, dtype=np.float64)
+        up = c >= o
+
+        # Bodies: one rectangle per bar as an (n, 4, 2) vertex array
+        bottom = np.minimum(o, c)
+        top = np.maximum(o, c)
+        left = x - BODY_WIDTH / 2
+        right = x + BODY_WIDTH / 2
+        verts = np.empty((n, 4, 2))
+        verts[:, 0, 0] = left
+        verts[:, 1, 0] = left
+        verts[:, 2, 0] = right
+        verts[:, 3, 0] = right
+        verts[:, 0, 1] = bottom
+        verts[:, 1, 1] = top
+        verts[:, 2, 1] = top
+        verts[:, 3, 1] = bottom
+
+        segments = np.empty((n, 2, 2))
+        segments[:, 0, 0] = x
+        segments[:, 1, 0] = x
+        segments[:, 0, 1] = l
+        segments[:, 1, 1] = h
+
+        colors = np.where(up, UP_COLOR, DOWN_COLOR)
+        self.bodies.set_verts(verts)
+        self.bodies.set_facecolor(colors)
+        self.bodies.set_edgecolor(colors)
+        self.wicks.set_segments(segments)
+        self.wicks.set_color(colors)
+
+        emas = emas or []
+        for i, line in enumerate(self.ema_lines):
+            if i < len(emas):
+                line.set_data(x, emas[i])
+                line.set_visible(True)
+            else:
+                line.set_visible(False)
+        self._set_legend(len(emas))
+
+        current_price = c[-1]
+        self.price_line.set_ydata([current_price, current_price])
+        self.price_label.set_text(f'{current_price:.3f}')
+        self.price_label.set_y(current_price)
+        self.price_label.get_bbox_patch().set_facecolor(UP_COLOR if up[-1] else DOWN_COLOR)
+
+        self.info_box.set_text('\n'.join(info_lines or []))
+        self.info_box.set_visible(bool(info_lines))
+        self.title.set_text(title)
+
+        # Same padding as mplfinance: a few bars either side, 5% above and below
+        pad_x = n * 0.05 + 1.0
+        low, high = float(l.min()), float(h.max())
+        pad_y = (high - low) * 0.05 or abs(high) * 0.001 or 1.0
+        self.ax.set_xlim(-pad_x, n - 1 + pad_x)
+        self.ax.set_ylim(low - pad_y, high + pad_y)
+        self._times = df.index
+
+        self.canvas.draw()
+        # The background is opaque, so RGB encodes to a much smaller PNG than RGBA
+        image = Image.fromarray(np.asarray(self.canvas.buffer_rgba())[..., :3])
+        buf = io.BytesIO()
+        image.save(buf, format='png')
+        return buf.getvalue()
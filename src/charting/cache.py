@@ -0,0 +1,111 @@
+"""Content-addressed chart render cache (in-memory LRU backed by S3)."""
+
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from src.utils.config import config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ChartCache:
+    """
+    Map render-input hashes to PNG bytes.
+
+    Lookups try the in-process LRU first, then the shared S3 tier at
+    ``{prefix}/_cache/{hash}.png``. The S3 tier is filled by
+    ``S3Client.upload_chart`` (server-side copy of each uploaded chart) and
+    expired by the bucket lifecycle rule, so the cache never uploads PNGs
+    itself.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, s3_client=None, s3_enabled: Optional[bool] = None):
+        """
+        Initialize chart cache.
+
+        Args:
+            max_entries: Charts kept in memory (0 disables the local tier)
+            s3_client: S3Client for the shared tier (created on first use if omitted)
+            s3_enabled: Use the S3 tier (defaults to config.chart_cache_s3)
+        """
+        self.max_entries = config.chart_cache_size if max_entries is None else max_entries
+        self.s3_enabled = config.chart_cache_s3 if s3_enabled is None else s3_enabled
+        self._s3_client = s3_client
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = {"memory": 0, "s3": 0}
+        self.misses = 0
+
+    @property
+    def s3_client(self):
+        """S3 client of the shared tier, or None when it is unavailable."""
+        if self._s3_client is None and self.s3_enabled:
+            try:
+                from src.io.s3 import S3Client
+                self._s3_client = S3Client()
+            except Exception as e:
+                logger.warning(f"Chart cache S3 tier disabled: {e}")
+                self.s3_enabled = False
+        return self._s3_client if self.s3_enabled else None
+
+    def get(self, content_hash: str) -> Optional[bytes]:
+        """
+        Look up a rendered chart.
+
+        Args:
+            content_hash: Hash of the render inputs
+
+        Returns:
+            PNG bytes, or None on a miss
+        """
+        with self._lock:
+            chart_bytes = self._entries.get(content_hash)
+            if chart_bytes is not None:
+                self._entries.move_to_end(content_hash)
+                self.hits["memory"] += 1
+                return chart_bytes
+
+        s3_client = self.s3_client
+        if s3_client is not None:
+            chart_bytes = s3_client.get_cached_chart(content_hash)
+            if chart_bytes is not None:
+                self.hits["s3"] += 1
+                self.put(content_hash, chart_bytes)
+                return chart_bytes
+
+        self.misses += 1
+        return None
+
+    def put(self, content_hash: str, chart_bytes: bytes) -> None:
+        """Keep a rendered chart in the local tier, evicting the least recently used."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[content_hash] = chart_bytes
+            self._entries.move_to_end(content_hash)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop the local tier."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_chart_cache: Optional[ChartCache] = None
+_chart_cache_lock = threading.Lock()
+
+
+def get_chart_cache() -> ChartCache:
+    """Get the process-wide chart cache."""
+    global _chart_cache
+    with _chart_cache_lock:
+        if _chart_cache is None:
+            _chart_cache = ChartCache()
+        return _chart_cache
@@ -1,8 +1,14 @@
 """Chart generation using matplotlib with professional styling."""
 
 import io
+import json
+import hashlib
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 import matplotlib.patches as mpatches
@@ -13,23 +19,279 @@ import pytz
 
 from src.utils.config import config
 from src.utils.logger import get_logger
+from src.analysis.indicators import engine_for
+from src.charting.cache import ChartCache, get_chart_cache
 
 logger = get_logger(__name__)
 
+# Part of every render cache key: bump when the chart look changes
+CHART_STYLE_VERSION = 3
+CHART_SIZE = (12, 6, 100)  # inches and dpi
+RENDERERS = ("mplfinance", "agg")
+# Fixed margins of pooled figures: the right one holds the tick labels, the
+# current-price tag and the "Price" label, which sits past both (axes fraction)
+CHART_MARGINS = {"left": 0.03, "bottom": 0.08, "right": 0.86, "top": 0.92}
+PRICE_LABEL_X = 1.1
+
+# pyplot keeps global figure state, so renders from different threads are serialized
+_RENDER_LOCK = threading.RLock()
+
+_MPF_STYLE = None
+
+
+def _get_mpf_style():
+    """Build the dark mplfinance style once and reuse it."""
+    global _MPF_STYLE
+    if _MPF_STYLE is not None:
+        return _MPF_STYLE
+    
+    # Define custom market colors for dark theme
+    mc = mpf.make_marketcolors(
+        up='#00E5FF',  # Cyan for bullish
+        down='#FF5252',  # Red for bearish
+        edge='inherit',
+        wick={'up': '#00E5FF', 'down': '#FF5252'},
+        volume='inherit',
+        alpha=0.9
+    )
+    
+    # Create custom style with dark background
+    _MPF_STYLE = mpf.make_mpf_style(
+        marketcolors=mc,
+        gridstyle='--',
+        gridcolor='#333333',
+        gridaxis='both',
+        facecolor='#0a0e27',  # Dark navy background
+        edgecolor='white',
+        figcolor='#0a0e27',
+        rc={
+            'axes.labelcolor': 'white',
+            'axes.edgecolor': '#333333',
+            'xtick.color': 'white',
+            'ytick.color': 'white',
+            'grid.alpha': 0.2,
+            'font.size': 10,
+            'axes.titlesize': 12,
+            'axes.titleweight': 'bold',
+            'axes.titlecolor': 'white',
+            'axes.spines.left': False,  # Hide left spine
+            'axes.spines.right': True,  # Show right spine
+            'ytick.labelright': True,   # Labels on right
+            'ytick.labelleft': False,   # No labels on left
+            'ytick.right': True,         # Ticks on right
+            'ytick.left': False          # No ticks on left
+        }
+    )
+    return _MPF_STYLE
+
+
+# EMA legend entries, built once (legends copy their handles' look)
+EMA_LEGEND_HANDLES = [
+    (25, mpatches.Patch(color='white', label='EMA25')),
+    (100, mpatches.Patch(color='yellow', label='EMA100')),
+    (200, mpatches.Patch(color='#FF5252', label='EMA200')),
+]
+
+
+class FigurePool:
+    """
+    Reusable figures for mplfinance's external-axes mode.
+    
+    Figures are created once with the dark style and recycled: each chart
+    clears the axes and redraws into them instead of building and closing a
+    figure. The rcParams the style sets are captured when the first figure
+    is built and applied only around draws (``rc_context``), so the global
+    matplotlib state is never changed.
+    """
+    
+    def __init__(self, size: int = 2):
+        """
+        Initialize figure pool.
+        
+        Args:
+            size: Idle figures kept for reuse
+        """
+        self.size = size
+        self.style_rc: Optional[Dict] = None
+        self._free: List = []
+        self._lock = threading.Lock()
+    
+    def _create(self):
+        """Build a styled figure with one axes."""
+        with plt.rc_context():
+            before = dict(plt.rcParams)
+            # mpf.figure applies the style to rcParams; the context restores them
+            fig = mpf.figure(style=_get_mpf_style(), figsize=CHART_SIZE[:2])
+            ax = fig.add_subplot(1, 1, 1)
+            # Fixed margins (kept across clears) leave room for the right-side labels
+            fig.subplots_adjust(**CHART_MARGINS)
+            if self.style_rc is None:
+                self.style_rc = {k: v for k, v in plt.rcParams.items() if before.get(k) != v}
+        return fig, ax
+    
+    def prewarm(self) -> None:
+        """Build one figure ahead of the first chart."""
+        with self.figure():
+            pass
+    
+    @contextmanager
+    def figure(self):
+        """Borrow a cleared (fig, ax) pair with the style's rcParams in effect."""
+        with self._lock:
+            entry = self._free.pop() if self._free else None
+        if entry is None:
+            entry = self._create()
+        fig, ax = entry
+        try:
+            with plt.rc_context(self.style_rc):
+                ax.clear()
+                yield fig, ax
+        finally:
+            with self._lock:
+                if len(self._free) < self.size:
+                    self._free.append(entry)
+                    entry = None
+            if entry is not None:
+                plt.close(fig)
+
+
+_FIGURE_POOL = FigurePool()
+
+
+# Per-process state of chart render workers
+_worker_generators: Dict[Tuple[str, str], "ChartGenerator"] = {}
+_render_pool = None
+_render_pool_lock = threading.Lock()
+
+
+def _init_render_worker():
+    """Pre-warm a render worker: import the plotting stack and build a pooled figure."""
+    import matplotlib
+    matplotlib.use("Agg")
+    _FIGURE_POOL.prewarm()
+
+
+def _render_in_worker(
+    pair: str,
+    renderer: str,
+    df: pd.DataFrame,
+    timeframe: str,
+    indicators: Optional[Dict],
+    setup: Optional[str]
+) -> bytes:
+    """Render one chart inside a pool worker (with the parent's renderer) and return PNG bytes."""
+    generator = _worker_generators.get((pair, renderer))
+    if generator is None:
+        generator = _worker_generators[(pair, renderer)] = ChartGenerator(pair=pair, renderer=renderer)
+    # Cache lookups happen in the parent before a job is submitted
+    return generator.render_chart(df, timeframe, indicators, setup)
+
+
+def get_render_pool(workers: Optional[int] = None) -> Optional[ProcessPoolExecutor]:
+    """
+    Get the process-wide chart render pool, starting it on first use.
+    
+    Workers are spawned (not forked, since the runner may hold threads) and
+    pre-warmed so that the first charts don't pay matplotlib import time.
+    
+    Args:
+        workers: Pool size (defaults to config.chart_workers)
+        
+    Returns:
+        Process pool, or None when parallel rendering is disabled
+    """
+    global _render_pool
+    workers = config.chart_workers if workers is None else workers
+    
+    with _render_pool_lock:
+        if _render_pool is None:
+            if workers <= 0:
+                return None
+            _render_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_render_worker
+            )
+            # Start every worker now instead of on first demand
+            for future in [_render_pool.submit(_get_mpf_style) for _ in range(workers)]:
+                future.result()
+            logger.info("Started chart render pool", workers=workers)
+        return _render_pool
+
+
+def shutdown_render_pool():
+    """Stop the chart render pool if it is running."""
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is not None:
+            _render_pool.shutdown()
+            _render_pool = None
+
+
 class ChartGenerator:
     """Generate FX charts using matplotlib/mplfinance with professional styling."""
     
-    def __init__(self, pair: str = None):
-        """Initialize chart generator."""
+    def __init__(
+        self,
+        pair: str = None,
+        cache: Optional[ChartCache] = None,
+        renderer: Optional[str] = None
+    ):
+        """
+        Initialize chart generator.
+        
+        Args:
+            pair: Trading pair (defaults to config)
+            cache: Render cache (defaults to the process-wide cache)
+            renderer: "mplfinance" or "agg" (defaults to config.chart_renderer)
+        """
         self.pair = pair or config.pair
         self.jst = pytz.timezone("Asia/Tokyo")
-        
-        # Set dark theme
-        plt.style.use('dark_background')
+        self.cache = cache if cache is not None else get_chart_cache()
+        self.renderer = renderer or config.chart_renderer
+        if self.renderer not in RENDERERS:
+            raise ValueError(f"Unknown chart renderer: {self.renderer}")
+        self._agg_renderer = None
+        self.chart_hashes: Dict[str, str] = {}
+        self.cached_timeframes: List[str] = []
         
     def calculate_ema(self, df: pd.DataFrame, period: int) -> pd.Series:
-        """Calculate Exponential Moving Average."""
+        """Calculate Exponential Moving Average (shared with the analyzer's engine)."""
+        engine = engine_for(df)
+        if period in engine.ema_periods:
+            return pd.Series(engine.ema(period), index=df.index)
         return df['close'].ewm(span=period, adjust=False).mean()
+    
+    def content_hash(
+        self,
+        df: pd.DataFrame,
+        timeframe: str,
+        indicators: Optional[Dict] = None
+    ) -> str:
+        """
+        Hash everything that determines a chart's pixels.
+        
+        Covers the bars (timestamps, timezone and OHLC), the title, the
+        indicator annotations, the size and the style version.
+        
+        Returns:
+            Hex SHA-256 digest
+        """
+        columns = [col for col in ('open', 'high', 'low', 'close') if col in df.columns]
+        header = {
+            "style": CHART_STYLE_VERSION,
+            "renderer": self.renderer,
+            "size": CHART_SIZE,
+            "title": f"{self.pair} - {timeframe}",
+            "annotations": self._indicator_lines(indicators) if indicators else [],
+            "columns": columns,
+            "tz": str(getattr(df.index, "tz", None)),
+        }
+        digest = hashlib.sha256(json.dumps(header, sort_keys=True).encode())
+        if len(df):
+            digest.update(np.ascontiguousarray(pd.DatetimeIndex(df.index).asi8).tobytes())
+            digest.update(np.ascontiguousarray(df[columns].to_numpy(dtype=np.float64)).tobytes())
+        return digest.hexdigest()
         
     def generate_chart(
         self,
@@ -50,135 +312,116 @@ class ChartGenerator:
         Returns:
             PNG image as bytes
         """
+        content_hash = self.content_hash(df, timeframe, indicators)
+        chart_bytes = self.cache.get(content_hash)
+        if chart_bytes is not None:
+            logger.info(f"Using cached {timeframe} chart", content_hash=content_hash)
+            return chart_bytes
+        
+        chart_bytes = self.render_chart(df, timeframe, indicators, setup)
+        self.cache.put(content_hash, chart_bytes)
+        return chart_bytes
+    
+    def render_chart(
+        self,
+        df: pd.DataFrame,
+        timeframe: str,
+        indicators: Optional[Dict] = None,
+        setup: Optional[str] = None
+    ) -> bytes:
+        """Render a chart, bypassing the cache."""
+        with _RENDER_LOCK:
+            return self._render_chart(df, timeframe, indicators, setup)
+    
+    def _render_chart(
+        self,
+        df: pd.DataFrame,
+        timeframe: str,
+        indicators: Optional[Dict] = None,
+        setup: Optional[str] = None
+    ) -> bytes:
+        """Render a chart with the configured renderer (caller holds the render lock)."""
         if df.empty:
             logger.warning(f"Empty dataframe for {timeframe} chart")
             return self._generate_empty_chart(timeframe)
         
-        # Prepare data
-        df_plot = df.copy()
-        
         # Ensure we have required columns (volume is optional for FX)
         required_cols = ['open', 'high', 'low', 'close']
-        missing_cols = [col for col in required_cols if col not in df_plot.columns]
+        missing_cols = [col for col in required_cols if col not in df.columns]
         if missing_cols:
-            logger.error(f"Missing required columns: {missing_cols}. Available columns: {df_plot.columns.tolist()}")
+            logger.error(f"Missing required columns: {missing_cols}. Available columns: {df.columns.tolist()}")
             return self._generate_empty_chart(timeframe)
         
+        if self.renderer == "agg":
+            return self._render_agg_chart(df, timeframe, indicators)
+        
+        # Prepare data
+        df_plot = df.copy()
+        
         # Add dummy volume if not present (required by mplfinance)
         if 'volume' not in df_plot.columns:
             df_plot['volume'] = 1000
         
-        # Calculate EMAs
-        df_plot['ema25'] = self.calculate_ema(df_plot, 25)
-        df_plot['ema100'] = self.calculate_ema(df_plot, 100)
-        df_plot['ema200'] = self.calculate_ema(df_plot, 200)
+        # EMAs come from the indicator engine of the original frame
+        df_plot['ema25'] = self.calculate_ema(df, 25)
+        df_plot['ema100'] = self.calculate_ema(df, 100)
+        df_plot['ema200'] = self.calculate_ema(df, 200)
         
-        # Create additional plots for EMAs
-        additional_plots = []
+        current_price = df_plot['close'].iloc[-1]
         
-        # EMA25 - White
-        if len(df_plot) >= 25:
-            additional_plots.append(mpf.make_addplot(
-                df_plot['ema25'],
-                color='white',
-                width=1.5,
-                alpha=0.9
-            ))
-        
-        # EMA100 - Yellow
-        if len(df_plot) >= 100:
-            additional_plots.append(mpf.make_addplot(
-                df_plot['ema100'],
-                color='yellow',
-                width=1.5,
-                alpha=0.9
-            ))
-        
-        # EMA200 - Red
-        if len(df_plot) >= 200:
-            additional_plots.append(mpf.make_addplot(
-                df_plot['ema200'],
-                color='#FF5252',
-                width=1.5,
-                alpha=0.9
-            ))
+        # Create title with timeframe
+        title = f"{self.pair} - {timeframe}"
+        
+        # Draw into a pooled, pre-styled figure (mplfinance external-axes mode)
+        with _FIGURE_POOL.figure() as (fig, ax_price):
+            chart_bytes = self._draw_mpf_chart(fig, ax_price, df_plot, title, current_price, indicators)
+        
+        logger.info(f"Generated {timeframe} chart, size: {len(chart_bytes)} bytes")
+        
+        return chart_bytes
+    
+    def _draw_mpf_chart(self, fig, ax_price, df_plot, title, current_price, indicators) -> bytes:
+        """Draw candles, EMAs and annotations on a cleared pooled axes and encode PNG."""
+        # Create additional plots for EMAs (25 white, 100 yellow, 200 red)
+        additional_plots = []
+        for period, color in ((25, 'white'), (100, 'yellow'), (200, '#FF5252')):
+            if len(df_plot) >= period:
+                additional_plots.append(mpf.make_addplot(
+                    df_plot[f'ema{period}'],
+                    ax=ax_price,
+                    color=color,
+                    width=1.5,
+                    alpha=0.9
+                ))
         
         # Add current price line
-        current_price = df_plot['close'].iloc[-1]
         current_price_line = [current_price] * len(df_plot)
         additional_plots.append(mpf.make_addplot(
             pd.Series(current_price_line, index=df_plot.index),
+            ax=ax_price,
             color='white',
             linestyle='--',
             width=1,
             alpha=0.5
         ))
         
-        # Create title with timeframe
-        title = f"{self.pair} - {timeframe}"
-        
-        # Define custom market colors for dark theme
-        mc = mpf.make_marketcolors(
-            up='#00E5FF',  # Cyan for bullish
-            down='#FF5252',  # Red for bearish
-            edge='inherit',
-            wick={'up': '#00E5FF', 'down': '#FF5252'},
-            volume='inherit',
-            alpha=0.9
-        )
-        
-        # Create custom style with dark background
-        s = mpf.make_mpf_style(
-            marketcolors=mc,
-            gridstyle='--',
-            gridcolor='#333333',
-            gridaxis='both',
-            facecolor='#0a0e27',  # Dark navy background
-            edgecolor='white',
-            figcolor='#0a0e27',
-            rc={
-                'axes.labelcolor': 'white',
-                'axes.edgecolor': '#333333',
-                'xtick.color': 'white',
-                'ytick.color': 'white',
-                'grid.alpha': 0.2,
-                'font.size': 10,
-                'axes.titlesize': 12,
-                'axes.titleweight': 'bold',
-                'axes.titlecolor': 'white',
-                'axes.spines.left': False,  # Hide left spine
-                'axes.spines.right': True,  # Show right spine
-                'ytick.labelright': True,   # Labels on right
-                'ytick.labelleft': False,   # No labels on left
-                'ytick.right': True,         # Ticks on right
-                'ytick.left': False          # No ticks on left
-            }
-        )
-        
-        # Create figure with NO VOLUME
-        fig, axes = mpf.plot(
+        # NO VOLUME; the style comes from the pooled axes
+        mpf.plot(
             df_plot,
+            ax=ax_price,
             type='candle',
-            style=s,
-            title=title,
             ylabel='',  # Remove ylabel since it will be on the right
-            volume=False,  # DISABLE VOLUME
-            addplot=additional_plots if additional_plots else None,
-            figsize=(12, 6),
-            returnfig=True,
+            addplot=additional_plots,
             datetime_format='%m/%d %H:%M',
-            xrotation=0,
-            tight_layout=True,
-            scale_padding={'left': 0.05, 'right': 0.15, 'top': 0.1, 'bottom': 0.05}
+            xrotation=0
         )
-        
-        # Get the main price axis
-        ax_price = axes[0]
+        ax_price.set_title(title)
         
         # Move y-axis to right side
         ax_price.yaxis.tick_right()
         ax_price.yaxis.set_label_position('right')
-        ax_price.set_ylabel('Price', rotation=270, labelpad=20, color='white')
+        ax_price.set_ylabel('Price', rotation=270, color='white')
+        ax_price.yaxis.set_label_coords(PRICE_LABEL_X, 0.5)
         
         # Hide left spine, show right spine
         ax_price.spines['left'].set_visible(False)
@@ -203,23 +446,41 @@ class ChartGenerator:
         ax_price.tick_params(axis='y', colors='white', labelright=True, labelleft=False)
         ax_price.tick_params(axis='x', colors='white')
         
-        # Convert to bytes
+        # Convert to bytes (pooled figures have fixed margins, so no tight-bbox pass)
         buf = io.BytesIO()
         fig.savefig(
             buf, 
             format='png', 
-            dpi=100, 
-            bbox_inches='tight',
+            dpi=CHART_SIZE[2], 
             facecolor='#0a0e27',
             edgecolor='none'
         )
-        buf.seek(0)
-        chart_bytes = buf.read()
-        
-        # Close figure to free memory
-        plt.close(fig)
+        return buf.getvalue()
+    
+    def _render_agg_chart(
+        self,
+        df: pd.DataFrame,
+        timeframe: str,
+        indicators: Optional[Dict] = None
+    ) -> bytes:
+        """Render a chart with the reused Agg canvas (caller holds the render lock)."""
+        if self._agg_renderer is None:
+            from src.charting.agg import AggCandleRenderer
+            self._agg_renderer = AggCandleRenderer(figsize=CHART_SIZE[:2], dpi=CHART_SIZE[2])
+        
+        emas = [
+            self.calculate_ema(df, period).to_numpy()
+            for period in (25, 100, 200)
+            if len(df) >= period
+        ]
+        chart_bytes = self._agg_renderer.render(
+            df,
+            f"{self.pair} - {timeframe}",
+            emas=emas,
+            info_lines=self._indicator_lines(indicators) if indicators else None
+        )
         
-        logger.info(f"Generated {timeframe} chart, size: {len(chart_bytes)} bytes")
+        logger.info(f"Generated {timeframe} chart, size: {len(chart_bytes)} bytes", renderer="agg")
         
         return chart_bytes
     
@@ -251,14 +512,7 @@ class ChartGenerator:
     
     def _add_ema_legend(self, ax, df):
         """Add EMA legend to the chart."""
-        legend_elements = []
-        
-        if len(df) >= 25:
-            legend_elements.append(mpatches.Patch(color='white', label='EMA25'))
-        if len(df) >= 100:
-            legend_elements.append(mpatches.Patch(color='yellow', label='EMA100'))
-        if len(df) >= 200:
-            legend_elements.append(mpatches.Patch(color='#FF5252', label='EMA200'))
+        legend_elements = [patch for period, patch in EMA_LEGEND_HANDLES if len(df) >= period]
         
         if legend_elements:
             ax.legend(
@@ -274,22 +528,7 @@ class ChartGenerator:
     
     def _add_indicator_annotations(self, ax, df, indicators):
         """Add indicator information to the chart."""
-        info_text = []
-        
-        if 'ema25_slope_deg' in indicators:
-            slope = indicators['ema25_slope_deg']
-            info_text.append(f"EMA25 Slope: {slope:.1f}°")
-        
-        if 'atr20' in indicators:
-            info_text.append(f"ATR20: {indicators['atr20']:.1f}p")
-        
-        if 'spread' in indicators:
-            info_text.append(f"Spread: {indicators['spread']:.1f}p")
-        
-        if 'build_up' in indicators:
-            bu = indicators['build_up']
-            if bu.get('width_pips', 0) > 0:
-                info_text.append(f"Build-up: {bu['width_pips']:.1f}p × {bu['bars']} bars")
+        info_text = self._indicator_lines(indicators)
         
         # Place info box in top right (but not overlapping with price axis)
         if info_text:
@@ -310,9 +549,39 @@ class ChartGenerator:
                 color='white'
             )
     
+    def _indicator_lines(self, indicators: Dict) -> List[str]:
+        """Indicator info box lines."""
+        info_text = []
+        
+        if 'ema25_slope_deg' in indicators:
+            slope = indicators['ema25_slope_deg']
+            info_text.append(f"EMA25 Slope: {slope:.1f}°")
+        
+        if 'atr20' in indicators:
+            info_text.append(f"ATR20: {indicators['atr20']:.1f}p")
+        
+        if 'spread' in indicators:
+            info_text.append(f"Spread: {indicators['spread']:.1f}p")
+        
+        if 'build_up' in indicators:
+            bu = indicators['build_up']
+            if bu.get('width_pips', 0) > 0:
+                info_text.append(f"Build-up: {bu['width_pips']:.1f}p × {bu['bars']} bars")
+        
+        return info_text
+    
     def _generate_empty_chart(self, timeframe: str) -> bytes:
         """Generate an empty chart with message."""
-        fig, ax = plt.subplots(figsize=(12, 6), facecolor='#0a0e27')
+        with _RENDER_LOCK:
+            return self._render_empty_chart(timeframe)
+    
+    def _render_empty_chart(self, timeframe: str) -> bytes:
+        """Render the empty chart (caller holds the render lock)."""
+        with _FIGURE_POOL.figure() as (fig, ax):
+            return self._draw_empty_chart(fig, ax, timeframe)
+    
+    def _draw_empty_chart(self, fig, ax, timeframe: str) -> bytes:
+        """Draw the no-data message on a cleared pooled axes and encode PNG."""
         ax.set_facecolor('#0a0e27')
         
         ax.text(
@@ -336,35 +605,35 @@ class ChartGenerator:
         fig.savefig(
             buf, 
             format='png', 
-            dpi=100, 
-            bbox_inches='tight',
+            dpi=CHART_SIZE[2], 
             facecolor='#0a0e27',
             edgecolor='none'
         )
-        buf.seek(0)
-        chart_bytes = buf.read()
-        
-        plt.close(fig)
-        
-        return chart_bytes
+        return buf.getvalue()
     
     def generate_multi_timeframe_charts(
         self,
         data: Dict[str, pd.DataFrame],
-        analysis: Optional[Dict] = None
+        analysis: Optional[Dict] = None,
+        parallel: Optional[bool] = None
     ) -> Dict[str, bytes]:
         """
         Generate charts for multiple timeframes.
         
+        Charts found in the render cache are reused; only the rest are
+        rendered. Their content hashes are left in ``chart_hashes`` (charts
+        that failed to render are not included) and the timeframes served
+        from the cache in ``cached_timeframes``.
+        
         Args:
             data: Dict mapping timeframe to DataFrame
             analysis: Optional analysis results
+            parallel: Render in the process pool (defaults to config.chart_workers > 0)
             
         Returns:
             Dict mapping timeframe to PNG bytes
         """
-        charts = {}
-        
+        jobs = {}
         for timeframe, df in data.items():
             indicators = None
             setup = None
@@ -375,12 +644,49 @@ class ChartGenerator:
                     indicators = tf_analysis.get("indicators")
                     setup = tf_analysis.get("setup")
             
+            jobs[timeframe] = (df, indicators, setup)
+        
+        hashes = {}
+        charts = {}
+        for timeframe, (df, indicators, setup) in jobs.items():
+            hashes[timeframe] = self.content_hash(df, timeframe, indicators)
+            cached = self.cache.get(hashes[timeframe])
+            if cached is not None:
+                charts[timeframe] = cached
+                logger.info(f"Using cached {timeframe} chart", content_hash=hashes[timeframe])
+        
+        self.cached_timeframes = list(charts)
+        pending = {tf: job for tf, job in jobs.items() if tf not in charts}
+        
+        pool = None
+        if pending and (parallel is None or parallel):
             try:
-                chart_bytes = self.generate_chart(df, timeframe, indicators, setup)
+                pool = get_render_pool()
+            except Exception as e:
+                logger.warning(f"Chart render pool unavailable, rendering serially: {e}")
+        
+        futures = {}
+        if pool is not None:
+            for timeframe, (df, indicators, setup) in pending.items():
+                futures[timeframe] = pool.submit(
+                    _render_in_worker, self.pair, self.renderer, df, timeframe, indicators, setup
+                )
+        
+        for timeframe, (df, indicators, setup) in pending.items():
+            try:
+                if timeframe in futures:
+                    chart_bytes = futures[timeframe].result()
+                else:
+                    chart_bytes = self.render_chart(df, timeframe, indicators, setup)
+                self.cache.put(hashes[timeframe], chart_bytes)
                 charts[timeframe] = chart_bytes
                 logger.info(f"Generated chart for {timeframe}")
             except Exception as e:
                 logger.error(f"Failed to generate chart for {timeframe}", error=str(e))
                 charts[timeframe] = self._generate_empty_chart(timeframe)
+                del hashes[timeframe]
+        
+        self.chart_hashes = hashes
         
-        return charts
\ No newline at end of file
+        # Keep the timeframe order of the input
+        return {timeframe: charts[timeframe] for timeframe in jobs}
@@ -0,0 +1,256 @@
+"""Append-only local OHLCV bar store with optional S3 sync."""
+
+from pathlib import Path
+from typing import List, Optional, Set, Tuple
+import pandas as pd
+
+from src.utils.config import config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class BarStore:
+    """
+    Persistent per-symbol/per-interval bar store backed by Parquet segments.
+
+    Every append writes a new immutable segment named after the time range it
+    covers (``{last_epoch}-{first_epoch}.parquet``), so segments sort in fetch
+    order and later segments win when the same bar appears twice (e.g. the
+    still-forming candle of the previous run). Segments are merged once there
+    are more than ``COMPACT_THRESHOLD`` of them.
+    """
+
+    COMPACT_THRESHOLD = 32
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        s3_sync: Optional[bool] = None,
+        bucket: Optional[str] = None
+    ):
+        """Initialize bar store."""
+        self.root = Path(root or config.bar_store_dir)
+        self.s3_sync = config.bar_store_s3_sync if s3_sync is None else s3_sync
+        self.bucket = bucket or config.s3_bucket
+        self.s3 = None
+        self._synced = set()
+
+        if self.s3_sync:
+            if not self.bucket:
+                logger.warning("Bar store S3 sync requested but S3_BUCKET is not set")
+                self.s3_sync = False
+            else:
+                import boto3
+                self.s3 = boto3.client('s3', region_name=config.aws_region)
+
+    def _series_dir(self, symbol: str, interval: str) -> Path:
+        """Local directory holding the segments of one series."""
+        return self.root / symbol.replace("/", "") / interval
+
+    def _s3_prefix(self, symbol: str, interval: str) -> str:
+        """S3 prefix holding the segments of one series."""
+        return f"{config.bar_store_s3_prefix}/{symbol.replace('/', '')}/{interval}/"
+
+    def _segments(self, symbol: str, interval: str) -> List[Path]:
+        """List local segments in write order."""
+        self._sync_from_s3(symbol, interval)
+        series_dir = self._series_dir(symbol, interval)
+        if not series_dir.exists():
+            return []
+        return sorted(series_dir.glob("*.parquet"))
+
+    def read(self, symbol: str, interval: str, tail: Optional[int] = None) -> pd.DataFrame:
+        """
+        Read stored bars for a series.
+
+        Args:
+            symbol: Trading symbol (e.g., "USD/JPY")
+            interval: TwelveData interval (e.g., "5min", "1h")
+            tail: Only return the most recent N bars
+
+        Returns:
+            DataFrame with OHLCV data indexed by timestamp (ascending)
+        """
+        segments = self._segments(symbol, interval)
+        if not segments:
+            return pd.DataFrame()
+
+        df = pd.concat([pd.read_parquet(path) for path in segments])
+        df = df[~df.index.duplicated(keep="last")].sort_index()
+
+        if tail is not None:
+            df = df.iloc[-tail:]
+
+        return df
+
+    def last_timestamp(self, symbol: str, interval: str) -> Optional[pd.Timestamp]:
+        """Return the timestamp of the newest stored bar, if any."""
+        segments = self._segments(symbol, interval)
+        if not segments:
+            return None
+
+        # Segment names sort by their last bar, so the newest bar is in the last one
+        last = pd.read_parquet(segments[-1])
+        return last.index.max() if not last.empty else None
+
+    def append(self, symbol: str, interval: str, df: pd.DataFrame) -> int:
+        """
+        Append freshly fetched bars as a new segment.
+
+        Args:
+            symbol: Trading symbol
+            interval: TwelveData interval
+            df: Bars to append (overlapping bars replace stored ones on read)
+
+        Returns:
+            Number of bars written
+        """
+        if df.empty:
+            return 0
+
+        series_dir = self._series_dir(symbol, interval)
+        series_dir.mkdir(parents=True, exist_ok=True)
+
+        df = df[~df.index.duplicated(keep="last")].sort_index()
+        path = series_dir / self._segment_name(df)
+        df.to_parquet(path)
+
+        if self.s3_sync:
+            self._upload_segment(symbol, interval, path)
+
+        logger.info(
+            "Appended bars to store",
+            symbol=symbol,
+            interval=interval,
+            rows=len(df),
+            segment=path.name
+        )
+
+        if len(list(series_dir.glob("*.parquet"))) > self.COMPACT_THRESHOLD:
+            self.compact(symbol, interval)
+
+        return len(df)
+
+    def compact(self, symbol: str, interval: str) -> None:
+        """Merge all segments of a series into a single segment."""
+        segments = self._segments(symbol, interval)
+        if len(segments) <= 1:
+            return
+
+        df = self.read(symbol, interval)
+        path = self._series_dir(symbol, interval) / self._segment_name(df)
+        df.to_parquet(path)
+
+        if self.s3_sync:
+            self._upload_segment(symbol, interval, path)
+
+        for segment in segments:
+            if segment == path:
+                continue
+            segment.unlink()
+            if self.s3_sync:
+                try:
+                    self.s3.delete_object(
+                        Bucket=self.bucket,
+                        Key=self._s3_prefix(symbol, interval) + segment.name
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to delete compacted segment from S3: {e}")
+
+        logger.info("Compacted bar store", symbol=symbol, interval=interval, rows=len(df))
+
+    def _segment_name(self, df: pd.DataFrame) -> str:
+        """Name a segment after the epoch seconds of its last and first bars."""
+        first = int(df.index[0].timestamp())
+        last = int(df.index[-1].timestamp())
+        return f"{last:012d}-{first:012d}.parquet"
+
+    @staticmethod
+    def _segment_range(name: str) -> Optional[Tuple[int, int]]:
+        """Epoch seconds of a segment's first and last bars, parsed from its name."""
+        try:
+            last, first = name[:-len(".parquet")].split("-")
+            return int(first), int(last)
+        except ValueError:
+            return None
+
+    def _is_superseded(self, name: str, remote: Set[str]) -> bool:
+        """
+        Whether a remote segment makes a local one redundant.
+
+        That is the case when a remote segment covers the local segment's bar
+        range and sorts after it, so its bars win on read anyway (as with a
+        segment another task compacted away).
+        """
+        bounds = self._segment_range(name)
+        if bounds is None:
+            return False
+        for other in remote:
+            other_bounds = self._segment_range(other)
+            if (
+                other_bounds is not None
+                and other > name
+                and other_bounds[0] <= bounds[0]
+                and other_bounds[1] >= bounds[1]
+            ):
+                return True
+        return False
+
+    def _sync_from_s3(self, symbol: str, interval: str) -> None:
+        """Download segments missing locally (once per series per process)."""
+        if not self.s3_sync or (symbol, interval) in self._synced:
+            return
+        self._synced.add((symbol, interval))
+
+        series_dir = self._series_dir(symbol, interval)
+        prefix = self._s3_prefix(symbol, interval)
+
+        try:
+            paginator = self.s3.get_paginator('list_objects_v2')
+            remote = set()
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+                for obj in page.get("Contents", []):
+                    remote.add(obj["Key"][len(prefix):])
+
+            missing = [name for name in remote if not (series_dir / name).exists()]
+            if missing:
+                series_dir.mkdir(parents=True, exist_ok=True)
+            for name in missing:
+                self.s3.download_file(self.bucket, prefix + name, str(series_dir / name))
+
+            # Local segments missing remotely were either compacted away by
+            # another task (drop them) or never uploaded (upload them now)
+            dropped = uploaded = 0
+            if series_dir.exists():
+                for path in sorted(series_dir.glob("*.parquet")):
+                    if path.name in remote:
+                        continue
+                    if self._is_superseded(path.name, remote):
+                        path.unlink()
+                        dropped += 1
+                    else:
+                        self._upload_segment(symbol, interval, path)
+                        uploaded += 1
+
+            logger.info(
+                "Synced bar store from S3",
+                symbol=symbol,
+                interval=interval,
+                downloaded=len(missing),
+                dropped=dropped,
+                uploaded=uploaded
+            )
+        except Exception as e:
+            logger.warning(f"Bar store S3 sync failed, using local segments only: {e}")
+
+    def _upload_segment(self, symbol: str, interval: str, path: Path) -> None:
+        """Upload one segment to S3."""
+        try:
+            self.s3.upload_file(
+                str(path),
+                self.bucket,
+                self._s3_prefix(symbol, interval) + path.name
+            )
+        except Exception as e:
+            logger.warning(f"Failed to upload bar store segment to S3: {e}")
@@ -0,0 +1,255 @@
+"""Closed-bar feeds for the streaming runner (live websocket and replay)."""
+
+import json
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+import pandas as pd
+import pytz
+
+from src.utils.config import config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+TIMEFRAME_DELTAS = {
+    "1m": pd.Timedelta(minutes=1),
+    "5m": pd.Timedelta(minutes=5),
+    "15m": pd.Timedelta(minutes=15),
+    "30m": pd.Timedelta(minutes=30),
+    "1h": pd.Timedelta(hours=1),
+    "4h": pd.Timedelta(hours=4),
+    "1d": pd.Timedelta(days=1),
+}
+
+
+@dataclass
+class Bar:
+    """One closed OHLC bar (``timestamp`` is the bar open time)."""
+
+    timeframe: str
+    timestamp: pd.Timestamp
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float = 0.0
+
+    @property
+    def close_time(self) -> pd.Timestamp:
+        return self.timestamp + TIMEFRAME_DELTAS[self.timeframe]
+
+
+class BarFeed:
+    """
+    Source of closed bars.
+
+    Iterating yields bars in close-time order; when several timeframes close
+    at the same instant the longest one comes first, so the higher-timeframe
+    context is current when the primary bar is evaluated.
+    """
+
+    def __iter__(self) -> Iterator[Bar]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release any underlying connection."""
+
+
+class BarAggregator:
+    """Build closed bars for several timeframes from a stream of prices."""
+
+    def __init__(self, timeframes: List[str], tz: str = "Asia/Tokyo"):
+        """
+        Initialize aggregator.
+
+        Args:
+            timeframes: Timeframes to build (e.g., ["5m", "1h"])
+            tz: Timezone for bar timestamps
+        """
+        # Longest first, so same-instant closes come out in feed order
+        self.timeframes = sorted(timeframes, key=lambda tf: TIMEFRAME_DELTAS[tf], reverse=True)
+        self.tz = pytz.timezone(tz)
+        self._open: Dict[str, Bar] = {}
+
+    def add(self, timestamp: pd.Timestamp, price: float, volume: float = 0.0) -> List[Bar]:
+        """
+        Add one price observation.
+
+        Returns:
+            Bars closed by this observation
+        """
+        closed = self.flush(timestamp)
+        for tf in self.timeframes:
+            bar = self._open.get(tf)
+            if bar is None:
+                start = timestamp.floor(TIMEFRAME_DELTAS[tf]) if tf != "1d" else timestamp.normalize()
+                self._open[tf] = Bar(tf, start, price, price, price, price, volume)
+            else:
+                bar.high = max(bar.high, price)
+                bar.low = min(bar.low, price)
+                bar.close = price
+                bar.volume += volume
+        return closed
+
+    def flush(self, now: pd.Timestamp) -> List[Bar]:
+        """Close every open bar whose period ended at or before ``now``."""
+        closed = []
+        for tf in self.timeframes:
+            bar = self._open.get(tf)
+            if bar is not None and bar.close_time <= now:
+                closed.append(self._open.pop(tf))
+        return closed
+
+
+class ReplayFeed(BarFeed):
+    """Replay stored bars as if they were closing live (for tests and dry runs)."""
+
+    def __init__(self, frames: Dict[str, pd.DataFrame], speed: float = 0.0):
+        """
+        Initialize replay feed.
+
+        Args:
+            frames: Dict mapping timeframe to OHLC DataFrame
+            speed: Replay speed relative to real time (0 = as fast as possible)
+        """
+        self.frames = frames
+        self.speed = speed
+
+    @classmethod
+    def from_store(
+        cls,
+        symbol: str,
+        timeframes: Optional[List[str]] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        speed: float = 0.0
+    ) -> "ReplayFeed":
+        """Replay bars kept in the local bar store."""
+        from src.data_fetcher.bar_store import BarStore
+
+        store = BarStore()
+        frames = {}
+        for tf in timeframes or config.timeframes:
+            interval = tf.replace("m", "min") if "m" in tf else tf
+            frames[tf] = store.read(symbol, interval).loc[start:end]
+        return cls(frames, speed=speed)
+
+    @classmethod
+    def from_files(cls, paths: Dict[str, str], speed: float = 0.0) -> "ReplayFeed":
+        """Replay bars from CSV or Parquet files (datetime index in the first column)."""
+        frames = {}
+        for tf, path in paths.items():
+            if path.endswith(".parquet"):
+                df = pd.read_parquet(path)
+            else:
+                df = pd.read_csv(path, index_col=0, parse_dates=True)
+            if df.index.tz is None:
+                df.index = df.index.tz_localize("Asia/Tokyo")
+            frames[tf] = df.sort_index()
+        return cls(frames, speed=speed)
+
+    def __iter__(self) -> Iterator[Bar]:
+        events = []
+        for tf, df in self.frames.items():
+            delta = TIMEFRAME_DELTAS[tf]
+            for ts, o, h, l, c, v in zip(
+                df.index, df["open"], df["high"], df["low"], df["close"],
+                df["volume"] if "volume" in df.columns else [0.0] * len(df)
+            ):
+                events.append((ts + delta, -delta, Bar(tf, ts, float(o), float(h), float(l), float(c), float(v or 0))))
+        events.sort(key=lambda e: (e[0], e[1]))
+
+        previous = None
+        for close_time, _, bar in events:
+            if self.speed and previous is not None:
+                time.sleep(max(0.0, (close_time - previous).total_seconds() / self.speed))
+            previous = close_time
+            yield bar
+
+
+class TwelveDataWebSocketFeed(BarFeed):
+    """
+    Live bars built from TwelveData websocket price events.
+
+    Bars close on the first price of the next period or, when the market is
+    quiet, on a one-second timer, so a bar is emitted within about a second
+    of its close.
+    """
+
+    URL = "wss://ws.twelvedata.com/v1/quotes/price"
+    HEARTBEAT_SECONDS = 10
+    RECONNECT_DELAY = 5
+
+    def __init__(
+        self,
+        symbol: Optional[str] = None,
+        timeframes: Optional[List[str]] = None,
+        api_key: Optional[str] = None
+    ):
+        """
+        Initialize websocket feed.
+
+        Args:
+            symbol: Trading symbol (e.g., "USD/JPY")
+            timeframes: Timeframes to build
+            api_key: TwelveData API key
+        """
+        try:
+            import websocket  # websocket-client
+        except ImportError as e:
+            raise ImportError("websocket-client is required for the live feed") from e
+
+        self._websocket = websocket
+        self.symbol = symbol or config.symbol
+        self.api_key = api_key or config.twelvedata_api_key
+        self.aggregator = BarAggregator(timeframes or config.timeframes)
+        self.tz = pytz.timezone("Asia/Tokyo")
+        self._ws = None
+        self._closed = False
+
+    def _connect(self) -> None:
+        """Open the socket and subscribe to the symbol."""
+        self._ws = self._websocket.create_connection(f"{self.URL}?apikey={self.api_key}", timeout=1)
+        self._ws.send(json.dumps({"action": "subscribe", "params": {"symbols": self.symbol}}))
+        logger.info("Connected to TwelveData websocket", symbol=self.symbol)
+
+    def __iter__(self) -> Iterator[Bar]:
+        last_heartbeat = time.monotonic()
+        while not self._closed:
+            if self._ws is None:
+                try:
+                    self._connect()
+                except Exception as e:
+                    logger.error(f"Websocket connection failed: {e}")
+                    time.sleep(self.RECONNECT_DELAY)
+                    continue
+
+            try:
+                message = self._ws.recv()
+            except self._websocket.WebSocketTimeoutException:
+                message = None
+            except Exception as e:
+                logger.error(f"Websocket receive failed: {e}")
+                self._ws = None
+                continue
+
+            if message:
+                event = json.loads(message)
+                if event.get("event") == "price":
+                    ts = pd.Timestamp(event["timestamp"], unit="s", tz="UTC").tz_convert(self.tz)
+                    yield from self.aggregator.add(ts, float(event["price"]))
+
+            yield from self.aggregator.flush(pd.Timestamp.now(tz=self.tz))
+
+            if time.monotonic() - last_heartbeat >= self.HEARTBEAT_SECONDS:
+                try:
+                    self._ws.send(json.dumps({"action": "heartbeat"}))
+                except Exception:
+                    self._ws = None
+                last_heartbeat = time.monotonic()
+
+    def close(self) -> None:
+        self._closed = True
+        if self._ws is not None:
+            self._ws.close()
@@ -1,25 +1,42 @@
 """TwelveData API client for fetching FX data."""
 
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import pandas as pd
 import pytz
 import requests
+from requests.adapters import HTTPAdapter
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from src.utils.config import config
+from src.data_fetcher.bar_store import BarStore
 from src.utils.logger import get_logger
+from src.utils.metrics import in_context, increment
+from src.utils.rate_limit import TokenBucket
 
 logger = get_logger(__name__)
 
+_shared_rate_limiter = None
+_shared_rate_limiter_lock = threading.Lock()
+
+
+def get_shared_rate_limiter() -> TokenBucket:
+    """Get the process-wide token bucket sized to the TwelveData credit budget."""
+    global _shared_rate_limiter
+    with _shared_rate_limiter_lock:
+        if _shared_rate_limiter is None:
+            _shared_rate_limiter = TokenBucket(rate=config.twelvedata_credits_per_minute, period=60.0)
+        return _shared_rate_limiter
+
+
 class TwelveDataClient:
     """Client for TwelveData API."""
     
     BASE_URL = "https://api.twelvedata.com"
-    RATE_LIMIT_DELAY = 1.0  # seconds between requests
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, rate_limiter: Optional[TokenBucket] = None):
         """Initialize TwelveData client."""
         self.api_key = api_key or config.twelvedata_api_key
         if not self.api_key:
@@ -29,18 +46,23 @@ class TwelveDataClient:
         self.session.headers.update({
             "Authorization": f"apikey {self.api_key}"
         })
-        self.last_request_time = 0
+        # Size the connection pool for concurrent fetches
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, config.fetch_workers))
+        self.session.mount("https://", adapter)
         
-    def _rate_limit(self):
-        """Implement rate limiting."""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.RATE_LIMIT_DELAY:
-            time.sleep(self.RATE_LIMIT_DELAY - elapsed)
-        self.last_request_time = time.time()
+        # Token bucket shared by every client in the process
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        
+    def _rate_limit(self, credits: int = 1):
+        """Wait for API credits from the shared token bucket."""
+        waited = self.rate_limiter.acquire(credits)
+        if waited > 0:
+            logger.debug("Rate limited TwelveData request", waited_s=round(waited, 2))
     
     @retry(
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10)
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        before_sleep=lambda retry_state: increment("twelvedata_retries")
     )
     def _request(self, endpoint: str, params: Dict) -> Dict:
         """Make API request with retry logic."""
@@ -156,12 +178,140 @@ class TwelveDataClient:
         return data
 
 
+def _interval_to_timedelta(interval: str) -> Optional[pd.Timedelta]:
+    """Convert a TwelveData interval (e.g. "5min", "1h", "1day") to a Timedelta."""
+    try:
+        return pd.Timedelta(interval.replace("week", "W"))
+    except ValueError:
+        return None
+
+
+def fetch_with_store(
+    client: TwelveDataClient,
+    store: BarStore,
+    symbol: str,
+    interval: str,
+    outputsize: int = 200
+) -> pd.DataFrame:
+    """
+    Fetch a time series through the local bar store.
+    
+    Only bars newer than the last stored timestamp are requested from the API
+    (the last stored bar is re-fetched since it may have been still forming).
+    
+    Args:
+        client: TwelveData client
+        store: Bar store
+        symbol: Trading symbol (e.g., "USD/JPY")
+        interval: Time interval (e.g., "5min", "1h")
+        outputsize: Number of bars to return
+        
+    Returns:
+        DataFrame with the most recent ``outputsize`` bars
+    """
+    last_ts = store.last_timestamp(symbol, interval)
+    step = _interval_to_timedelta(interval)
+    
+    request_size = outputsize
+    if last_ts is not None and step is not None:
+        now = pd.Timestamp.now(tz=last_ts.tz)
+        missing_bars = int((now - last_ts) / step) + 2
+        request_size = max(2, min(outputsize, missing_bars))
+    
+    df = client.fetch_timeseries(symbol, interval, outputsize=request_size)
+    store.append(symbol, interval, df)
+    
+    stored = store.read(symbol, interval, tail=outputsize)
+    
+    logger.info(
+        "Fetched time series via bar store",
+        symbol=symbol,
+        interval=interval,
+        requested=request_size,
+        returned=len(stored)
+    )
+    
+    return stored
+
+
+def _fetch_timeframe(
+    client: TwelveDataClient,
+    store: Optional[BarStore],
+    symbol: str,
+    tf: str
+) -> pd.DataFrame:
+    """Fetch one timeframe, through the bar store when available."""
+    # Map timeframe format if needed
+    interval = tf.replace("m", "min") if "m" in tf else tf
+    if store:
+        try:
+            return fetch_with_store(client, store, symbol, interval)
+        except Exception as e:
+            logger.warning(f"Bar store fetch failed for {tf}, fetching full history", error=str(e))
+    return client.fetch_timeseries(symbol, interval)
+
+
+def fetch_multi_symbol_data(
+    symbols: List[str],
+    timeframes: Optional[list] = None,
+    max_workers: Optional[int] = None
+) -> Dict[str, Dict[str, pd.DataFrame]]:
+    """
+    Fetch multiple timeframes for multiple symbols concurrently.
+    
+    All (symbol, timeframe) requests are issued at once from a thread pool;
+    the shared token bucket keeps them within the TwelveData credit budget.
+    
+    Args:
+        symbols: Trading symbols (e.g., ["USD/JPY", "EUR/USD"])
+        timeframes: List of timeframes (defaults to config)
+        max_workers: Worker threads (defaults to config.fetch_workers)
+        
+    Returns:
+        Dict mapping symbol to a dict of timeframe to DataFrame
+        
+    Raises:
+        Exception: The first fetch error, after all requests have finished
+    """
+    timeframes = timeframes or config.timeframes
+    max_workers = max_workers or config.fetch_workers
+    
+    client = TwelveDataClient()
+    store = None
+    if config.bar_store_enabled:
+        try:
+            store = BarStore()
+        except Exception as e:
+            logger.warning(f"Bar store unavailable, fetching full history: {e}")
+    
+    jobs = [(symbol, tf) for symbol in symbols for tf in timeframes]
+    data = {symbol: {} for symbol in symbols}
+    errors = []
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs)) or 1) as executor:
+        futures = {
+            executor.submit(in_context(_fetch_timeframe), client, store, symbol, tf): (symbol, tf)
+            for symbol, tf in jobs
+        }
+        for future, (symbol, tf) in futures.items():
+            try:
+                data[symbol][tf] = future.result()
+            except Exception as e:
+                logger.error(f"Failed to fetch {tf} data", symbol=symbol, error=str(e))
+                errors.append(e)
+    
+    if errors:
+        raise errors[0]
+    
+    return data
+
+
 def fetch_multi_timeframe_data(
     symbol: Optional[str] = None,
     timeframes: Optional[list] = None
 ) -> Dict[str, pd.DataFrame]:
     """
-    Fetch data for multiple timeframes.
+    Fetch data for multiple timeframes concurrently.
     
     Args:
         symbol: Trading symbol (defaults to config)
@@ -171,19 +321,4 @@ def fetch_multi_timeframe_data(
         Dict mapping timeframe to DataFrame
     """
     symbol = symbol or config.symbol
-    timeframes = timeframes or config.timeframes
-    
-    client = TwelveDataClient()
-    data = {}
-    
-    for tf in timeframes:
-        try:
-            # Map timeframe format if needed
-            interval = tf.replace("m", "min") if "m" in tf else tf
-            df = client.fetch_timeseries(symbol, interval)
-            data[tf] = df
-        except Exception as e:
-            logger.error(f"Failed to fetch {tf} data", error=str(e))
-            raise
-    
-    return data
\ No newline at end of file
+    return fetch_multi_symbol_data([symbol], timeframes)[symbol]
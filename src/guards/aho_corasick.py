@@ -0,0 +1,90 @@
+"""Aho–Corasick automaton for multi-phrase matching in one pass over the text."""
+
+from collections import deque
+from typing import Dict, List, Sequence, Set
+
+
+class PhraseAutomaton:
+    """
+    Match many phrases at once.
+
+    Building is O(total phrase length); each scan is O(text length + matches),
+    independent of how many phrases are loaded.
+    """
+
+    def __init__(self, phrases: Sequence[str]):
+        """
+        Compile the automaton.
+
+        Args:
+            phrases: Phrases to match; results refer to their indices
+        """
+        self.phrases = list(phrases)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        # The empty phrase occurs in every string (as with ``"" in text``)
+        self._always = [i for i, phrase in enumerate(self.phrases) if phrase == ""]
+
+        for index, phrase in enumerate(self.phrases):
+            if phrase:
+                self._insert(phrase, index)
+        self._link()
+
+    def _insert(self, phrase: str, index: int) -> None:
+        state = 0
+        for char in phrase:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = next_state
+        self._out[state].append(index)
+
+    def _link(self) -> None:
+        """Compute failure links breadth-first and merge outputs along them."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find(self, text: str) -> Set[int]:
+        """
+        Indices of all phrases occurring in ``text``.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Set of phrase indices (empty when nothing matches)
+        """
+        found = set(self._always)
+        goto, fail, out = self._goto, self._fail, self._out
+        root = goto[0]
+        # Most strings share no character with any phrase start; skip them in C
+        if root.keys().isdisjoint(text):
+            return found
+        state = 0
+        for char in text:
+            if state:
+                while state and char not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(char, 0)
+            else:
+                state = root.get(char, 0)
+            if state and out[state]:
+                found.update(out[state])
+        return found
+
+    def __len__(self) -> int:
+        return len(self.phrases)
@@ -1,14 +1,84 @@
 """Linguistic guard to prevent investment advice language."""
 
-import json
+import os
+import threading
 import yaml
 from pathlib import Path
-from typing import List, Tuple, Dict
+from typing import List, Optional, Tuple, Dict
 
+from src.guards.aho_corasick import PhraseAutomaton
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+DEFAULT_CONFIG_PATH = Path(__file__).parent.parent.parent / "quality_step_bundle_full" / "guards" / "LINGUISTIC_GUARD.yaml"
+
+# Used when the config cannot be loaded
+DEFAULT_BANNED = ["必ず", "確実に", "絶対に", "今すぐ買う", "今すぐ売る"]
+DEFAULT_REPLACEMENTS = {"買いましょう": "買う根拠が十分か再検討"}
+
+
+class CompiledGuard:
+    """Banned words and replacements compiled into automata."""
+
+    def __init__(self, banned_words: List[str], replacements: Dict[str, str]):
+        self.banned_words = list(banned_words)
+        self.replacements = dict(replacements)
+        self.originals = list(self.replacements)
+        self.banned_automaton = PhraseAutomaton(self.banned_words)
+        self.replacement_automaton = PhraseAutomaton(self.originals)
+
+
+# Compiled configs by path: (mtime, CompiledGuard); rebuilt when the file changes
+_compiled: Dict[str, Tuple[Optional[float], CompiledGuard]] = {}
+_compile_lock = threading.Lock()
+
+
+def _mtime(path: str) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _compile(path: str) -> CompiledGuard:
+    """Load and compile a guard config, falling back to the defaults."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f)
+        guard = CompiledGuard(config.get('banned', []), config.get('replacements', {}))
+        logger.info(f"Loaded linguistic guard config: {len(guard.banned_words)} banned words, {len(guard.replacements)} replacements")
+    except Exception as e:
+        logger.error(f"Failed to load linguistic guard config: {e}")
+        guard = CompiledGuard(DEFAULT_BANNED, DEFAULT_REPLACEMENTS)
+    return guard
+
+
+def load_guard(config_path) -> CompiledGuard:
+    """
+    Compiled guard for a config file, shared across instances.
+
+    The file is compiled once per modification time; unchanged files cost
+    one ``stat`` call.
+
+    Args:
+        config_path: Path to LINGUISTIC_GUARD.yaml
+
+    Returns:
+        CompiledGuard
+    """
+    path = str(config_path)
+    mtime = _mtime(path)
+    cached = _compiled.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with _compile_lock:
+        cached = _compiled.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = _compiled[path] = (mtime, _compile(path))
+    return cached[1]
+
 
 class LinguisticGuard:
     """Guard against prohibited investment advice language."""
@@ -17,27 +87,24 @@ class LinguisticGuard:
         """Initialize the linguistic guard."""
         if config_path is None:
             # Default to quality_step_bundle_full location
-            config_path = Path(__file__).parent.parent.parent / "quality_step_bundle_full" / "guards" / "LINGUISTIC_GUARD.yaml"
+            config_path = DEFAULT_CONFIG_PATH
         
-        self.banned_words = []
-        self.replacements = {}
+        self.config_path = config_path
         self.advice_flags = []
-        
-        self._load_config(config_path)
+        self._guard = load_guard(config_path)
+    
+    @property
+    def banned_words(self) -> List[str]:
+        return self._guard.banned_words
+    
+    @property
+    def replacements(self) -> Dict[str, str]:
+        return self._guard.replacements
     
-    def _load_config(self, config_path):
-        """Load guard configuration from YAML file."""
-        try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
-                self.banned_words = config.get('banned', [])
-                self.replacements = config.get('replacements', {})
-                logger.info(f"Loaded linguistic guard config: {len(self.banned_words)} banned words, {len(self.replacements)} replacements")
-        except Exception as e:
-            logger.error(f"Failed to load linguistic guard config: {e}")
-            # Set defaults
-            self.banned_words = ["必ず", "確実に", "絶対に", "今すぐ買う", "今すぐ売る"]
-            self.replacements = {"買いましょう": "買う根拠が十分か再検討"}
+    def _refresh(self) -> CompiledGuard:
+        """Pick up config changes made since the last check."""
+        self._guard = load_guard(self.config_path)
+        return self._guard
     
     def check_and_replace(self, text: str) -> Tuple[str, List[str]]:
         """
@@ -49,23 +116,42 @@ class LinguisticGuard:
         Returns:
             Tuple of (cleaned_text, advice_flags)
         """
+        return self._check(self._refresh(), text)
+    
+    def _check(self, guard: CompiledGuard, text: str) -> Tuple[str, List[str]]:
+        """
+        Scan once per phrase set; only phrases that occur are replaced.
+
+        Flags and output match checking each phrase in config order: banned
+        words are looked up in the original text, replacements in the text
+        as it stands after the previous replacements.
+        """
         advice_flags = []
         cleaned_text = text
         
         # Check for banned words
-        for banned_word in self.banned_words:
-            if banned_word in text:
-                advice_flags.append(f"banned:{banned_word}")
-                logger.warning(f"Found banned word: {banned_word}")
-                # Remove the banned word
-                cleaned_text = cleaned_text.replace(banned_word, "")
+        hits = guard.banned_automaton.find(text)
+        for index in sorted(hits):
+            banned_word = guard.banned_words[index]
+            advice_flags.append(f"banned:{banned_word}")
+            logger.warning(f"Found banned word: {banned_word}")
+            # Remove the banned word
+            cleaned_text = cleaned_text.replace(banned_word, "")
         
         # Apply replacements
-        for original, replacement in self.replacements.items():
-            if original in cleaned_text:
-                advice_flags.append(f"replaced:{original}")
-                cleaned_text = cleaned_text.replace(original, replacement)
-                logger.info(f"Replaced '{original}' with '{replacement}'")
+        present = guard.replacement_automaton.find(cleaned_text)
+        if not present:
+            return cleaned_text, advice_flags
+        
+        for index, original in enumerate(guard.originals):
+            if index not in present:
+                continue
+            replacement = guard.replacements[original]
+            advice_flags.append(f"replaced:{original}")
+            cleaned_text = cleaned_text.replace(original, replacement)
+            logger.info(f"Replaced '{original}' with '{replacement}'")
+            # A replacement can create or remove later phrases
+            present = guard.replacement_automaton.find(cleaned_text)
         
         return cleaned_text, advice_flags
     
@@ -79,29 +165,32 @@ class LinguisticGuard:
         Returns:
             Tuple of (cleaned_dict, advice_flags)
         """
+        return self._check_dict(self._refresh(), data)
+    
+    def _check_dict(self, guard: CompiledGuard, data: Dict) -> Tuple[Dict, List[str]]:
         all_flags = []
         cleaned_data = {}
         
         for key, value in data.items():
             if isinstance(value, str):
-                cleaned_value, flags = self.check_and_replace(value)
+                cleaned_value, flags = self._check(guard, value)
                 cleaned_data[key] = cleaned_value
                 all_flags.extend(flags)
             elif isinstance(value, list):
                 cleaned_list = []
                 for item in value:
                     if isinstance(item, str):
-                        cleaned_item, flags = self.check_and_replace(item)
+                        cleaned_item, flags = self._check(guard, item)
                         cleaned_list.append(cleaned_item)
                         all_flags.extend(flags)
                     else:
                         cleaned_list.append(item)
                 cleaned_data[key] = cleaned_list
             elif isinstance(value, dict):
-                cleaned_dict, flags = self.check_dict(value)
+                cleaned_dict, flags = self._check_dict(guard, value)
                 cleaned_data[key] = cleaned_dict
                 all_flags.extend(flags)
             else:
                 cleaned_data[key] = value
         
-        return cleaned_data, all_flags
\ No newline at end of file
+        return cleaned_data, all_flags
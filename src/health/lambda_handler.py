@@ -6,47 +6,100 @@ Non-VPC configuration for direct access to AWS services
 import json
 import boto3
 import os
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
 import time
 
+# Logs Insights queries run by each health check: section -> (query, lookback)
+# The runner logs JSON (structlog), so fields are auto-discovered; every run
+# ends with one "Run metrics" event carrying status and execution_time_ms
+QUERIES = {
+    # Include no-trade as successful execution
+    'last_success': ("""
+    fields @timestamp, run_id
+    | filter event = "Run metrics" and status in ["success", "no-trade"]
+    | sort @timestamp desc
+    | limit 1
+    """, timedelta(days=7)),
+    'error_counts': ("""
+    fields logger as module
+    | filter level = "error"
+    | stats count() by module
+    """, timedelta(hours=24)),
+    'metrics': ("""
+    fields @timestamp, status, execution_time_ms
+    | filter event = "Run metrics"
+    | stats 
+        count() as total_runs,
+        sum(strcontains(status, "success") + strcontains(status, "no-trade")) as successful_runs,
+        avg(execution_time_ms) as avg_execution_ms
+    """, timedelta(days=7)),
+    'today_runs': ("""
+    fields @timestamp
+    | filter event = "Run metrics"
+    | stats count() as today_runs
+    """, None),  # Since midnight UTC
+}
+
+# Overall polling budget (capped by the Lambda's remaining time)
+QUERY_DEADLINE_S = float(os.environ.get('QUERY_DEADLINE_S', '10'))
+# Polling backoff: first check soon, then back off while queries run
+POLL_INITIAL_S = 0.1
+POLL_MAX_S = 1.0
+POLL_FACTOR = 1.6
+# Time kept for building the response after polling stops
+RESPONSE_MARGIN_S = 2.0
+
+
+# Heartbeats written by the runner and daily stats job, and the cached response
+HEALTH_PREFIX = os.environ.get('HEALTH_PREFIX', 'health')
+CACHE_TTL_S = float(os.environ.get('HEALTH_CACHE_TTL_S', '60'))
+
+# Response cache of this (warm) Lambda instance
+_memory_cache = {'body': None, 'expires_at': 0.0}
+
+
 def lambda_handler(event, context):
     """
     Health check endpoint - returns system status and metrics
     Non-VPC Lambda with direct access to CloudWatch, S3, etc.
+    
+    Responses are served from an in-memory cache, then from an S3 copy of
+    the last response (both valid for HEALTH_CACHE_TTL_S). On a miss the
+    response is rebuilt from the heartbeat objects the runner and daily
+    stats job write to S3, and only when there are none from Logs Insights.
+    Pass ?refresh=1 to bypass the caches.
     """
     
-    logs_client = boto3.client('logs')
     s3_client = boto3.client('s3')
-    scheduler_client = boto3.client('scheduler')
-    cloudwatch = boto3.client('cloudwatch')
     
     # Environment variables
     log_group = os.environ.get('LOG_GROUP_NAME', '/ecs/analyze-fx')
     s3_bucket = os.environ.get('S3_BUCKET', 'analyze-fx-455931011903-apne1')
     
+    started = time.monotonic()
+    params = (event or {}).get('queryStringParameters') or {}
+    refresh = params.get('refresh') in ('1', 'true')
+    
     try:
-        # 1. Get last successful execution
-        last_success_data = get_last_success(logs_client, log_group)
-        
-        # 2. Calculate error counts (last 24h)
-        error_counts = get_error_counts(logs_client, log_group)
+        body, source = None, None
+        if not refresh:
+            body, source = get_cached_body(s3_client, s3_bucket)
         
-        # 3. Calculate metrics (7 days)
-        metrics = calculate_metrics(logs_client, log_group)
+        if body is None:
+            body = build_from_heartbeats(s3_client, s3_bucket)
+            if body is None:
+                body = build_from_logs(log_group, context)
+            body['next_scheduled_run'] = get_next_scheduled_run(boto3.client('scheduler'))
+            body['generated_at'] = time.time()
+            store_cached_body(s3_client, s3_bucket, body)
+            source = body['source']
         
-        # 4. Get next scheduled run
-        next_run = get_next_scheduled_run(scheduler_client)
-        
-        # 5. Put metrics to CloudWatch
-        put_health_metrics(cloudwatch, metrics)
-        
-        # 6. Check system health
-        health_status = determine_health_status(
-            last_success_data,
-            error_counts,
-            metrics
-        )
+        response = dict(body)
+        response['served_from'] = source
+        response['cache_age_s'] = round(time.time() - body['generated_at'], 1)
+        response['elapsed_ms'] = int((time.monotonic() - started) * 1000)
         
         return {
             'statusCode': 200,
@@ -54,14 +107,7 @@ def lambda_handler(event, context):
                 'Content-Type': 'application/json',
                 'Access-Control-Allow-Origin': '*'
             },
-            'body': json.dumps({
-                'status': health_status,
-                'last_success_ts': last_success_data.get('timestamp'),
-                'last_run_id': last_success_data.get('run_id'),
-                'error_counts': error_counts,
-                'next_scheduled_run': next_run,
-                'system_metrics': metrics
-            })
+            'body': json.dumps(response)
         }
         
     except Exception as e:
@@ -75,189 +121,355 @@ def lambda_handler(event, context):
         }
 
 
-def get_last_success(logs_client, log_group: str) -> Dict:
+def get_cached_body(s3_client, s3_bucket: str) -> Tuple[Optional[Dict], Optional[str]]:
     """
-    Get last successful execution using CloudWatch Logs Insights
-    修正2: 実際のstart_query/get_query_results実装
+    Look up a response younger than CACHE_TTL_S, in memory and then in S3
+    
+    Returns:
+        (cached body, 'memory-cache' or 's3-cache'), or (None, None) on a miss
     """
     
-    # Start query - include no-trade as successful execution
-    query_string = """
-    fields @timestamp, @message
-    | filter @message like /status.*(?:success|no-trade)/
-    | parse @message /"run_id":"(?<run_id>[^"]+)"/
-    | sort @timestamp desc
-    | limit 1
+    now = time.time()
+    if _memory_cache['body'] is not None and _memory_cache['expires_at'] > now:
+        return _memory_cache['body'], 'memory-cache'
+    
+    try:
+        response = s3_client.get_object(Bucket=s3_bucket, Key=f"{HEALTH_PREFIX}/cache.json")
+        body = json.loads(response['Body'].read())
+    except Exception:
+        return None, None
+    
+    if now - body.get('generated_at', 0) < CACHE_TTL_S:
+        _memory_cache.update(body=body, expires_at=body['generated_at'] + CACHE_TTL_S)
+        return body, 's3-cache'
+    return None, None
+
+
+def store_cached_body(s3_client, s3_bucket: str, body: Dict):
+    """
+    Keep a freshly built response in memory and in S3
     """
     
-    response = logs_client.start_query(
-        logGroupName=log_group,
-        startTime=int((datetime.utcnow() - timedelta(days=7)).timestamp()),
-        endTime=int(datetime.utcnow().timestamp()),
-        queryString=query_string
-    )
+    _memory_cache.update(body=body, expires_at=body['generated_at'] + CACHE_TTL_S)
+    try:
+        s3_client.put_object(
+            Bucket=s3_bucket,
+            Key=f"{HEALTH_PREFIX}/cache.json",
+            Body=json.dumps(body).encode('utf-8'),
+            ContentType='application/json'
+        )
+    except Exception as e:
+        print(f"Failed to store health cache: {str(e)}")
+
+
+def build_from_heartbeats(s3_client, s3_bucket: str) -> Optional[Dict]:
+    """
+    Build the health response from the heartbeat objects in S3
     
-    query_id = response['queryId']
+    Runner heartbeats (one per pair) hold per-day run counters and hourly
+    error counts; they are summed over the same windows as the log queries
+    (7 days, today since midnight UTC, last 24 hours).
     
-    # Wait for query completion
-    results = wait_for_query_results(logs_client, query_id)
+    Returns:
+        Response body, or None when there are no runner heartbeats
+    """
     
-    if results:
-        # Parse the first result
-        for field in results[0]:
-            if field['field'] == '@timestamp':
-                timestamp = field['value']
-            elif field['field'] == 'run_id':
-                run_id = field['value']
+    prefix = f"{HEALTH_PREFIX}/heartbeats/"
+    try:
+        listing = s3_client.list_objects_v2(Bucket=s3_bucket, Prefix=prefix)
+        keys = [obj['Key'] for obj in listing.get('Contents', []) if obj['Key'].endswith('.json')]
         
-        return {
-            'timestamp': timestamp,
-            'run_id': run_id if 'run_id' in locals() else 'unknown'
+        def load(key):
+            return json.loads(s3_client.get_object(Bucket=s3_bucket, Key=key)['Body'].read())
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(8, len(keys)))) as executor:
+            heartbeats = dict(zip(keys, executor.map(load, keys)))
+    except Exception as e:
+        print(f"Failed to read heartbeats: {str(e)}")
+        return None
+    
+    runners = [hb for hb in heartbeats.values() if hb.get('source') == 'runner']
+    if not runners:
+        return None
+    
+    now = datetime.now(timezone.utc)
+    today = now.date().isoformat()
+    first_day = (now - timedelta(days=6)).date().isoformat()
+    first_hour = (now - timedelta(hours=24)).strftime('%Y-%m-%dT%H')
+    
+    total_runs = successful_runs = duration_ms = today_runs = 0
+    error_counts = {}
+    for heartbeat in runners:
+        for day, counters in heartbeat.get('days', {}).items():
+            if day >= first_day:
+                total_runs += counters.get('runs', 0)
+                successful_runs += counters.get('successful', 0)
+                duration_ms += counters.get('duration_ms_sum', 0)
+            if day == today:
+                today_runs += counters.get('runs', 0)
+        for hour, modules in heartbeat.get('errors', {}).items():
+            if hour >= first_hour:
+                for module, count in modules.items():
+                    error_counts[module] = error_counts.get(module, 0) + count
+    
+    metrics = {
+        'avg_execution_time_ms': round(duration_ms / total_runs, 2) if total_runs else 0,
+        'success_rate_7d': round(successful_runs / total_runs * 100, 2) if total_runs else 0,
+        'total_runs_7d': total_runs,
+        'successful_runs_7d': successful_runs,
+        'total_runs_today': today_runs
+    }
+    
+    put_health_metrics(boto3.client('cloudwatch'), metrics)
+    
+    successes = [hb['last_success'] for hb in runners if hb.get('last_success')]
+    if successes:
+        latest = max(successes, key=lambda run: run['timestamp'])
+        last_success_data = {'timestamp': latest['timestamp'], 'run_id': latest.get('run_id', 'unknown')}
+    else:
+        last_success_data = {'timestamp': 'No successful runs in last 7 days', 'run_id': 'N/A'}
+    
+    # Each heartbeat is a section; its age says how current it is
+    sections = {}
+    for key, heartbeat in heartbeats.items():
+        name = key[len(prefix):-len('.json')]
+        updated_at = heartbeat.get('updated_at')
+        age_s = (now - datetime.fromisoformat(updated_at)).total_seconds() if updated_at else None
+        sections[name] = {
+            'status': heartbeat.get('last_run', {}).get('status', 'unknown'),
+            'stale': False,
+            'updated_at': updated_at,
+            'age_s': round(age_s) if age_s is not None else None
         }
+    daily_stats = heartbeats.get(f"{prefix}daily-stats.json")
     
     return {
-        'timestamp': 'No successful runs in last 7 days',
-        'run_id': 'N/A'
+        'status': determine_health_status(last_success_data, error_counts, metrics),
+        'last_success_ts': last_success_data.get('timestamp'),
+        'last_run_id': last_success_data.get('run_id'),
+        'error_counts': error_counts,
+        'system_metrics': metrics,
+        'daily_stats': daily_stats.get('summary') if daily_stats else None,
+        'partial': False,
+        'sections': sections,
+        'source': 'heartbeat'
     }
 
 
-def get_error_counts(logs_client, log_group: str) -> Dict[str, int]:
-    """
-    Get error counts by module (last 24 hours)
+def build_from_logs(log_group: str, context) -> Dict:
     """
+    Build the health response with Logs Insights (fallback when there are no heartbeats)
     
-    query_string = """
-    fields @message
-    | filter @message like /ERROR/
-    | parse @message /\\[(?<module>[^\\]]+)\\].*ERROR/
-    | stats count() by module
+    All queries start together and are polled as one batch, so latency is
+    bounded by the slowest query (or the deadline). Sections whose query has
+    not finished are returned with the rows seen so far and marked stale.
     """
     
-    response = logs_client.start_query(
-        logGroupName=log_group,
-        startTime=int((datetime.utcnow() - timedelta(hours=24)).timestamp()),
-        endTime=int(datetime.utcnow().timestamp()),
-        queryString=query_string
-    )
+    logs_client = boto3.client('logs')
+    cloudwatch = boto3.client('cloudwatch')
     
-    query_id = response['queryId']
-    results = wait_for_query_results(logs_client, query_id)
+    budget = QUERY_DEADLINE_S
+    if context is not None and hasattr(context, 'get_remaining_time_in_millis'):
+        budget = min(budget, context.get_remaining_time_in_millis() / 1000 - RESPONSE_MARGIN_S)
+    deadline = time.monotonic() + max(budget, 0)
     
-    error_counts = {}
-    for result in results:
-        module = None
-        count = None
-        for field in result:
-            if field['field'] == 'module':
-                module = field['value']
-            elif field['field'] == 'count()':
-                count = int(field['value'])
-        
-        if module and count:
-            error_counts[module] = count
+    # 1. Start every query at once, then poll them together
+    query_ids, sections = start_queries(logs_client, log_group)
+    results = poll_queries(logs_client, query_ids, deadline, sections)
     
-    return error_counts
+    # 2. Parse each section from whatever rows arrived
+    last_success_data = parse_last_success(results.get('last_success', []))
+    error_counts = parse_error_counts(results.get('error_counts', []))
+    metrics = parse_metrics(results.get('metrics', []), results.get('today_runs', []))
+    
+    # 3. Put metrics to CloudWatch (only complete figures)
+    if sections['metrics']['status'] == 'complete' and sections['today_runs']['status'] == 'complete':
+        put_health_metrics(cloudwatch, metrics)
+    
+    # 4. Check system health
+    if sections['metrics']['status'] in ('complete', 'partial'):
+        health_status = determine_health_status(
+            last_success_data,
+            error_counts,
+            metrics
+        )
+    else:
+        health_status = 'unknown'
+    
+    return {
+        'status': health_status,
+        'last_success_ts': last_success_data.get('timestamp'),
+        'last_run_id': last_success_data.get('run_id'),
+        'error_counts': error_counts,
+        'system_metrics': metrics,
+        'partial': any(section['stale'] for section in sections.values()),
+        'sections': sections,
+        'source': 'logs'
+    }
 
 
-def calculate_metrics(logs_client, log_group: str) -> Dict:
+def start_queries(logs_client, log_group: str) -> Tuple[Dict[str, str], Dict[str, Dict]]:
     """
-    Calculate system metrics (7 days)
+    Start every query in QUERIES without waiting for any of them
+    
+    Returns:
+        (section -> query id, section -> status marker)
     """
     
-    # Query for execution times and success rates - include no-trade as successful
-    query_string = """
-    fields @timestamp, @message
-    | filter @message like /Analysis run completed/
-    | parse @message /status=(?<status>[^,]+)/
-    | parse @message /execution_time_ms=(?<exec_ms>\\d+)/
-    | stats 
-        count() as total_runs,
-        count(status = "success" or status = "no-trade") as successful_runs,
-        avg(exec_ms) as avg_execution_ms
+    now = datetime.utcnow()
+    query_ids = {}
+    sections = {}
+    
+    for name, (query_string, lookback) in QUERIES.items():
+        start = now - lookback if lookback else now.replace(hour=0, minute=0, second=0, microsecond=0)
+        try:
+            response = logs_client.start_query(
+                logGroupName=log_group,
+                startTime=int(start.timestamp()),
+                endTime=int(now.timestamp()),
+                queryString=query_string
+            )
+            query_ids[name] = response['queryId']
+            sections[name] = {'status': 'running', 'stale': True}
+        except Exception as e:
+            print(f"Failed to start {name} query: {str(e)}")
+            sections[name] = {'status': 'failed', 'stale': True, 'error': str(e)}
+    
+    return query_ids, sections
+
+
+def poll_queries(
+    logs_client,
+    query_ids: Dict[str, str],
+    deadline: float,
+    sections: Dict[str, Dict]
+) -> Dict[str, List]:
     """
+    Poll all running queries together with exponential backoff
     
-    response = logs_client.start_query(
-        logGroupName=log_group,
-        startTime=int((datetime.utcnow() - timedelta(days=7)).timestamp()),
-        endTime=int(datetime.utcnow().timestamp()),
-        queryString=query_string
-    )
-    
-    query_id = response['queryId']
-    results = wait_for_query_results(logs_client, query_id)
-    
-    if results and len(results) > 0:
-        result = results[0]
-        total_runs = 0
-        successful_runs = 0
-        avg_execution_ms = 0
-        
-        for field in result:
-            if field['field'] == 'total_runs':
-                total_runs = int(field['value'])
-            elif field['field'] == 'successful_runs':
-                successful_runs = int(field['value'])
-            elif field['field'] == 'avg_execution_ms':
-                avg_execution_ms = float(field['value'])
-        
-        success_rate = (successful_runs / total_runs * 100) if total_runs > 0 else 0
-        
-        # Today's runs
-        today_query = """
-        fields @timestamp
-        | filter @message like /Analysis run/
-        | stats count() as today_runs
-        """
-        
-        today_response = logs_client.start_query(
-            logGroupName=log_group,
-            startTime=int((datetime.utcnow().replace(hour=0, minute=0, second=0)).timestamp()),
-            endTime=int(datetime.utcnow().timestamp()),
-            queryString=today_query
-        )
-        
-        today_results = wait_for_query_results(logs_client, today_response['queryId'])
-        today_runs = 0
-        
-        if today_results and len(today_results) > 0:
-            for field in today_results[0]:
-                if field['field'] == 'today_runs':
-                    today_runs = int(field['value'])
+    Each round checks every pending query once, then sleeps; the sleep grows
+    from POLL_INITIAL_S to POLL_MAX_S and never runs past the deadline.
+    Queries still running at the deadline keep their partial rows, are
+    marked 'partial' and stopped.
+    
+    Args:
+        logs_client: CloudWatch Logs client
+        query_ids: section -> query id
+        deadline: time.monotonic() value to stop polling at
+        sections: section -> status marker (updated in place)
+    
+    Returns:
+        section -> result rows (possibly partial)
+    """
+    
+    started = time.monotonic()
+    results = {}
+    pending = dict(query_ids)
+    delay = POLL_INITIAL_S
+    
+    while pending:
+        for name, query_id in list(pending.items()):
+            try:
+                response = logs_client.get_query_results(queryId=query_id)
+            except Exception as e:
+                print(f"Failed to poll {name} query: {str(e)}")
+                continue
+            
+            status = response['status']
+            results[name] = response.get('results', [])
+            if status == 'Complete':
+                sections[name] = {
+                    'status': 'complete',
+                    'stale': False,
+                    'elapsed_ms': int((time.monotonic() - started) * 1000)
+                }
+                del pending[name]
+            elif status in ['Failed', 'Cancelled', 'Timeout']:
+                sections[name] = {'status': 'failed', 'stale': True, 'error': f"Query {status.lower()}"}
+                del pending[name]
         
+        remaining = deadline - time.monotonic()
+        if not pending or remaining <= 0:
+            break
+        time.sleep(min(delay, remaining))
+        delay = min(delay * POLL_FACTOR, POLL_MAX_S)
+    
+    for name, query_id in pending.items():
+        sections[name] = {
+            'status': 'partial' if results.get(name) else 'timeout',
+            'stale': True,
+            'elapsed_ms': int((time.monotonic() - started) * 1000)
+        }
+        try:
+            logs_client.stop_query(queryId=query_id)
+        except Exception:
+            pass
+    
+    return results
+
+
+def _fields(row: List[Dict]) -> Dict[str, str]:
+    """Convert one Logs Insights result row to a field -> value dict"""
+    return {field['field']: field['value'] for field in row}
+
+
+def parse_last_success(results: List) -> Dict:
+    """
+    Get last successful execution from the last_success query rows
+    """
+    
+    if results:
+        row = _fields(results[0])
         return {
-            'avg_execution_time_ms': round(avg_execution_ms, 2),
-            'success_rate_7d': round(success_rate, 2),
-            'total_runs_7d': total_runs,
-            'successful_runs_7d': successful_runs,
-            'total_runs_today': today_runs
+            'timestamp': row.get('@timestamp'),
+            'run_id': row.get('run_id', 'unknown')
         }
     
     return {
-        'avg_execution_time_ms': 0,
-        'success_rate_7d': 0,
-        'total_runs_7d': 0,
-        'successful_runs_7d': 0,
-        'total_runs_today': 0
+        'timestamp': 'No successful runs in last 7 days',
+        'run_id': 'N/A'
     }
 
 
-def wait_for_query_results(logs_client, query_id: str, max_wait: int = 30) -> List:
+def parse_error_counts(results: List) -> Dict[str, int]:
     """
-    Poll for query results until complete
+    Get error counts by module (last 24 hours)
     """
     
-    for _ in range(max_wait):
-        response = logs_client.get_query_results(queryId=query_id)
-        status = response['status']
-        
-        if status == 'Complete':
-            return response['results']
-        elif status in ['Failed', 'Cancelled']:
-            raise Exception(f"Query {query_id} failed with status: {status}")
+    error_counts = {}
+    for result in results:
+        row = _fields(result)
+        module = row.get('module')
+        count = int(row.get('count()', 0) or 0)
         
-        time.sleep(1)
+        if module and count:
+            error_counts[module] = count
     
-    raise Exception(f"Query {query_id} timed out after {max_wait} seconds")
+    return error_counts
+
+
+def parse_metrics(results: List, today_results: List) -> Dict:
+    """
+    Calculate system metrics (7 days) from the metrics and today_runs query rows
+    """
+    
+    row = _fields(results[0]) if results else {}
+    # Aggregates come back as strings, sums possibly as "12.0"
+    total_runs = int(float(row.get('total_runs', 0) or 0))
+    successful_runs = int(float(row.get('successful_runs', 0) or 0))
+    avg_execution_ms = float(row.get('avg_execution_ms', 0) or 0)
+    success_rate = (successful_runs / total_runs * 100) if total_runs > 0 else 0
+    
+    today_row = _fields(today_results[0]) if today_results else {}
+    today_runs = int(today_row.get('today_runs', 0) or 0)
+    
+    return {
+        'avg_execution_time_ms': round(avg_execution_ms, 2),
+        'success_rate_7d': round(success_rate, 2),
+        'total_runs_7d': total_runs,
+        'successful_runs_7d': successful_runs,
+        'total_runs_today': today_runs
+    }
 
 
 def get_next_scheduled_run(scheduler_client) -> str:
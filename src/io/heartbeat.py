@@ -0,0 +1,144 @@
+"""Health heartbeat snapshots in S3, read by the health Lambda instead of log scans."""
+
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+from botocore.exceptions import ClientError
+
+from src.utils.config import config
+from src.utils.logger import get_logger, pop_error_counts
+
+logger = get_logger(__name__)
+
+# Daily run counters older than this are dropped (the health window is 7 days)
+RETAIN_DAYS = 8
+# Hourly error buckets older than this are dropped (errors are reported for 24h)
+RETAIN_ERROR_HOURS = 25
+
+
+def heartbeat_key(source: str) -> str:
+    """Build heartbeat key: health/heartbeats/{source}.json"""
+    return f"{config.health_prefix}/heartbeats/{source}.json"
+
+
+class HeartbeatWriter:
+    """
+    Maintain one compact heartbeat object per writer.
+
+    Each runner pair (``runner-{pair}``) and the daily stats job
+    (``daily-stats``) owns its own object, so read-modify-write needs no
+    coordination. Runner heartbeats keep per-day run counters (UTC days)
+    and hourly error counts per module; the health Lambda sums them.
+    """
+
+    def __init__(self, s3_client, source: str):
+        """
+        Initialize heartbeat writer.
+
+        Args:
+            s3_client: S3Client of the artifacts bucket
+            source: Heartbeat name (e.g., "runner-USDJPY", "daily-stats")
+        """
+        self.s3_client = s3_client
+        self.source = source
+        self.key = heartbeat_key(source)
+
+    def _load(self) -> Dict:
+        """Read the current heartbeat (empty when missing or unreadable)."""
+        try:
+            response = self.s3_client.s3.get_object(Bucket=self.s3_client.bucket, Key=self.key)
+            return json.loads(response['Body'].read())
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') not in ('NoSuchKey', '404'):
+                logger.warning(f"Failed to read heartbeat: {e}", key=self.key)
+        except Exception as e:
+            logger.warning(f"Failed to read heartbeat: {e}", key=self.key)
+        return {}
+
+    def _store(self, heartbeat: Dict) -> None:
+        """Write the heartbeat object."""
+        self.s3_client.s3.put_object(
+            Bucket=self.s3_client.bucket,
+            Key=self.key,
+            Body=json.dumps(heartbeat, separators=(",", ":"), default=str).encode('utf-8'),
+            ContentType='application/json',
+            CacheControl='no-cache'
+        )
+
+    def record_run(self, analysis: Dict, duration_ms: int) -> None:
+        """
+        Add one analysis run to the runner heartbeat.
+
+        Args:
+            analysis: Final analysis result (status/run_id/timestamp_jst)
+            duration_ms: Wall time of the run
+        """
+        now = datetime.now(timezone.utc)
+        heartbeat = self._load()
+        status = analysis.get("status", "failed")
+        successful = status in ("success", "no-trade")
+
+        day = heartbeat.setdefault("days", {}).setdefault(
+            now.date().isoformat(),
+            {"runs": 0, "successful": 0, "failed": 0, "duration_ms_sum": 0}
+        )
+        day["runs"] += 1
+        day["successful" if successful else "failed"] += 1
+        day["duration_ms_sum"] += int(duration_ms)
+
+        errors = pop_error_counts()
+        if errors:
+            bucket = heartbeat.setdefault("errors", {}).setdefault(now.strftime("%Y-%m-%dT%H"), {})
+            for module, count in errors.items():
+                bucket[module] = bucket.get(module, 0) + count
+
+        last_run = {
+            "run_id": analysis.get("run_id"),
+            "status": status,
+            "timestamp": now.isoformat(),
+            "duration_ms": int(duration_ms)
+        }
+        heartbeat["last_run"] = last_run
+        if successful:
+            heartbeat["last_success"] = last_run
+        if analysis.get("error"):
+            heartbeat["last_error"] = {"run_id": analysis.get("run_id"), "error": str(analysis["error"])[:500]}
+
+        self._prune(heartbeat, now)
+        heartbeat.update(source="runner", updated_at=now.isoformat())
+        self._store(heartbeat)
+
+    def record_job(self, summary: Optional[Dict], duration_ms: int, error: Optional[str] = None) -> None:
+        """
+        Replace the heartbeat of a batch job (e.g., the daily stats job).
+
+        Args:
+            summary: Job summary (None when the job failed)
+            duration_ms: Wall time of the job
+            error: Failure message
+        """
+        now = datetime.now(timezone.utc)
+        heartbeat = self._load()
+        heartbeat.update(
+            source=self.source,
+            updated_at=now.isoformat(),
+            last_run={
+                "status": "failed" if error else "success",
+                "timestamp": now.isoformat(),
+                "duration_ms": int(duration_ms)
+            }
+        )
+        if error:
+            heartbeat["last_error"] = {"timestamp": now.isoformat(), "error": error[:500]}
+        else:
+            heartbeat["last_success"] = heartbeat["last_run"]
+            heartbeat["summary"] = summary
+        self._store(heartbeat)
+
+    @staticmethod
+    def _prune(heartbeat: Dict, now: datetime) -> None:
+        """Drop counters that fell out of the reporting windows."""
+        oldest_day = (now - timedelta(days=RETAIN_DAYS)).date().isoformat()
+        heartbeat["days"] = {d: v for d, v in heartbeat.get("days", {}).items() if d > oldest_day}
+        oldest_hour = (now - timedelta(hours=RETAIN_ERROR_HOURS)).strftime("%Y-%m-%dT%H")
+        heartbeat["errors"] = {h: v for h, v in heartbeat.get("errors", {}).items() if h > oldest_hour}
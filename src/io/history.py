@@ -0,0 +1,482 @@
+"""Columnar run history (Parquet, partitioned by pair/month) with optional S3 sync."""
+
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from src.analysis.gates import REASON_ATR, REASON_BUILD_UP, REASON_NEWS, REASON_SPREAD
+from src.utils.config import config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# One row per analysis run (pair/month are partition keys, not file columns)
+RUN_SCHEMA = pa.schema([
+    ("run_id", pa.string()),
+    ("date", pa.string()),
+    ("timestamp", pa.timestamp("ms", tz="UTC")),
+    ("minute_jst", pa.int16()),
+    ("timeframe", pa.string()),
+    ("data_source", pa.string()),
+    ("status", pa.string()),
+    ("analysis_mode", pa.string()),
+    ("setup", pa.string()),
+    ("hypothetical_setup", pa.string()),
+    ("confidence", pa.string()),
+    ("confluence_count", pa.int16()),
+    ("ev_r", pa.float64()),
+    ("current_price", pa.float64()),
+    ("ema25", pa.float64()),
+    ("ema25_slope_deg", pa.float64()),
+    ("atr20", pa.float64()),
+    ("spread", pa.float64()),
+    ("buildup_width_pips", pa.float64()),
+    ("buildup_bars", pa.int16()),
+    ("buildup_ema_inside", pa.bool_()),
+    ("atr_ok", pa.bool_()),
+    ("spread_ok", pa.bool_()),
+    ("news_window_ok", pa.bool_()),
+    ("build_up_ok", pa.bool_()),
+    ("reasons", pa.uint8()),
+    ("no_trade_reasons", pa.list_(pa.string())),
+    ("plan_entry", pa.string()),
+    ("tp_pips", pa.float64()),
+    ("sl_pips", pa.float64()),
+    ("timeout_min", pa.int16()),
+    ("r_multiple", pa.float64()),
+    ("advice_flags", pa.int16()),
+    ("error", pa.string()),
+])
+
+# One row per evaluated trade; several rows per run_id keep the latest
+OUTCOME_SCHEMA = pa.schema([
+    ("run_id", pa.string()),
+    ("date", pa.string()),
+    ("evaluated_at", pa.timestamp("ms", tz="UTC")),
+    ("result", pa.string()),
+    ("pnl_pips", pa.float64()),
+    ("r_multiple", pa.float64()),
+])
+
+# Month partitions keep compacted files large: reading one file per day
+# made multi-month scans dominated by per-file overhead
+PARTITIONING = ds.partitioning(pa.schema([("pair", pa.string()), ("month", pa.string())]), flavor="hive")
+
+DateLike = Union[str, date, datetime]
+
+
+def flatten_run(analysis: Dict) -> Dict:
+    """
+    Flatten an analysis result into a ``RUN_SCHEMA`` row.
+
+    Args:
+        analysis: Result of ``FXAnalyzerV2.analyze`` (possibly marked failed)
+
+    Returns:
+        Row dictionary (missing values are None)
+    """
+    indicators = analysis.get("indicators") or {}
+    build_up = indicators.get("build_up") or {}
+    filters = analysis.get("filters") or {}
+    plan = analysis.get("plan") or {}
+    risk = analysis.get("risk") or {}
+    timestamp = pd.Timestamp(analysis["timestamp_jst"])
+
+    reasons = None
+    if filters:
+        reasons = (
+            (0 if filters.get("atr_ok", True) else REASON_ATR)
+            | (0 if filters.get("spread_ok", True) else REASON_SPREAD)
+            | (0 if filters.get("news_window_ok", True) else REASON_NEWS)
+            | (0 if filters.get("build_up_ok", True) else REASON_BUILD_UP)
+        )
+
+    return {
+        "run_id": analysis.get("run_id"),
+        "date": timestamp.date().isoformat(),
+        "timestamp": timestamp.to_pydatetime(),
+        "minute_jst": timestamp.hour * 60 + timestamp.minute,
+        "timeframe": analysis.get("timeframe"),
+        "data_source": analysis.get("data_source"),
+        "status": analysis.get("status"),
+        "analysis_mode": analysis.get("analysis_mode"),
+        "setup": analysis.get("setup"),
+        "hypothetical_setup": analysis.get("hypothetical_setup"),
+        "confidence": analysis.get("confidence"),
+        "confluence_count": analysis.get("confluence_count"),
+        "ev_r": analysis.get("ev_R"),
+        "current_price": indicators.get("current_price"),
+        "ema25": indicators.get("ema25"),
+        "ema25_slope_deg": indicators.get("ema25_slope_deg"),
+        "atr20": indicators.get("atr20"),
+        "spread": indicators.get("spread"),
+        "buildup_width_pips": build_up.get("width_pips"),
+        "buildup_bars": build_up.get("bars"),
+        "buildup_ema_inside": build_up.get("ema_inside"),
+        "atr_ok": filters.get("atr_ok"),
+        "spread_ok": filters.get("spread_ok"),
+        "news_window_ok": filters.get("news_window_ok"),
+        "build_up_ok": filters.get("build_up_ok"),
+        "reasons": reasons,
+        "no_trade_reasons": list(analysis.get("no_trade_reasons") or []),
+        "plan_entry": plan.get("entry"),
+        "tp_pips": plan.get("tp_pips"),
+        "sl_pips": plan.get("sl_pips"),
+        "timeout_min": plan.get("timeout_min"),
+        "r_multiple": risk.get("r_multiple"),
+        "advice_flags": len(analysis.get("advice_flags") or []),
+        "error": analysis.get("error"),
+    }
+
+
+def _as_date(value: Optional[DateLike]) -> Optional[str]:
+    """Normalize a date bound to the ``date`` column format (YYYY-MM-DD)."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return pd.Timestamp(value).date().isoformat()
+
+
+class RunHistoryStore:
+    """
+    Append-only history of analysis runs and trade outcomes.
+
+    Two hive-partitioned Parquet datasets live under the root:
+    ``runs/pair={pair}/month={YYYY-MM}/`` (one row per run, see
+    ``RUN_SCHEMA``) and ``outcomes/...`` (one row per evaluated trade, see
+    ``OUTCOME_SCHEMA``). Every append writes a small immutable segment named
+    ``{epoch_ms}-{run_id}.parquet``; partitions are merged once they hold
+    more than ``COMPACT_THRESHOLD`` segments. Queries prune partitions by
+    pair/month, filter rows on the JST ``date`` column and read only the
+    requested columns.
+    """
+
+    COMPACT_THRESHOLD = 48
+    DATASETS = {"runs": RUN_SCHEMA, "outcomes": OUTCOME_SCHEMA}
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        s3_sync: Optional[bool] = None,
+        bucket: Optional[str] = None
+    ):
+        """Initialize run history store."""
+        self.root = Path(root or config.history_dir)
+        self.s3_sync = config.history_s3_sync if s3_sync is None else s3_sync
+        self.bucket = bucket or config.s3_bucket
+        self.s3 = None
+        self._synced = set()
+
+        if self.s3_sync:
+            if not self.bucket:
+                logger.warning("Run history S3 sync requested but S3_BUCKET is not set")
+                self.s3_sync = False
+            else:
+                import boto3
+                self.s3 = boto3.client('s3', region_name=config.aws_region)
+
+    def _partition(self, dataset: str, pair: str, month: str) -> str:
+        """Partition path relative to the root (also the S3 key suffix)."""
+        return f"{dataset}/pair={pair}/month={month}"
+
+    def _s3_key(self, relative: str) -> str:
+        """S3 key of a file relative to the root."""
+        return f"{config.history_s3_prefix}/{relative}"
+
+    def append_run(self, analysis: Dict) -> bool:
+        """
+        Append one analysis run.
+
+        Args:
+            analysis: Analysis result with ``run_id``, ``pair`` and ``timestamp_jst``
+
+        Returns:
+            True if a row was written
+        """
+        if not analysis.get("timestamp_jst") or not analysis.get("pair"):
+            return False
+
+        row = flatten_run(analysis)
+        self._write("runs", analysis["pair"], row["date"][:7], [row], row["timestamp"], row["run_id"])
+        return True
+
+    def append_outcomes(self, pair: str, outcomes: Sequence[Dict]) -> int:
+        """
+        Append evaluated trade outcomes.
+
+        Args:
+            pair: Trading pair (e.g., "USDJPY")
+            outcomes: Dicts with ``run_id``, ``entry_time`` (sets ``date``),
+                ``result``, ``pnl_pips`` and ``r_multiple``
+
+        Returns:
+            Number of rows written
+        """
+        evaluated_at = datetime.now().astimezone()
+        by_month: Dict[str, List[Dict]] = {}
+        for outcome in outcomes:
+            day = pd.Timestamp(outcome["entry_time"]).tz_convert(config.tz).date().isoformat()
+            by_month.setdefault(day[:7], []).append({
+                "run_id": outcome["run_id"],
+                "date": day,
+                "evaluated_at": evaluated_at,
+                "result": outcome["result"],
+                "pnl_pips": outcome.get("pnl_pips"),
+                "r_multiple": outcome.get("r_multiple"),
+            })
+
+        for month, rows in by_month.items():
+            self._write("outcomes", pair, month, rows, evaluated_at, rows[0]["run_id"])
+        return sum(len(rows) for rows in by_month.values())
+
+    def _write(
+        self,
+        dataset: str,
+        pair: str,
+        month: str,
+        rows: List[Dict],
+        stamp: datetime,
+        suffix: str
+    ) -> None:
+        """Write rows as a new segment of one partition."""
+        # Pull the partition's remote segments first, so a one-shot task sees
+        # them when deciding whether to compact
+        self._sync_from_s3(dataset, pair, month)
+        relative = self._partition(dataset, pair, month)
+        partition_dir = self.root / relative
+        partition_dir.mkdir(parents=True, exist_ok=True)
+
+        name = f"{int(stamp.timestamp() * 1000):013d}-{suffix}.parquet"
+        table = pa.Table.from_pylist(rows, schema=self.DATASETS[dataset])
+        pq.write_table(table, partition_dir / name, compression="zstd")
+
+        if self.s3_sync:
+            self._upload(f"{relative}/{name}")
+
+        logger.info("Appended to run history", dataset=dataset, pair=pair, month=month, rows=len(rows))
+
+        if len(list(partition_dir.glob("*.parquet"))) > self.COMPACT_THRESHOLD:
+            self.compact(dataset, pair, month)
+
+    def compact(self, dataset: str, pair: str, month: str) -> None:
+        """Merge all segments of one partition into a single segment."""
+        relative = self._partition(dataset, pair, month)
+        partition_dir = self.root / relative
+        segments = sorted(partition_dir.glob("*.parquet"))
+        if len(segments) <= 1:
+            return
+
+        table = pa.concat_tables([pq.read_table(path, schema=self.DATASETS[dataset]) for path in segments])
+        # Keep the name sortable after the segments it replaces
+        path = partition_dir / f"{segments[-1].name.split('-')[0]}-compacted.parquet"
+        pq.write_table(table, path, compression="zstd")
+
+        if self.s3_sync:
+            self._upload(f"{relative}/{path.name}")
+
+        for segment in segments:
+            if segment == path:
+                continue
+            segment.unlink()
+            if self.s3_sync:
+                try:
+                    self.s3.delete_object(Bucket=self.bucket, Key=self._s3_key(f"{relative}/{segment.name}"))
+                except Exception as e:
+                    logger.warning(f"Failed to delete compacted history segment from S3: {e}")
+
+        logger.info("Compacted run history", dataset=dataset, pair=pair, month=month, rows=table.num_rows)
+
+    def read_runs(
+        self,
+        pair: Optional[str] = None,
+        start: Optional[DateLike] = None,
+        end: Optional[DateLike] = None,
+        columns: Optional[Iterable[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Read runs, pruning partitions by pair and JST date.
+
+        Args:
+            pair: Only this pair (all pairs when omitted)
+            start: First date, inclusive
+            end: Last date, inclusive
+            columns: Columns to read (all when omitted); the ``pair``
+                partition column may be requested too
+
+        Returns:
+            DataFrame of runs ordered by timestamp
+        """
+        df = self._read("runs", pair, start, end, columns)
+        if "timestamp" in df.columns:
+            df = df.sort_values("timestamp", kind="stable").reset_index(drop=True)
+        return df
+
+    def read_outcomes(
+        self,
+        pair: Optional[str] = None,
+        start: Optional[DateLike] = None,
+        end: Optional[DateLike] = None
+    ) -> pd.DataFrame:
+        """
+        Read the latest outcome of each evaluated run.
+
+        Args:
+            pair: Only this pair (all pairs when omitted)
+            start: First entry date, inclusive
+            end: Last entry date, inclusive
+
+        Returns:
+            DataFrame with one row per run_id
+        """
+        df = self._read("outcomes", pair, start, end, None)
+        if df.empty:
+            return df
+        return (
+            df.sort_values("evaluated_at", kind="stable")
+            .drop_duplicates("run_id", keep="last")
+            .reset_index(drop=True)
+        )
+
+    def read_runs_with_outcomes(
+        self,
+        pair: Optional[str] = None,
+        start: Optional[DateLike] = None,
+        end: Optional[DateLike] = None,
+        columns: Optional[Iterable[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Read runs joined with their latest outcome (``result`` is NaN until evaluated).
+
+        Args:
+            pair: Only this pair (all pairs when omitted)
+            start: First date, inclusive
+            end: Last date, inclusive
+            columns: Run columns to read (``run_id`` is always included)
+
+        Returns:
+            DataFrame of runs with ``result``, ``pnl_pips`` and ``outcome_r`` columns
+        """
+        if columns is not None:
+            columns = ["run_id"] + [c for c in columns if c != "run_id"]
+        runs = self.read_runs(pair, start, end, columns)
+        outcomes = self.read_outcomes(pair, start, end)
+        if outcomes.empty:
+            return runs.assign(result=None, pnl_pips=float("nan"), outcome_r=float("nan"))
+
+        outcomes = outcomes[["run_id", "result", "pnl_pips", "r_multiple"]].rename(columns={"r_multiple": "outcome_r"})
+        return runs.merge(outcomes, on="run_id", how="left")
+
+    def _read(
+        self,
+        dataset: str,
+        pair: Optional[str],
+        start: Optional[DateLike],
+        end: Optional[DateLike],
+        columns: Optional[Iterable[str]]
+    ) -> pd.DataFrame:
+        """Scan a dataset with partition filters and column projection."""
+        schema = self.DATASETS[dataset]
+        columns = list(columns) if columns is not None else None
+        self._sync_from_s3(dataset, pair)
+
+        base = self.root / dataset
+        if not base.exists() or not any(base.rglob("*.parquet")):
+            names = columns or schema.names
+            return pd.DataFrame(columns=names)
+
+        full_schema = pa.unify_schemas([schema, PARTITIONING.schema])
+        dataset_ = ds.dataset(base, schema=full_schema, format="parquet", partitioning=PARTITIONING)
+
+        expression = None
+        for condition in (
+            ds.field("pair") == pair if pair else None,
+            ds.field("month") >= _as_date(start)[:7] if start is not None else None,
+            ds.field("month") <= _as_date(end)[:7] if end is not None else None,
+            ds.field("date") >= _as_date(start) if start is not None else None,
+            ds.field("date") <= _as_date(end) if end is not None else None,
+        ):
+            if condition is not None:
+                expression = condition if expression is None else expression & condition
+
+        table = dataset_.to_table(columns=columns, filter=expression)
+        return table.to_pandas()
+
+    def _sync_from_s3(self, dataset: str, pair: Optional[str], month: Optional[str] = None) -> None:
+        """Download segments missing locally (once per dataset/pair/month per process)."""
+        if not self.s3_sync or any(
+            scope in self._synced for scope in ((dataset, pair, month), (dataset, pair, None), (dataset, None, None))
+        ):
+            return
+        self._synced.add((dataset, pair, month))
+
+        if month:
+            relative = f"{self._partition(dataset, pair, month)}/"
+        else:
+            relative = f"{dataset}/pair={pair}/" if pair else f"{dataset}/"
+        prefix = self._s3_key(relative)
+        root_prefix = self._s3_key("")
+
+        try:
+            paginator = self.s3.get_paginator('list_objects_v2')
+            remote = set()
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+                for obj in page.get("Contents", []):
+                    remote.add(obj["Key"][len(root_prefix):])
+
+            missing = [name for name in remote if not (self.root / name).exists()]
+            for name in missing:
+                path = self.root / name
+                path.parent.mkdir(parents=True, exist_ok=True)
+                self.s3.download_file(self.bucket, self._s3_key(name), str(path))
+
+            # Newest remote compaction per partition: compacted segments are
+            # named after the last segment they merged
+            compacted: Dict[str, int] = {}
+            for name in remote:
+                partition, _, filename = name.rpartition("/")
+                if filename.endswith("-compacted.parquet"):
+                    stamp = int(filename.split("-")[0])
+                    compacted[partition] = max(compacted.get(partition, stamp), stamp)
+
+            # Local segments missing remotely were either compacted away by
+            # another task (drop them) or never uploaded (upload them now)
+            dropped = uploaded = 0
+            local_dir = self.root / relative
+            if local_dir.exists():
+                for path in sorted(local_dir.rglob("*.parquet")):
+                    name = path.relative_to(self.root).as_posix()
+                    if name in remote:
+                        continue
+                    partition = name.rsplit("/", 1)[0]
+                    if int(path.name.split("-")[0]) <= compacted.get(partition, -1):
+                        path.unlink()
+                        dropped += 1
+                    else:
+                        self._upload(name)
+                        uploaded += 1
+
+            logger.info(
+                "Synced run history from S3",
+                dataset=dataset,
+                pair=pair,
+                month=month,
+                downloaded=len(missing),
+                dropped=dropped,
+                uploaded=uploaded
+            )
+        except Exception as e:
+            logger.warning(f"Run history S3 sync failed, using local segments only: {e}")
+
+    def _upload(self, relative: str) -> None:
+        """Upload one segment to S3."""
+        try:
+            self.s3.upload_file(str(self.root / relative), self.bucket, self._s3_key(relative))
+        except Exception as e:
+            logger.warning(f"Failed to upload run history segment to S3: {e}")
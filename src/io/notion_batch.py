@@ -0,0 +1,216 @@
+"""Rate-limited bulk Notion I/O (paginated queries and concurrent updates)."""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+from notion_client import Client
+
+from src.utils.config import config
+from src.utils.logger import get_logger
+from src.utils.metrics import in_context, increment
+from src.utils.rate_limit import TokenBucket
+
+logger = get_logger(__name__)
+
+# Statuses worth retrying: throttling and transient server errors
+RETRYABLE_STATUSES = {409, 429, 500, 502, 503, 504}
+
+
+class NotionBatchIO:
+    """
+    Bulk Notion access shared by a pool of worker threads.
+
+    Every request draws from one token bucket sized to Notion's ~3 req/s
+    limit. Throttled requests halve the bucket rate and honor Retry-After;
+    each success then restores the rate step by step (AIMD).
+    """
+
+    MAX_RETRIES = 5
+    BASE_BACKOFF = 0.5
+    MAX_BACKOFF = 30.0
+
+    def __init__(
+        self,
+        client: Optional[Client] = None,
+        requests_per_second: Optional[float] = None,
+        max_workers: Optional[int] = None
+    ):
+        """
+        Initialize bulk Notion I/O.
+
+        Args:
+            client: Notion client (created from config if omitted)
+            requests_per_second: Target request rate (defaults to config)
+            max_workers: Concurrent update workers (defaults to config)
+        """
+        self.client = client or Client(auth=config.notion_api_key)
+        self.target_rate = requests_per_second or config.notion_requests_per_second
+        self.min_rate = self.target_rate / 8
+        self.max_workers = max_workers or config.notion_workers
+        self.limiter = TokenBucket(rate=self.target_rate, period=1.0, capacity=max(1.0, self.target_rate))
+        self._rate_lock = threading.Lock()
+
+    def _adjust_rate(self, throttled: bool) -> None:
+        """Halve the rate on throttling; otherwise creep back to the target."""
+        with self._rate_lock:
+            if throttled:
+                rate = max(self.min_rate, self.limiter.rate / 2)
+            else:
+                rate = min(self.target_rate, self.limiter.rate + self.target_rate / 10)
+            if rate != self.limiter.rate:
+                self.limiter.set_rate(rate)
+                if throttled:
+                    logger.warning("Notion throttled, reducing request rate", rate=round(rate, 2))
+
+    def _call(self, fn: Callable, **kwargs) -> Dict:
+        """Issue one rate-limited request, retrying transient failures."""
+        for attempt in range(self.MAX_RETRIES + 1):
+            self.limiter.acquire()
+            try:
+                response = fn(**kwargs)
+                self._adjust_rate(throttled=False)
+                return response
+            except Exception as e:
+                status = getattr(e, "status", None)
+                timed_out = "timeout" in type(e).__name__.lower()
+                if attempt == self.MAX_RETRIES or not (status in RETRYABLE_STATUSES or timed_out):
+                    raise
+
+                delay = min(self.MAX_BACKOFF, self.BASE_BACKOFF * 2 ** attempt) * random.uniform(0.5, 1.0)
+                if status == 429:
+                    self._adjust_rate(throttled=True)
+                    headers = getattr(e, "headers", None) or {}
+                    retry_after = headers.get("retry-after") or headers.get("Retry-After")
+                    if retry_after:
+                        try:
+                            delay = max(delay, float(retry_after))
+                        except ValueError:
+                            pass
+
+                increment("notion_retries")
+                logger.warning(
+                    "Retrying Notion request",
+                    status=status,
+                    attempt=attempt + 1,
+                    delay_s=round(delay, 2)
+                )
+                time.sleep(delay)
+
+    def query_all(self, database_id: str, filter: Optional[Dict] = None, sorts: Optional[List] = None) -> List[Dict]:
+        """
+        Query a database, following ``next_cursor`` until ``has_more`` is false.
+
+        Args:
+            database_id: Notion database ID
+            filter: Notion filter object
+            sorts: Notion sort objects
+
+        Returns:
+            All matching pages
+        """
+        params = {"database_id": database_id, "page_size": 100}
+        if filter:
+            params["filter"] = filter
+        if sorts:
+            params["sorts"] = sorts
+
+        results = []
+        requests = 0
+        while True:
+            response = self._call(self.client.databases.query, **params)
+            requests += 1
+            results.extend(response.get("results", []))
+            if not response.get("has_more") or not response.get("next_cursor"):
+                break
+            params["start_cursor"] = response["next_cursor"]
+
+        logger.info("Queried Notion database", pages=len(results), requests=requests)
+        return results
+
+    def query_date_range(
+        self,
+        database_id: str,
+        start: date,
+        end: date,
+        date_property: str = "Date",
+        chunk_days: int = 7
+    ) -> List[Dict]:
+        """
+        Export a date range by querying fixed-size date windows concurrently.
+
+        Cursor pagination is sequential, so the range is split into windows
+        that each paginate on their own worker; all requests still share the
+        token bucket.
+
+        Args:
+            database_id: Notion database ID
+            start: First date, inclusive
+            end: Last date, inclusive
+            date_property: Date property to split on
+            chunk_days: Days per window
+
+        Returns:
+            All matching pages, oldest window first
+        """
+        windows = []
+        window_start = start
+        while window_start <= end:
+            window_end = min(end, window_start + timedelta(days=chunk_days - 1))
+            windows.append((window_start, window_end))
+            window_start = window_end + timedelta(days=1)
+
+        def query(window: Tuple[date, date]) -> List[Dict]:
+            return self.query_all(database_id, filter={"and": [
+                {"property": date_property, "date": {"on_or_after": window[0].isoformat()}},
+                {"property": date_property, "date": {"on_or_before": window[1].isoformat()}},
+            ]})
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(windows)))) as executor:
+            chunks = list(executor.map(in_context(query), windows))
+
+        results = [page for chunk in chunks for page in chunk]
+        logger.info(
+            "Exported Notion date range",
+            pages=len(results),
+            windows=len(windows),
+            duration_ms=int((time.monotonic() - started) * 1000)
+        )
+        return results
+
+    def update_pages(self, updates: List[Tuple[str, Dict]]) -> Dict[str, Optional[str]]:
+        """
+        Apply property updates across a bounded worker pool.
+
+        Args:
+            updates: (page_id, properties) pairs
+
+        Returns:
+            Dict mapping page_id to None on success or the error message
+        """
+        if not updates:
+            return {}
+
+        def update(item: Tuple[str, Dict]) -> Tuple[str, Optional[str]]:
+            page_id, properties = item
+            try:
+                self._call(self.client.pages.update, page_id=page_id, properties=properties)
+                return page_id, None
+            except Exception as e:
+                logger.error(f"Failed to update page {page_id}: {e}")
+                return page_id, str(e)
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(updates)))) as executor:
+            outcome = dict(executor.map(in_context(update), updates))
+
+        logger.info(
+            "Updated Notion pages",
+            pages=len(updates),
+            failed=sum(1 for error in outcome.values() if error),
+            duration_ms=int((time.monotonic() - started) * 1000)
+        )
+        return outcome
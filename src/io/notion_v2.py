@@ -11,6 +11,9 @@ from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Image shown in place of a chart that is not available
+CHART_PLACEHOLDER_URL = "https://via.placeholder.com/1200x600/1a1a1a/808080?text={timeframe}+Chart+Not+Available"
+
 
 class NotionClientV2:
     """Enhanced Notion client with extended properties and structured content."""
@@ -73,6 +76,39 @@ class NotionClientV2:
             logger.error(f"Failed to create Notion page: {e}")
             raise
     
+    def replace_chart_images(self, page_id: str, chart_urls: Dict[str, str]) -> int:
+        """
+        Point chart images of a page at the placeholder (e.g., after their upload failed).
+        
+        Args:
+            page_id: Notion page ID
+            chart_urls: Dict mapping timeframe to the image URL to replace
+            
+        Returns:
+            Number of image blocks replaced
+        """
+        timeframes = {url: timeframe for timeframe, url in chart_urls.items()}
+        replaced = 0
+        params = {"block_id": page_id, "page_size": 100}
+        while True:
+            response = self.client.blocks.children.list(**params)
+            for block in response.get("results", []):
+                if block.get("type") != "image":
+                    continue
+                url = block["image"].get("external", {}).get("url")
+                if url in timeframes:
+                    self.client.blocks.update(
+                        block_id=block["id"],
+                        image={"external": {"url": CHART_PLACEHOLDER_URL.format(timeframe=timeframes[url])}}
+                    )
+                    replaced += 1
+            if not response.get("has_more") or not response.get("next_cursor"):
+                break
+            params["start_cursor"] = response["next_cursor"]
+        
+        logger.info("Replaced unavailable chart images", page_id=page_id, replaced=replaced)
+        return replaced
+    
     def _build_properties(self, analysis: Dict) -> Dict:
         """Build Notion page properties from analysis."""
         setup = analysis.get("setup", "No-Trade")
@@ -360,7 +396,7 @@ class NotionClientV2:
         chart_5m_url = chart_urls.get("5m") if chart_urls else None
         if not chart_5m_url:
             # Use placeholder if no chart available
-            chart_5m_url = "https://via.placeholder.com/1200x600/1a1a1a/808080?text=5m+Chart+Not+Available"
+            chart_5m_url = CHART_PLACEHOLDER_URL.format(timeframe="5m")
         
         blocks.append({
             "object": "block",
@@ -381,7 +417,7 @@ class NotionClientV2:
         chart_1h_url = chart_urls.get("1h") if chart_urls else None
         if not chart_1h_url:
             # Use placeholder if no chart available
-            chart_1h_url = "https://via.placeholder.com/1200x600/1a1a1a/808080?text=1h+Chart+Not+Available"
+            chart_1h_url = CHART_PLACEHOLDER_URL.format(timeframe="1h")
         
         blocks.append({
             "object": "block",
@@ -1,13 +1,19 @@
 """S3 storage operations."""
 
+import io
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from src.utils.config import config
 from src.utils.logger import get_logger
+from src.utils.metrics import in_context, increment
 
 logger = get_logger(__name__)
 
@@ -22,25 +28,135 @@ class S3Client:
         if not self.bucket:
             raise ValueError("S3_BUCKET is required")
         
-        self.s3 = boto3.client('s3', region_name=self.region)
+        self.upload_workers = max(1, config.s3_upload_workers)
+        self.multipart_threshold = config.s3_multipart_threshold_mb * 1024 * 1024
         
+        # Connections for concurrent uploads plus the parts of multipart ones
+        self.s3 = boto3.client(
+            's3',
+            region_name=self.region,
+            config=Config(max_pool_connections=max(10, self.upload_workers * 2))
+        )
+        self.transfer_config = TransferConfig(
+            multipart_threshold=self.multipart_threshold,
+            multipart_chunksize=self.multipart_threshold,
+            max_concurrency=self.upload_workers
+        )
+        
+    @staticmethod
+    def chart_key(pair: str, run_id: str, timeframe: str, date: datetime) -> str:
+        """Build chart key: charts/{pair}/{yyyy-mm-dd}/{run_id}_{timeframe}.png"""
+        return f"{config.s3_prefix}/{pair}/{date.strftime('%Y-%m-%d')}/{run_id}_{timeframe}.png"
+    
+    @staticmethod
+    def json_key(pair: str, run_id: str, date: datetime) -> str:
+        """Build analysis JSON key: charts/{pair}/{yyyy-mm-dd}/{run_id}_analysis.json"""
+        return f"{config.s3_prefix}/{pair}/{date.strftime('%Y-%m-%d')}/{run_id}_analysis.json"
+    
+    @staticmethod
+    def profile_key(pair: str, run_id: str, suffix: str, date: datetime) -> str:
+        """Build profile key: charts/{pair}/{yyyy-mm-dd}/{run_id}_profile.{suffix}"""
+        return f"{config.s3_prefix}/{pair}/{date.strftime('%Y-%m-%d')}/{run_id}_profile.{suffix}"
+    
+    @staticmethod
+    def chart_entries(chart_info: Dict[str, Dict[str, str]]) -> List[Dict]:
+        """
+        Build the schema's ``charts`` array from {timeframe: {key, url}}.
+        
+        Args:
+            chart_info: Chart keys and pre-signed URLs per timeframe
+            
+        Returns:
+            List of chart objects as stored in the analysis JSON
+        """
+        return [
+            {
+                "timeframe": timeframe,
+                "s3_key": info.get("key", ""),
+                "s3_presigned_url": info.get("url", ""),
+                "width_px": 1200,
+                "height_px": 600
+            }
+            for timeframe, info in chart_info.items()
+        ]
+    
+    @staticmethod
+    def cache_key(content_hash: str) -> str:
+        """Build render cache key: charts/_cache/{content_hash}.png"""
+        return f"{config.s3_prefix}/_cache/{content_hash}.png"
+    
+    def get_cached_chart(self, content_hash: str) -> Optional[bytes]:
+        """
+        Fetch a chart from the render cache.
+        
+        Args:
+            content_hash: Hash of the chart's render inputs
+            
+        Returns:
+            PNG bytes, or None when the chart is not cached
+        """
+        try:
+            response = self.s3.get_object(Bucket=self.bucket, Key=self.cache_key(content_hash))
+            return response['Body'].read()
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') not in ('NoSuchKey', '404'):
+                logger.warning(f"Failed to read chart cache", error=str(e), content_hash=content_hash)
+            return None
+    
+    def _put_bytes(self, key: str, body: bytes, content_type: str, metadata: Dict[str, str]) -> str:
+        """
+        Store bytes under a key, in parts when they exceed the multipart threshold.
+        
+        Returns:
+            "put" or "multipart"
+        """
+        if len(body) < self.multipart_threshold:
+            response = self.s3.put_object(
+                Bucket=self.bucket,
+                Key=key,
+                Body=body,
+                ContentType=content_type,
+                Metadata=metadata
+            )
+            # botocore retries throttling/5xx internally
+            increment("s3_retries", response.get('ResponseMetadata', {}).get('RetryAttempts', 0))
+            return "put"
+        
+        self.s3.upload_fileobj(
+            io.BytesIO(body),
+            self.bucket,
+            key,
+            ExtraArgs={'ContentType': content_type, 'Metadata': metadata},
+            Config=self.transfer_config
+        )
+        return "multipart"
+    
     def upload_chart(
         self,
         chart_bytes: bytes,
         pair: str,
         run_id: str,
         timeframe: str,
-        date: Optional[datetime] = None
+        date: Optional[datetime] = None,
+        content_hash: Optional[str] = None,
+        cached: bool = False
     ) -> str:
         """
         Upload chart to S3 and return key.
         
+        With a ``content_hash``, a chart served from the render cache
+        (``cached``) is copied server-side instead of uploaded, and a newly
+        rendered chart is uploaded and added to the cache.
+        
         Args:
             chart_bytes: PNG image bytes
             pair: Trading pair
             run_id: Unique run ID
             timeframe: Timeframe (e.g., "5m", "1h")
             date: Date for organization (defaults to today)
+            content_hash: Hash of the chart's render inputs (see ChartGenerator.content_hash)
+            cached: The chart came from the render cache, so the cache object
+                likely exists (a fresh render skips the copy attempt)
             
         Returns:
             S3 object key
@@ -48,28 +164,52 @@ class S3Client:
         if date is None:
             date = datetime.now()
         
-        # Build S3 key: charts/{pair}/{yyyy-mm-dd}/{run_id}_{timeframe}.png
-        date_str = date.strftime("%Y-%m-%d")
-        key = f"{config.s3_prefix}/{pair}/{date_str}/{run_id}_{timeframe}.png"
+        key = self.chart_key(pair, run_id, timeframe, date)
+        metadata = {
+            'pair': pair,
+            'timeframe': timeframe,
+            'run_id': run_id
+        }
+        if content_hash:
+            metadata['content_hash'] = content_hash
+        if content_hash and cached:
+            if self._copy_object(self.cache_key(content_hash), key, metadata):
+                logger.info(f"Copied cached chart in S3", key=key, content_hash=content_hash)
+                return key
         
         try:
-            self.s3.put_object(
-                Bucket=self.bucket,
-                Key=key,
-                Body=chart_bytes,
-                ContentType='image/png',
-                Metadata={
-                    'pair': pair,
-                    'timeframe': timeframe,
-                    'run_id': run_id
-                }
-            )
+            self._put_bytes(key, chart_bytes, 'image/png', metadata)
             logger.info(f"Uploaded chart to S3", key=key, size=len(chart_bytes))
-            return key
             
         except ClientError as e:
             logger.error(f"Failed to upload chart to S3", error=str(e), key=key)
             raise
+        
+        if content_hash:
+            self._copy_object(key, self.cache_key(content_hash), metadata)
+        return key
+    
+    def _copy_object(self, source_key: str, key: str, metadata: Dict[str, str]) -> bool:
+        """
+        Copy an object within the bucket.
+        
+        Returns:
+            False when the source does not exist or the copy failed
+        """
+        try:
+            self.s3.copy_object(
+                Bucket=self.bucket,
+                Key=key,
+                CopySource={'Bucket': self.bucket, 'Key': source_key},
+                ContentType='image/png',
+                Metadata=metadata,
+                MetadataDirective='REPLACE'
+            )
+            return True
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') not in ('NoSuchKey', '404'):
+                logger.warning(f"Failed to copy object in S3", error=str(e), source=source_key, key=key)
+            return False
     
     def upload_json(
         self,
@@ -93,20 +233,17 @@ class S3Client:
         if date is None:
             date = datetime.now()
         
-        # Build S3 key
-        date_str = date.strftime("%Y-%m-%d")
-        key = f"{config.s3_prefix}/{pair}/{date_str}/{run_id}_analysis.json"
+        key = self.json_key(pair, run_id, date)
         
         # Convert to JSON
         json_str = json.dumps(data, indent=2, default=str)
         
         try:
-            self.s3.put_object(
-                Bucket=self.bucket,
-                Key=key,
-                Body=json_str.encode('utf-8'),
-                ContentType='application/json',
-                Metadata={
+            self._put_bytes(
+                key,
+                json_str.encode('utf-8'),
+                'application/json',
+                {
                     'pair': pair,
                     'run_id': run_id
                 }
@@ -118,6 +255,35 @@ class S3Client:
             logger.error(f"Failed to upload JSON to S3", error=str(e), key=key)
             raise
     
+    def upload_profile(
+        self,
+        artifacts: Dict[str, Tuple[bytes, str]],
+        pair: str,
+        run_id: str,
+        date: Optional[datetime] = None
+    ) -> Dict[str, str]:
+        """
+        Upload profiler outputs next to the run's charts and JSON.
+        
+        Args:
+            artifacts: Dict of file suffix to (body, content type)
+            pair: Trading pair
+            run_id: Unique run ID
+            date: Date for organization
+        
+        Returns:
+            Dict of suffix to S3 object key
+        """
+        date = date or datetime.now()
+        keys = {}
+        for suffix, (body, content_type) in artifacts.items():
+            key = self.profile_key(pair, run_id, suffix, date)
+            self._put_bytes(key, body, content_type, {'pair': pair, 'run_id': run_id})
+            keys[suffix] = key
+        
+        logger.info("Uploaded run profile", run_id=run_id, keys=list(keys.values()))
+        return keys
+    
     def generate_presigned_url(
         self,
         key: str,
@@ -146,64 +312,137 @@ class S3Client:
             logger.error(f"Failed to generate pre-signed URL", error=str(e), key=key)
             raise
     
+    def plan_analysis_artifacts(
+        self,
+        run_id: str,
+        timeframes: List[str],
+        pair: Optional[str] = None,
+        date: Optional[datetime] = None
+    ) -> Dict:
+        """
+        Compute artifact keys and pre-signed URLs before uploading.
+        
+        Keys are deterministic and pre-signing is a local signature, so the
+        URLs can be handed to other sinks while the uploads are in flight.
+        
+        Args:
+            run_id: Unique run ID
+            timeframes: Chart timeframes
+            pair: Trading pair (defaults to config)
+            date: Date for organization (defaults to today)
+            
+        Returns:
+            Dict shaped like ``upload_analysis_artifacts`` results
+        """
+        pair = pair or config.pair
+        date = date or datetime.now()
+        
+        charts = {}
+        for timeframe in timeframes:
+            key = self.chart_key(pair, run_id, timeframe, date)
+            charts[timeframe] = {"key": key, "url": self.generate_presigned_url(key, expiration=3600)}
+        
+        json_key = self.json_key(pair, run_id, date)
+        return {
+            "charts": charts,
+            "json": {"key": json_key, "url": self.generate_presigned_url(json_key, expiration=3600)}
+        }
+    
     def upload_analysis_artifacts(
         self,
         analysis: Dict,
         charts: Dict[str, bytes],
-        pair: Optional[str] = None
+        pair: Optional[str] = None,
+        date: Optional[datetime] = None,
+        content_hashes: Optional[Dict[str, str]] = None,
+        cached_timeframes: Optional[List[str]] = None
     ) -> Dict:
         """
-        Upload all analysis artifacts and return URLs.
+        Upload all analysis artifacts concurrently and return URLs.
+        
+        Keys and pre-signed URLs are computed locally first, so the charts and
+        the JSON (which lists the chart URLs) upload in one parallel pass. If
+        a chart fails, the JSON is rewritten without it.
         
         Args:
             analysis: Analysis results
             charts: Dict of timeframe to chart bytes
             pair: Trading pair (defaults to config)
+            date: Date for organization (defaults to today; pass the date
+                used by ``plan_analysis_artifacts`` to upload to those keys)
+            content_hashes: Dict of timeframe to render cache hash
+            cached_timeframes: Timeframes whose charts came from the render cache
             
         Returns:
-            Dict with uploaded keys and pre-signed URLs
+            Dict with uploaded keys and pre-signed URLs, plus ``latency_ms``
+            per object key
         """
         pair = pair or config.pair
         run_id = analysis.get("run_id", "unknown")
-        date = datetime.now()
+        date = date or datetime.now()
+        content_hashes = content_hashes or {}
+        cached_timeframes = set(cached_timeframes or ())
+        started = time.perf_counter()
         
+        plan = self.plan_analysis_artifacts(run_id, list(charts), pair=pair, date=date)
         results = {
             "charts": {},
-            "json": None
+            "json": None,
+            "latency_ms": {}
         }
         
-        # Upload charts
-        for timeframe, chart_bytes in charts.items():
-            try:
-                key = self.upload_chart(chart_bytes, pair, run_id, timeframe, date)
-                url = self.generate_presigned_url(key, expiration=3600)  # 1 hour
-                results["charts"][timeframe] = {
-                    "key": key,
-                    "url": url
-                }
-            except Exception as e:
-                logger.error(f"Failed to upload {timeframe} chart", error=str(e))
-                # Continue with other uploads
-        
         # Add chart URLs to analysis
-        analysis["charts"] = results["charts"]
+        analysis["charts"] = self.chart_entries(plan["charts"])
         
-        # Upload JSON
-        try:
-            json_key = self.upload_json(analysis, pair, run_id, date)
-            json_url = self.generate_presigned_url(json_key, expiration=3600)
-            results["json"] = {
-                "key": json_key,
-                "url": json_url
+        @in_context
+        def timed(fn, *args, **kwargs):
+            upload_started = time.perf_counter()
+            key = fn(*args, **kwargs)
+            results["latency_ms"][key] = round((time.perf_counter() - upload_started) * 1000, 1)
+            return key
+        
+        with ThreadPoolExecutor(max_workers=min(self.upload_workers, len(charts) + 1)) as executor:
+            chart_futures = {
+                timeframe: executor.submit(
+                    timed, self.upload_chart,
+                    chart_bytes, pair, run_id, timeframe, date,
+                    content_hash=content_hashes.get(timeframe),
+                    cached=timeframe in cached_timeframes
+                )
+                for timeframe, chart_bytes in charts.items()
             }
-        except Exception as e:
-            logger.error(f"Failed to upload JSON", error=str(e))
+            # Snapshot: "charts" is replaced below once the outcomes are known
+            json_future = executor.submit(timed, self.upload_json, dict(analysis), pair, run_id, date)
+            
+            for timeframe, future in chart_futures.items():
+                try:
+                    future.result()
+                    results["charts"][timeframe] = plan["charts"][timeframe]
+                except Exception as e:
+                    logger.error(f"Failed to upload {timeframe} chart", error=str(e))
+                    # Continue with other uploads
+            
+            try:
+                json_future.result()
+                results["json"] = plan["json"]
+            except Exception as e:
+                logger.error(f"Failed to upload JSON", error=str(e))
+        
+        # Keep the JSON consistent with the charts that made it
+        analysis["charts"] = self.chart_entries(results["charts"])
+        if results["json"] is not None and len(results["charts"]) < len(charts):
+            try:
+                self.upload_json(analysis, pair, run_id, date)
+            except Exception as e:
+                logger.error(f"Failed to rewrite JSON", error=str(e))
         
         logger.info(
             "Uploaded analysis artifacts",
             run_id=run_id,
             charts_count=len(results["charts"]),
-            has_json=results["json"] is not None
+            has_json=results["json"] is not None,
+            duration_ms=round((time.perf_counter() - started) * 1000, 1),
+            latency_ms=results["latency_ms"]
         )
         
-        return results
\ No newline at end of file
+        return results
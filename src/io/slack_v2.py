@@ -87,13 +87,7 @@ class SlackClientV2:
             return False
         
         try:
-            # Determine which template to use
-            if analysis.get("status") == "failed":
-                payload = self._build_failure_payload(analysis)
-            elif analysis.get("setup") == "No-Trade" or analysis.get("status") == "no-trade":
-                payload = self._build_no_trade_payload(analysis, notion_url)
-            else:
-                payload = self._build_success_payload(analysis, notion_url)
+            payload = self.build_payload(analysis, notion_url)
             
             # Send to Slack
             response = requests.post(
@@ -117,6 +111,23 @@ class SlackClientV2:
             logger.error(f"Failed to send Slack notification: {e}")
             return False
     
+    def build_payload(self, analysis: Dict, notion_url: Optional[str] = None) -> Dict:
+        """
+        Build the webhook payload from the template matching the analysis.
+        
+        Args:
+            analysis: Analysis result dictionary
+            notion_url: Notion page URL
+            
+        Returns:
+            Slack message payload
+        """
+        if analysis.get("status") == "failed":
+            return self._build_failure_payload(analysis)
+        if analysis.get("setup") == "No-Trade" or analysis.get("status") == "no-trade":
+            return self._build_no_trade_payload(analysis, notion_url)
+        return self._build_success_payload(analysis, notion_url)
+    
     def _build_success_payload(self, analysis: Dict, notion_url: Optional[str]) -> Dict:
         """Build success notification payload."""
         template = self.templates.get("success", {})
@@ -1,9 +1,11 @@
 """Daily statistics job for trade result evaluation and stats calculation."""
 
 import json
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import pytz
+import numpy as np
 import pandas as pd
 from notion_client import Client
 
@@ -11,7 +13,11 @@ from src.utils.config import config
 from src.utils.logger import get_logger
 from src.data_fetcher.twelvedata import TwelveDataClient
 from src.io.s3 import S3Client
+from src.io.heartbeat import HeartbeatWriter
 from src.io.slack_v2 import SlackClientV2
+from src.io.notion_batch import NotionBatchIO
+from src.backtest.brackets import OUTCOME_SL, OUTCOME_TP, resolve_brackets
+from src.runner.batch import pair_to_symbol
 
 logger = get_logger(__name__)
 
@@ -19,10 +25,16 @@ logger = get_logger(__name__)
 class DailyStatsJob:
     """Daily statistics job that runs at 23:45 JST."""
     
+    # Trades are resolved within 90 minutes of entry
+    TRADE_TIMEOUT_MIN = 90
+    # Extra bars requested beyond the earliest entry
+    WINDOW_PADDING_BARS = 4
+    
     def __init__(self):
         """Initialize the daily stats job."""
         self.jst = pytz.timezone("Asia/Tokyo")
         self.notion_client = Client(auth=config.notion_api_key)
+        self.notion_io = NotionBatchIO(self.notion_client)
         self.twelve_data = TwelveDataClient()
         self.s3_client = S3Client()
         self.slack_client = SlackClientV2()
@@ -35,7 +47,7 @@ class DailyStatsJob:
         try:
             # Try to download existing stats
             stats_key = "stats/setup_stats.json"
-            stats_data = self.s3_client.client.get_object(
+            stats_data = self.s3_client.s3.get_object(
                 Bucket=self.s3_client.bucket,
                 Key=stats_key
             )
@@ -69,6 +81,7 @@ class DailyStatsJob:
         """
         logger.info("Starting daily stats job")
         
+        self.started = time.monotonic()
         today = datetime.now(self.jst).date()
         start_of_day = datetime.combine(today, datetime.min.time()).replace(tzinfo=self.jst)
         
@@ -76,15 +89,34 @@ class DailyStatsJob:
         pages = self._query_todays_pages(start_of_day)
         logger.info(f"Found {len(pages)} pages for today")
         
-        # Step 2: Process each page
+        # Step 2: Parse pages and evaluate pending trades in one batch
         results = []
+        pending = []
         for page in pages:
             try:
-                result = self._process_page(page)
-                if result:
-                    results.append(result)
+                parsed = self._process_page(page)
             except Exception as e:
                 logger.error(f"Failed to process page: {e}")
+                continue
+            if parsed is None:
+                continue
+            if parsed.get("is_no_trade"):
+                results.append(parsed)
+            else:
+                pending.append(parsed)
+        
+        outcomes = self._evaluate_trades(pending)
+        self._update_pages([(t["page_id"], o) for t, o in zip(pending, outcomes)])
+        self._record_outcomes(pending, outcomes)
+        for trade, outcome in zip(pending, outcomes):
+            results.append({
+                "run_id": trade["run_id"],
+                "setup": trade["setup"],
+                "result": outcome["auto_result"],
+                "pnl_pips": outcome["pnl_pips"],
+                "r_multiple": outcome["r_multiple"],
+                "is_no_trade": False
+            })
         
         # Step 3: Update statistics
         self._update_statistics(results)
@@ -95,6 +127,7 @@ class DailyStatsJob:
         # Step 5: Send summary to Slack
         summary = self._create_summary(results)
         self.slack_client.send_daily_stats(summary)
+        self.record_heartbeat(summary)
         
         logger.info(
             "Daily stats job completed",
@@ -105,11 +138,22 @@ class DailyStatsJob:
         
         return summary
     
+    def record_heartbeat(self, summary: Optional[Dict], error: Optional[str] = None):
+        """Write the job's health heartbeat to S3 (never raises)."""
+        if not config.heartbeat_enabled:
+            return
+        started = getattr(self, "started", None)
+        duration_ms = int((time.monotonic() - started) * 1000) if started else 0
+        try:
+            HeartbeatWriter(self.s3_client, "daily-stats").record_job(summary, duration_ms, error=error)
+        except Exception as e:
+            logger.warning(f"Failed to write heartbeat: {e}")
+    
     def _query_todays_pages(self, start_date: datetime) -> List[Dict]:
         """Query Notion for today's pages (including No-Trade for analysis)."""
         try:
             # Query the database - Include ALL pages from today for comprehensive analysis
-            response = self.notion_client.databases.query(
+            return self.notion_io.query_all(
                 database_id=config.notion_db_id,
                 filter={
                     "property": "Date",
@@ -119,21 +163,19 @@ class DailyStatsJob:
                 }
             )
             
-            return response.get("results", [])
-            
         except Exception as e:
             logger.error(f"Failed to query Notion: {e}")
             return []
     
     def _process_page(self, page: Dict) -> Optional[Dict]:
         """
-        Process a single Notion page to determine trade result.
+        Parse a single Notion page into a No-Trade result or a pending trade.
         
         Args:
             page: Notion page object
             
         Returns:
-            Result dictionary or None
+            No-Trade result, pending trade dictionary, or None
         """
         try:
             properties = page.get("properties", {})
@@ -141,6 +183,7 @@ class DailyStatsJob:
             # Extract required fields
             run_id = self._get_text_property(properties.get("RunId"))
             setup = self._get_select_property(properties.get("Setup"))
+            pair = self._get_pair_property(properties.get("Currency"))
             auto_result = self._get_select_property(properties.get("AutoResult"))
             
             # For No-Trade, track it for analysis but don't evaluate
@@ -171,149 +214,141 @@ class DailyStatsJob:
             
             # Get entry time (assume it's the page creation time)
             created_time = datetime.fromisoformat(page["created_time"].replace("Z", "+00:00"))
-            entry_time = created_time.astimezone(self.jst)
-            
-            # Fetch price data after entry
-            result = self._evaluate_trade(
-                entry_time,
-                entry_type,
-                tp_pips,
-                sl_pips
-            )
-            
-            # Update the Notion page
-            self._update_page(page["id"], result)
             
             return {
+                "page_id": page["id"],
                 "run_id": run_id,
+                "pair": pair,
                 "setup": setup,
-                "result": result["auto_result"],
-                "pnl_pips": result["pnl_pips"],
-                "r_multiple": result["r_multiple"],
-                "is_no_trade": False
+                "entry_time": created_time.astimezone(self.jst),
+                "entry_type": entry_type,
+                "tp_pips": tp_pips,
+                "sl_pips": sl_pips
             }
             
         except Exception as e:
             logger.error(f"Failed to process page: {e}")
             return None
     
-    def _evaluate_trade(
-        self,
-        entry_time: datetime,
-        entry_type: str,
-        tp_pips: float,
-        sl_pips: float
-    ) -> Dict:
+    def _evaluate_trades(self, trades: List[Dict]) -> List[Dict]:
         """
-        Evaluate trade outcome based on subsequent price data.
+        Evaluate all pending trades, one covering window of 5m bars per pair.
         
         Args:
-            entry_time: Entry timestamp
-            entry_type: Entry signal type
-            tp_pips: Take profit in pips
-            sl_pips: Stop loss in pips
+            trades: Pending trades from ``_process_page``
             
         Returns:
-            Trade result dictionary
+            Trade result dictionaries, in the order of ``trades``
+        """
+        results = [None] * len(trades)
+        for pair, positions in self._group_by_pair(trades).items():
+            outcomes = self._evaluate_pair(pair, [trades[i] for i in positions])
+            for i, outcome in zip(positions, outcomes):
+                results[i] = outcome
+        return results
+    
+    def _group_by_pair(self, trades: List[Dict]) -> Dict[str, List[int]]:
+        """Positions of the trades of each pair, in order."""
+        groups = {}
+        for i, trade in enumerate(trades):
+            groups.setdefault(trade.get("pair") or config.pair, []).append(i)
+        return groups
+    
+    def _evaluate_pair(self, pair: str, trades: List[Dict]) -> List[Dict]:
         """
-        # Fetch 5-minute data for the next 90 minutes
-        end_time = entry_time + timedelta(minutes=90)
+        Evaluate one pair's pending trades against one covering window of 5m bars.
+        
+        The window is fetched once, from the earliest entry to now, and every
+        trade's first TP/SL touch within its timeout is resolved together.
+        As before, a bar touching both levels counts as TP.
+        
+        Args:
+            pair: Pair code the trades were taken on (e.g., "EURUSD")
+            trades: Pending trades of that pair
+            
+        Returns:
+            Trade result dictionaries, in the order of ``trades``
+        """
+        no_fill = {"auto_result": "NoFill", "pnl_pips": 0, "r_multiple": 0}
+        if not trades:
+            return []
         
         try:
-            # Fetch data
-            df = self.twelve_data.fetch_time_series(
-                symbol="USD/JPY",
+            # One request covering the earliest entry through now
+            earliest = min(t["entry_time"] for t in trades)
+            elapsed = datetime.now(self.jst) - earliest
+            outputsize = int(elapsed / timedelta(minutes=5)) + self.WINDOW_PADDING_BARS
+            df = self.twelve_data.fetch_timeseries(
+                symbol=pair_to_symbol(pair),
                 interval="5min",
-                outputsize=20  # 20 bars = 100 minutes
+                outputsize=min(max(outputsize, 20), 5000)
             )
-            
-            # Filter to after entry time
-            df_after = df[df.index > entry_time]
-            
-            if df_after.empty:
-                return {
-                    "auto_result": "NoFill",
-                    "pnl_pips": 0,
-                    "r_multiple": 0
-                }
-            
-            # Get entry price (close of entry bar)
-            entry_price = df[df.index <= entry_time].iloc[-1]["close"]
-            
-            # Determine direction (simplified - would parse from entry_type)
-            is_long = "buy" in entry_type.lower() or "long" in entry_type.lower()
-            
-            # Calculate TP/SL levels
-            if is_long:
-                tp_price = entry_price + (tp_pips / 100)  # Convert pips to price for JPY
-                sl_price = entry_price - (sl_pips / 100)
-            else:
-                tp_price = entry_price - (tp_pips / 100)
-                sl_price = entry_price + (sl_pips / 100)
-            
-            # Check each bar
-            for idx, row in df_after.iterrows():
-                # Check if timeout
-                if idx > end_time:
-                    return {
-                        "auto_result": "Timeout",
-                        "pnl_pips": 0,
-                        "r_multiple": 0
-                    }
-                
-                # Check TP/SL hit
-                if is_long:
-                    if row["high"] >= tp_price:
-                        # TP hit
-                        return {
-                            "auto_result": "TP",
-                            "pnl_pips": tp_pips,
-                            "r_multiple": tp_pips / sl_pips
-                        }
-                    elif row["low"] <= sl_price:
-                        # SL hit
-                        return {
-                            "auto_result": "SL",
-                            "pnl_pips": -sl_pips,
-                            "r_multiple": -1
-                        }
-                else:
-                    if row["low"] <= tp_price:
-                        # TP hit
-                        return {
-                            "auto_result": "TP",
-                            "pnl_pips": tp_pips,
-                            "r_multiple": tp_pips / sl_pips
-                        }
-                    elif row["high"] >= sl_price:
-                        # SL hit
-                        return {
-                            "auto_result": "SL",
-                            "pnl_pips": -sl_pips,
-                            "r_multiple": -1
-                        }
-            
-            # Timeout if no hit within data
-            return {
-                "auto_result": "Timeout",
-                "pnl_pips": 0,
-                "r_multiple": 0
-            }
-            
         except Exception as e:
-            logger.error(f"Failed to evaluate trade: {e}")
-            return {
-                "auto_result": "NoFill",
-                "pnl_pips": 0,
-                "r_multiple": 0
-            }
+            logger.error(f"Failed to fetch evaluation window: {e}", pair=pair)
+            return [dict(no_fill) for _ in trades]
+        
+        index = df.index
+        entry_times = pd.DatetimeIndex([t["entry_time"] for t in trades]).tz_convert(index.tz)
+        end_times = entry_times + pd.Timedelta(minutes=self.TRADE_TIMEOUT_MIN)
+        
+        # Entry bar: last bar at or before entry; bars after it up to the timeout
+        entry_idx = index.searchsorted(entry_times, side="right") - 1
+        last_idx = index.searchsorted(end_times, side="right") - 1
+        max_bars = np.maximum(last_idx - entry_idx, 0)
+        has_entry = entry_idx >= 0
+        has_after = has_entry & (entry_idx < len(index) - 1)
+        
+        pip_size = 0.01 if "JPY" in pair else 0.0001
+        close = df["close"].to_numpy(dtype=np.float64)
+        entry_price = np.where(has_entry, close[np.maximum(entry_idx, 0)], np.nan)
+        direction = np.array([
+            1 if ("buy" in t["entry_type"].lower() or "long" in t["entry_type"].lower()) else -1
+            for t in trades
+        ])
+        tp_pips = np.array([t["tp_pips"] for t in trades], dtype=np.float64)
+        sl_pips = np.array([t["sl_pips"] for t in trades], dtype=np.float64)
+        
+        resolved = resolve_brackets(
+            df["high"].to_numpy(dtype=np.float64),
+            df["low"].to_numpy(dtype=np.float64),
+            close,
+            np.maximum(entry_idx, 0),
+            direction,
+            entry_price + direction * tp_pips * pip_size,
+            entry_price - direction * sl_pips * pip_size,
+            max_bars,
+            tp_first=True
+        )
+        
+        results = []
+        for i, outcome in enumerate(resolved["outcome"]):
+            if not has_after[i]:
+                results.append(dict(no_fill))
+            elif outcome == OUTCOME_TP:
+                results.append({
+                    "auto_result": "TP",
+                    "pnl_pips": float(tp_pips[i]),
+                    "r_multiple": float(tp_pips[i] / sl_pips[i])
+                })
+            elif outcome == OUTCOME_SL:
+                results.append({"auto_result": "SL", "pnl_pips": -float(sl_pips[i]), "r_multiple": -1})
+            else:
+                # Window elapsed (or data ended) without a touch
+                results.append({"auto_result": "Timeout", "pnl_pips": 0, "r_multiple": 0})
+        
+        outcome_counts = {}
+        for r in results:
+            outcome_counts[r["auto_result"]] = outcome_counts.get(r["auto_result"], 0) + 1
+        logger.info("Evaluated pending trades", pair=pair, trades=len(trades), bars=len(df), outcomes=outcome_counts)
+        
+        return results
     
-    def _update_page(self, page_id: str, result: Dict):
-        """Update Notion page with trade result."""
-        try:
-            self.notion_client.pages.update(
-                page_id=page_id,
-                properties={
+    def _update_pages(self, updates: List[Tuple[str, Dict]]):
+        """Write trade results back to their Notion pages concurrently."""
+        outcome = self.notion_io.update_pages([
+            (
+                page_id,
+                {
                     "AutoResult": {
                         "select": {"name": result["auto_result"]}
                     },
@@ -325,10 +360,38 @@ class DailyStatsJob:
                     }
                 }
             )
-            logger.info(f"Updated page {page_id} with result: {result['auto_result']}")
-            
+            for page_id, result in updates
+        ])
+        
+        for page_id, result in updates:
+            if outcome.get(page_id) is None:
+                logger.info(f"Updated page {page_id} with result: {result['auto_result']}")
+    
+    def _record_outcomes(self, trades: List[Dict], outcomes: List[Dict]):
+        """Append trade outcomes to the columnar run history, per pair."""
+        if not config.history_enabled or not trades:
+            return
+        try:
+            from src.io.history import RunHistoryStore
+            store = RunHistoryStore()
         except Exception as e:
-            logger.error(f"Failed to update page: {e}")
+            logger.warning(f"Failed to record trade outcomes in run history: {e}")
+            return
+        
+        for pair, positions in self._group_by_pair(trades).items():
+            try:
+                store.append_outcomes(pair, [
+                    {
+                        "run_id": trades[i]["run_id"],
+                        "entry_time": trades[i]["entry_time"],
+                        "result": outcomes[i]["auto_result"],
+                        "pnl_pips": outcomes[i]["pnl_pips"],
+                        "r_multiple": outcomes[i]["r_multiple"]
+                    }
+                    for i in positions
+                ])
+            except Exception as e:
+                logger.warning(f"Failed to record trade outcomes in run history: {e}", pair=pair)
     
     def _update_statistics(self, results: List[Dict]):
         """Update setup statistics with Beta + EWMA."""
@@ -385,7 +448,7 @@ class DailyStatsJob:
             stats_key = "stats/setup_stats.json"
             stats_json = json.dumps(self.stats, indent=2, ensure_ascii=False)
             
-            self.s3_client.client.put_object(
+            self.s3_client.s3.put_object(
                 Bucket=self.s3_client.bucket,
                 Key=stats_key,
                 Body=stats_json.encode('utf-8'),
@@ -469,6 +532,17 @@ class DailyStatsJob:
         
         return None
     
+    def _get_pair_property(self, prop: Optional[Dict]) -> Optional[str]:
+        """Extract the pair code from the Currency multi-select property."""
+        if not prop:
+            return None
+        
+        options = prop.get("multi_select") or []
+        if options and options[0].get("name"):
+            return options[0]["name"].replace("/", "").upper()
+        
+        return None
+    
     def _get_number_property(self, prop: Optional[Dict]) -> Optional[float]:
         """Extract number from Notion property."""
         if not prop or "number" not in prop:
@@ -481,6 +555,7 @@ def main():
     """Main entry point for daily stats job."""
     logger.info("Daily stats job starting")
     
+    job = None
     try:
         job = DailyStatsJob()
         summary = job.run()
@@ -493,6 +568,8 @@ def main():
         
     except Exception as e:
         logger.error(f"Daily stats job failed: {e}")
+        if job is not None:
+            job.record_heartbeat(None, error=str(e))
         raise
 
 
@@ -2,27 +2,57 @@
 
 import sys
 import json
+import time
+import tempfile
+import threading
+import importlib
 import traceback
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
 from pathlib import Path
 
 from src.utils.config import config
 from src.utils.logger import get_logger
-from src.data_fetcher.twelvedata import fetch_multi_timeframe_data
-from src.analysis.core_v2 import FXAnalyzerV2
-from src.charting.mpl import ChartGenerator
-from src.io.s3 import S3Client
-from src.io.notion_v2 import NotionClientV2
-from src.io.slack_v2 import SlackClientV2
+from src.utils.metrics import RunMetrics
 
 logger = get_logger(__name__)
 
+# Heavy modules (pandas, matplotlib, boto3, notion_client) are imported when
+# first needed; these are preloaded in the background while data is fetched.
+PRELOAD_MODULES = (
+    "src.charting.mpl",
+)
+
+
+def _preload_modules() -> None:
+    """Import modules needed after the fetch, off the critical path."""
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            logger.warning(f"Preloading {name} failed: {e}")
+
 
 class FXAnalysisRunnerV2:
     """Enhanced main orchestrator with schema compliance and quality gates."""
     
-    def __init__(self):
-        """Initialize the enhanced runner."""
+    def __init__(
+        self,
+        pair: Optional[str] = None,
+        symbol: Optional[str] = None,
+        clients: Optional[Dict] = None
+    ):
+        """
+        Initialize the enhanced runner.
+        
+        Args:
+            pair: Trading pair (defaults to config)
+            symbol: TwelveData symbol (defaults to config)
+            clients: Pre-built sink clients ("s3", "notion", "slack", and
+                optionally "wordpress"/"twitter") shared between runners;
+                built here when omitted
+        """
         # Validate configuration
         try:
             config.validate()
@@ -30,128 +60,197 @@ class FXAnalysisRunnerV2:
             logger.error(f"Configuration validation failed: {e}")
             raise
         
+        self.pair = pair or config.pair
+        self.symbol = symbol or config.symbol
+        
         # Initialize components
-        self.analyzer = FXAnalyzerV2(pair=config.pair)
-        self.chart_generator = ChartGenerator(pair=config.pair)
-        self.s3_client = None
-        self.notion_client = None
-        self.slack_client = None
+        from src.analysis.core_v2 import FXAnalyzerV2
+        self.analyzer = FXAnalyzerV2(pair=self.pair)
+        self._chart_generator = None
+        
+        # Sink clients import boto3/notion_client, so build them in the
+        # background and wait only when a sink is first used
+        self._clients = clients
+        self._clients_future = None
+        if clients is None:
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="clients")
+            self._clients_future = executor.submit(self.create_clients)
+            executor.shutdown(wait=False)
+    
+    @property
+    def clients(self) -> Dict:
+        """Sink clients ("s3", "notion", "slack", ...)."""
+        if self._clients is None:
+            self._clients = self._clients_future.result()
+        return self._clients
+    
+    @property
+    def s3_client(self):
+        return self.clients.get("s3")
+    
+    @property
+    def notion_client(self):
+        return self.clients.get("notion")
+    
+    @property
+    def slack_client(self):
+        return self.clients.get("slack")
+    
+    @property
+    def wordpress_client(self):
+        return self.clients.get("wordpress")
+    
+    @property
+    def twitter_client(self):
+        return self.clients.get("twitter")
+    
+    @property
+    def chart_generator(self):
+        """Chart generator, created (and matplotlib imported) on first use."""
+        if self._chart_generator is None:
+            from src.charting.mpl import ChartGenerator
+            self._chart_generator = ChartGenerator(pair=self.pair)
+        return self._chart_generator
+    
+    @staticmethod
+    def create_clients() -> Dict:
+        """Initialize sink clients, leaving out any that fail to initialize."""
+        clients = {}
         
-        # Initialize clients with error handling
         try:
-            self.s3_client = S3Client()
+            from src.io.s3 import S3Client
+            clients["s3"] = S3Client()
         except Exception as e:
             logger.warning(f"S3 client initialization failed: {e}")
         
         try:
-            self.notion_client = NotionClientV2()
+            from src.io.notion_v2 import NotionClientV2
+            clients["notion"] = NotionClientV2()
         except Exception as e:
             logger.warning(f"Notion client initialization failed: {e}")
         
         try:
-            self.slack_client = SlackClientV2()
+            from src.io.slack_v2 import SlackClientV2
+            clients["slack"] = SlackClientV2()
         except Exception as e:
             logger.warning(f"Slack client initialization failed: {e}")
+        
+        if config.enable_wordpress:
+            try:
+                from src.io.wordpress import WordPressClient
+                wordpress = WordPressClient()
+                if wordpress.enabled:
+                    clients["wordpress"] = wordpress
+            except Exception as e:
+                logger.warning(f"WordPress client initialization failed: {e}")
+        
+        if config.enable_twitter:
+            try:
+                from src.io.twitter import TwitterClient
+                twitter = TwitterClient()
+                if twitter.enabled:
+                    clients["twitter"] = twitter
+            except Exception as e:
+                logger.warning(f"Twitter client initialization failed: {e}")
+        
+        return clients
+    
+    @staticmethod
+    def shutdown():
+        """Stop process-wide workers (the chart render pool) before the process exits."""
+        mpl = sys.modules.get("src.charting.mpl")
+        if mpl is None:
+            return
+        try:
+            mpl.shutdown_render_pool()
+        except Exception as e:
+            logger.warning(f"Failed to stop chart render pool: {e}")
     
-    def run(self) -> Dict:
+    def run(self, data: Optional[Dict] = None) -> Dict:
         """
         Execute the complete analysis workflow with v2 enhancements.
         
+        With PROFILE_ENABLED, the run is sampled by the stdlib profiler and
+        its flamegraph and hot-function summary are uploaded next to the
+        run artifacts.
+        
+        Args:
+            data: Pre-fetched dict mapping timeframe to DataFrame (fetched
+                from TwelveData when omitted)
+        
         Returns:
             Schema-compliant analysis result
         """
-        logger.info("Starting FX analysis run v2", pair=config.pair, timeframes=config.timeframes)
+        # Retries and errors inside shared clients are counted for this run
+        # only, even when several pairs run concurrently
+        metrics = RunMetrics({"Pair": self.pair})
+        with metrics.activate():
+            if not config.profile_enabled:
+                return self._run(data, metrics)
+            
+            from src.utils.profiler import SamplingProfiler
+            with SamplingProfiler(name=f"{self.pair} run") as profiler:
+                analysis = self._run(data, metrics)
+            if profiler.active:
+                self._upload_profile(profiler, analysis)
+            return analysis
+    
+    def _run(self, data: Optional[Dict], metrics: RunMetrics) -> Dict:
+        """Run the workflow (see ``run``)."""
+        logger.info("Starting FX analysis run v2", pair=self.pair, timeframes=config.timeframes)
         
         analysis = None
         
         try:
             # Step 1: Fetch data
-            logger.info("Fetching market data")
-            data = fetch_multi_timeframe_data()
+            if data is None:
+                threading.Thread(target=_preload_modules, name="preload", daemon=True).start()
+                
+                from src.data_fetcher.twelvedata import fetch_multi_timeframe_data
+                logger.info("Fetching market data")
+                with metrics.stage("fetch"):
+                    data = fetch_multi_timeframe_data(symbol=self.symbol)
             
             if not data:
                 raise ValueError("No data fetched from TwelveData")
+            metrics.record("bars", sum(len(df) for df in data.values()))
             
             # Step 2: Analyze data with v2 analyzer
             logger.info("Analyzing market data with v2 engine")
-            analysis = self.analyzer.analyze(data)
+            with metrics.stage("analyze"):
+                analysis = self.analyzer.analyze(data)
             
             # Step 3: Generate charts
             logger.info("Generating charts")
-            charts = self.chart_generator.generate_multi_timeframe_charts(data, analysis)
+            with metrics.stage("chart"):
+                charts = self.chart_generator.generate_multi_timeframe_charts(data, analysis)
+            metrics.record("chart_bytes", sum(len(chart) for chart in charts.values()), "Bytes")
             
-            # Step 4: Upload to S3
+            # Step 4: Pre-compute artifact URLs from their deterministic keys
+            run_date = datetime.now()
             chart_urls = {}
-            s3_results = None
+            artifact_plan = None
             if self.s3_client and charts:
-                try:
-                    logger.info("Uploading to S3")
-                    s3_results = self.s3_client.upload_analysis_artifacts(analysis, charts)
-                    
-                    # Extract chart URLs
-                    if s3_results and "charts" in s3_results:
-                        for tf, info in s3_results["charts"].items():
-                            if "url" in info:
-                                chart_urls[tf] = info["url"]
-                    
-                    # Add chart information to analysis
-                    analysis["charts"] = [
-                        {
-                            "timeframe": tf,
-                            "s3_key": info.get("key", ""),
-                            "s3_presigned_url": info.get("url", ""),
-                            "width_px": 1200,
-                            "height_px": 600
-                        }
-                        for tf, info in s3_results.get("charts", {}).items()
-                    ]
-                    
-                except Exception as e:
-                    logger.error(f"S3 upload failed: {e}")
-                    analysis["status"] = "failed"
-                    analysis["error"] = f"S3: {str(e)}"
+                artifact_plan = self.s3_client.plan_analysis_artifacts(
+                    analysis["run_id"], list(charts), pair=self.pair, date=run_date
+                )
+                chart_urls = {tf: info["url"] for tf, info in artifact_plan["charts"].items()}
+                
+                # Add chart information to analysis
+                analysis["charts"] = self.s3_client.chart_entries(artifact_plan["charts"])
             
             # Step 5: Validate against schema
             if not self._validate_schema(analysis):
                 logger.warning("Analysis does not fully comply with schema")
             
-            # Step 6: Create Notion page
-            notion_page_id = None
-            notion_url = None
-            if self.notion_client and analysis["status"] != "failed":
-                try:
-                    logger.info("Creating Notion page with v2 client")
-                    
-                    # Extract chart URLs for Notion
-                    chart_urls = {}
-                    if s3_results and "charts" in s3_results:
-                        for tf, info in s3_results["charts"].items():
-                            if "url" in info:
-                                chart_urls[tf] = info["url"]
-                    
-                    notion_page_id = self.notion_client.create_analysis_page(analysis, chart_urls)
-                    
-                    # Generate Notion URL
-                    notion_url = f"https://notion.so/{notion_page_id.replace('-', '')}"
-                    
-                except Exception as e:
-                    logger.error(f"Notion update failed: {e}")
-                    analysis["status"] = "failed"
-                    analysis["error"] = f"Notion: {str(e)}"
-            
-            # Step 7: Send Slack notification
-            if self.slack_client:
-                try:
-                    logger.info("Sending Slack notification with v2 template")
-                    self.slack_client.send_analysis_notification(
-                        analysis,
-                        notion_url=notion_url,
-                        chart_urls=chart_urls
-                    )
-                    
-                except Exception as e:
-                    logger.error(f"Slack notification failed: {e}")
-                    # Don't mark as failed for Slack errors
+            # Step 6: Fan out to sinks
+            metrics.record("analysis_bytes", len(json.dumps(analysis, default=str)), "Bytes")
+            self._publish(
+                analysis, charts, chart_urls, artifact_plan is not None, run_date,
+                chart_hashes=self.chart_generator.chart_hashes if self.chart_generator.cache.s3_enabled else None,
+                cached_charts=self.chart_generator.cached_timeframes,
+                metrics=metrics
+            )
             
             # Log completion
             logger.info(
@@ -161,7 +260,8 @@ class FXAnalysisRunnerV2:
                 setup=analysis["setup"],
                 confluence=analysis["confluence_count"],
                 ev_R=analysis["ev_R"],
-                advice_flags=len(analysis.get("advice_flags", []))
+                advice_flags=len(analysis.get("advice_flags", [])),
+                execution_time_ms=metrics.elapsed_ms()
             )
             
         except Exception as e:
@@ -186,8 +286,184 @@ class FXAnalysisRunnerV2:
                 except:
                     pass
         
+        execution_time_ms = metrics.finish()
+        with metrics.stage("history"):
+            self._record_history(analysis)
+        with metrics.stage("heartbeat"):
+            self._record_heartbeat(analysis, execution_time_ms)
+        metrics.emit(logger, run_id=analysis.get("run_id"), status=analysis.get("status"))
+        
         return analysis
     
+    def _upload_profile(self, profiler, analysis: Dict) -> None:
+        """Log the hottest functions and upload the profile (never fails the run)."""
+        try:
+            summary = profiler.summary()
+            logger.info(
+                "Run profile",
+                run_id=analysis.get("run_id"),
+                samples=summary["samples"],
+                top=[f"{entry['self_pct']}% {entry['function']}" for entry in summary["top"][:10]]
+            )
+            if self.s3_client:
+                self.s3_client.upload_profile(profiler.artifacts(), self.pair, analysis.get("run_id", "unknown"))
+        except Exception as e:
+            logger.warning(f"Failed to upload run profile: {e}")
+    
+    def _record_heartbeat(self, analysis: Dict, duration_ms: int) -> None:
+        """Update this pair's health heartbeat in S3 (never fails the run)."""
+        if not config.heartbeat_enabled or not self.s3_client:
+            return
+        try:
+            from src.io.heartbeat import HeartbeatWriter
+            HeartbeatWriter(self.s3_client, f"runner-{self.pair}").record_run(analysis, duration_ms)
+        except Exception as e:
+            logger.warning(f"Failed to write heartbeat: {e}")
+    
+    def _record_history(self, analysis: Dict) -> None:
+        """Append the run to the columnar run history (never fails the run)."""
+        if not config.history_enabled:
+            return
+        try:
+            from src.io.history import RunHistoryStore
+            RunHistoryStore().append_run(analysis)
+        except Exception as e:
+            logger.warning(f"Failed to record run history: {e}")
+    
+    def _publish(
+        self,
+        analysis: Dict,
+        charts: Dict[str, bytes],
+        chart_urls: Dict[str, str],
+        upload: bool,
+        run_date: datetime,
+        chart_hashes: Optional[Dict[str, str]] = None,
+        cached_charts: Optional[List[str]] = None,
+        metrics: Optional[RunMetrics] = None
+    ) -> None:
+        """
+        Deliver the analysis to every sink, running independent ones concurrently.
+        
+        S3, Notion, WordPress and X start together since chart URLs are known
+        up front. Slack waits only for S3 and Notion, whose outcome sets the
+        run status and the Notion link it reports.
+        
+        Charts that fail to upload are dropped from ``analysis["charts"]``
+        and from the URLs Slack reports, and their images on the Notion page
+        are replaced with placeholders; a run whose charts all failed to
+        upload is failed.
+        
+        Args:
+            analysis: Analysis result (status/error updated in place)
+            charts: Dict of timeframe to chart bytes
+            chart_urls: Pre-computed pre-signed chart URLs
+            upload: Whether to upload artifacts to S3
+            run_date: Date used for the artifact keys
+            chart_hashes: Render cache hashes, so cached charts are copied in S3
+            cached_charts: Timeframes served from the render cache
+            metrics: Run metrics receiving per-sink durations
+        """
+        started = time.monotonic()
+        metrics = metrics or RunMetrics({"Pair": self.pair})
+        
+        with ThreadPoolExecutor(max_workers=4) as executor, tempfile.TemporaryDirectory() as chart_dir:
+            s3_future = None
+            if upload:
+                logger.info("Uploading to S3")
+                # Snapshot: the uploader records chart keys on the dict it is given
+                s3_future = executor.submit(
+                    metrics.timed("s3", self.s3_client.upload_analysis_artifacts),
+                    dict(analysis), charts, pair=self.pair, date=run_date,
+                    content_hashes=chart_hashes, cached_timeframes=cached_charts
+                )
+            
+            notion_future = None
+            if self.notion_client and analysis["status"] != "failed":
+                logger.info("Creating Notion page with v2 client")
+                notion_future = executor.submit(
+                    metrics.timed("notion", self.notion_client.create_analysis_page), analysis, chart_urls
+                )
+            
+            # External publishers read charts from local files, not from S3
+            external_futures = []
+            if self.wordpress_client or self.twitter_client:
+                chart_paths = {}
+                for tf, chart_bytes in charts.items():
+                    chart_paths[tf] = str(Path(chart_dir) / f"{analysis['run_id']}_{tf}.png")
+                    Path(chart_paths[tf]).write_bytes(chart_bytes)
+                if self.wordpress_client:
+                    external_futures.append(executor.submit(
+                        metrics.timed("wordpress", self.wordpress_client.create_draft_post),
+                        analysis, chart_urls, chart_paths
+                    ))
+                if self.twitter_client:
+                    external_futures.append(executor.submit(
+                        metrics.timed("twitter", self.twitter_client.post_analysis),
+                        analysis, chart_urls.get("5m"), chart_paths.get("5m")
+                    ))
+            
+            # Planned URLs of charts that did not reach S3
+            dead_urls = {}
+            if s3_future:
+                try:
+                    uploaded = s3_future.result()["charts"]
+                except Exception as e:
+                    logger.error(f"S3 upload failed: {e}")
+                    uploaded = {}
+                    analysis["status"] = "failed"
+                    analysis["error"] = f"S3: {str(e)}"
+                
+                # Only link charts that made it to S3 (WordPress and X
+                # upload the local files instead)
+                dead_urls = {tf: url for tf, url in chart_urls.items() if tf not in uploaded}
+                if dead_urls:
+                    logger.warning("Dropping charts that failed to upload", timeframes=list(dead_urls))
+                    chart_urls = {tf: url for tf, url in chart_urls.items() if tf in uploaded}
+                    analysis["charts"] = self.s3_client.chart_entries(uploaded)
+                if charts and not uploaded and analysis["status"] != "failed":
+                    analysis["status"] = "failed"
+                    analysis["error"] = "S3: no charts uploaded"
+            
+            notion_url = None
+            if notion_future:
+                try:
+                    notion_page_id = notion_future.result()
+                    notion_url = f"https://notion.so/{notion_page_id.replace('-', '')}"
+                except Exception as e:
+                    logger.error(f"Notion update failed: {e}")
+                    if analysis["status"] != "failed":
+                        analysis["status"] = "failed"
+                        analysis["error"] = f"Notion: {str(e)}"
+                
+                # The page was built from the planned URLs before S3 finished
+                if notion_url and dead_urls:
+                    try:
+                        self.notion_client.replace_chart_images(notion_page_id, dead_urls)
+                    except Exception as e:
+                        logger.error(f"Failed to remove dead chart links from Notion: {e}")
+            
+            if self.slack_client:
+                try:
+                    logger.info("Sending Slack notification with v2 template")
+                    with metrics.stage("slack"):
+                        self.slack_client.send_analysis_notification(
+                            analysis,
+                            notion_url=notion_url,
+                            chart_urls=chart_urls
+                        )
+                    
+                except Exception as e:
+                    logger.error(f"Slack notification failed: {e}")
+                    # Don't mark as failed for Slack errors
+            
+            for future in external_futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f"External publishing failed: {e}")
+        
+        logger.info("Published analysis to sinks", duration_ms=int((time.monotonic() - started) * 1000))
+    
     def _validate_schema(self, analysis: Dict) -> bool:
         """
         Validate analysis against schema.
@@ -255,6 +531,8 @@ def main():
         logger.error(f"Fatal error: {e}")
         logger.error(traceback.format_exc())
         sys.exit(1)
+    finally:
+        FXAnalysisRunnerV2.shutdown()
 
 
 if __name__ == "__main__":
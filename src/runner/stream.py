@@ -0,0 +1,248 @@
+"""Long-running streaming runner that re-analyzes on every bar close."""
+
+import sys
+import signal
+import time
+import argparse
+import traceback
+from collections import deque
+from typing import Callable, Dict, Optional
+import pandas as pd
+
+from src.utils.config import config
+from src.utils.logger import get_logger
+from src.analysis.core_v2 import FXAnalyzerV2
+from src.analysis.indicators import IndicatorEngine
+from src.data_fetcher.feeds import (
+    TIMEFRAME_DELTAS, Bar, BarFeed, ReplayFeed, TwelveDataWebSocketFeed
+)
+
+logger = get_logger(__name__)
+
+
+class StreamingRunner:
+    """
+    Keep one analyzer and one indicator engine per timeframe alive, updating
+    them bar by bar instead of refetching and recomputing each run.
+
+    Every closed bar is appended to its engine in O(1); each close of the
+    primary timeframe re-runs the quality gates and setup tree.
+    """
+
+    MIN_BARS = 25
+
+    def __init__(
+        self,
+        feed: BarFeed,
+        pair: Optional[str] = None,
+        window: int = 200,
+        primary: str = "5m",
+        on_result: Optional[Callable[[Dict], None]] = None
+    ):
+        """
+        Initialize the streaming runner.
+
+        Args:
+            feed: Source of closed bars
+            pair: Trading pair (defaults to config)
+            window: Bars per timeframe handed to the analyzer
+            primary: Timeframe whose closes trigger an evaluation
+            on_result: Called with every analysis result
+        """
+        self.feed = feed
+        self.pair = pair or config.pair
+        self.window = window
+        self.primary = primary
+        self.on_result = on_result
+        # Every timeframe the analysis needs before the first evaluation
+        self.timeframes = [primary] + [tf for tf in config.timeframes if tf != primary]
+
+        self.analyzer = FXAnalyzerV2(pair=self.pair)
+        self.engines: Dict[str, IndicatorEngine] = {}
+        self._timestamps: Dict[str, deque] = {}
+
+        self.evaluations = 0
+        self.last_result: Optional[Dict] = None
+
+    def warm_up(self, data: Dict[str, pd.DataFrame], now: Optional[pd.Timestamp] = None) -> None:
+        """
+        Seed the engines with history so the first bar is evaluated at once.
+
+        Bars that have not closed by ``now`` (REST history ends with the
+        still-forming bar) are dropped; the feed delivers them once closed.
+
+        Args:
+            data: Dict mapping timeframe to OHLC DataFrame
+            now: Current time (defaults to the wall clock)
+        """
+        now = pd.Timestamp.now(tz="UTC") if now is None else pd.Timestamp(now)
+        data = {tf: self._closed_bars(tf, df, now) for tf, df in data.items()}
+        for tf, df in data.items():
+            self.engines[tf] = IndicatorEngine.from_frame(df)
+            self._timestamps[tf] = deque(df.index[-self.window:], maxlen=self.window)
+        logger.info("Streaming runner warmed up", bars={tf: len(df) for tf, df in data.items()})
+
+    @staticmethod
+    def _closed_bars(tf: str, df: pd.DataFrame, now: pd.Timestamp) -> pd.DataFrame:
+        """Rows of ``df`` whose bar has closed by ``now``."""
+        if df.empty or tf not in TIMEFRAME_DELTAS:
+            return df
+        index = df.index
+        if index.tz is None:
+            index = index.tz_localize(config.tz)
+        if now.tzinfo is None:
+            now = now.tz_localize(config.tz)
+        return df[index + TIMEFRAME_DELTAS[tf] <= now]
+
+    def _frame(self, tf: str) -> pd.DataFrame:
+        """Latest ``window`` bars of a timeframe as a DataFrame."""
+        engine = self.engines[tf]
+        timestamps = self._timestamps[tf]
+        n = len(timestamps)
+        return pd.DataFrame(
+            {
+                "open": engine.open[-n:],
+                "high": engine.high[-n:],
+                "low": engine.low[-n:],
+                "close": engine.close[-n:],
+            },
+            index=pd.DatetimeIndex(list(timestamps))
+        )
+
+    def on_bar(self, bar: Bar) -> Optional[Dict]:
+        """
+        Apply one closed bar and evaluate on primary-timeframe closes.
+
+        Returns:
+            Analysis result, or None when no evaluation ran
+        """
+        engine = self.engines.get(bar.timeframe)
+        if engine is None:
+            engine = self.engines[bar.timeframe] = IndicatorEngine()
+            self._timestamps[bar.timeframe] = deque(maxlen=self.window)
+
+        # Bars already covered by the warm-up history
+        if engine.last_timestamp is not None and bar.timestamp <= engine.last_timestamp:
+            return None
+
+        engine.update(bar.open, bar.high, bar.low, bar.close, bar.timestamp)
+        self._timestamps[bar.timeframe].append(bar.timestamp)
+
+        if bar.timeframe != self.primary:
+            return None
+        if any(len(self.engines.get(tf, ())) < self.MIN_BARS for tf in self.timeframes):
+            return None
+
+        started = time.perf_counter()
+        data = {tf: self._frame(tf) for tf in self.engines}
+        result = self.analyzer.analyze(data, engines=self.engines, now=bar.close_time)
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+
+        self.evaluations += 1
+        logger.info(
+            "Streaming evaluation",
+            bar_close=bar.close_time.isoformat(),
+            status=result["status"],
+            setup=result["setup"],
+            ev_R=result["ev_R"],
+            elapsed_ms=elapsed_ms
+        )
+
+        if self.on_result:
+            try:
+                self.on_result(result)
+            except Exception as e:
+                logger.error(f"Result handler failed: {e}")
+
+        self.last_result = result
+        return result
+
+    def run(self, max_bars: Optional[int] = None) -> int:
+        """
+        Consume the feed until it ends or is closed.
+
+        Args:
+            max_bars: Stop after this many bars (runs forever when omitted)
+
+        Returns:
+            Number of evaluations
+        """
+        logger.info("Starting streaming runner", pair=self.pair, primary=self.primary)
+        bars = 0
+        try:
+            for bar in self.feed:
+                self.on_bar(bar)
+                bars += 1
+                if max_bars is not None and bars >= max_bars:
+                    break
+        finally:
+            self.feed.close()
+
+        logger.info("Streaming runner stopped", bars=bars, evaluations=self.evaluations)
+        return self.evaluations
+
+
+class SetupNotifier:
+    """Send a Slack notification when a live setup first appears."""
+
+    def __init__(self):
+        from src.io.slack_v2 import SlackClientV2
+
+        self.slack_client = SlackClientV2()
+        self._last_setup = None
+
+    def __call__(self, result: Dict) -> None:
+        setup = result["setup"] if result["status"] == "success" else None
+        if setup and setup != self._last_setup:
+            self.slack_client.send_analysis_notification(result)
+        self._last_setup = setup
+
+
+def _parse_files(values) -> Dict[str, str]:
+    """Parse repeated ``tf=path`` arguments."""
+    return dict(item.split("=", 1) for item in values)
+
+
+def main():
+    """Main entry point for the streaming runner."""
+    parser = argparse.ArgumentParser(description="Analyze on every bar close from a live or replayed feed")
+    parser.add_argument("--feed", choices=["websocket", "replay"], default="websocket")
+    parser.add_argument("--file", action="append", default=[],
+                        help="Replay bars from a CSV/Parquet file, e.g. 5m=bars_5m.csv (repeatable)")
+    parser.add_argument("--start", help="Replay from the bar store starting at this date")
+    parser.add_argument("--end", help="Replay from the bar store up to this date")
+    parser.add_argument("--speed", type=float, default=0.0, help="Replay speed vs real time (0 = max)")
+    parser.add_argument("--no-notify", action="store_true", help="Log results without Slack notifications")
+    args = parser.parse_args()
+
+    logger.info("FX Analysis streaming runner starting", feed=args.feed)
+
+    try:
+        if args.feed == "websocket":
+            feed = TwelveDataWebSocketFeed(symbol=config.symbol)
+        elif args.file:
+            feed = ReplayFeed.from_files(_parse_files(args.file), speed=args.speed)
+        else:
+            feed = ReplayFeed.from_store(config.symbol, start=args.start, end=args.end, speed=args.speed)
+
+        runner = StreamingRunner(feed, on_result=None if args.no_notify else SetupNotifier())
+
+        # Live mode starts from recent history; replays build it from the feed
+        if args.feed == "websocket":
+            from src.data_fetcher.twelvedata import fetch_multi_timeframe_data
+            runner.warm_up(fetch_multi_timeframe_data(symbol=config.symbol))
+
+        signal.signal(signal.SIGTERM, lambda signum, frame: feed.close())
+        runner.run()
+        sys.exit(0)
+
+    except KeyboardInterrupt:
+        sys.exit(0)
+    except Exception as e:
+        logger.error(f"Fatal error: {e}")
+        logger.error(traceback.format_exc())
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -162,17 +162,28 @@ def handle_status_command(command, client):
 
 def handle_run_command(command, client, args):
     """
-    Handle /fx run [mode] - trigger manual analysis run
+    Handle /fx run [mode] [profile] - trigger manual analysis run
+    (profile: sample the run and upload the profile next to its artifacts)
     """
+    profile = 'profile' in args
+    args = [arg for arg in args if arg != 'profile']
     mode = args[0] if args else 'dryrun'
     
     if mode not in ['dryrun', 'production']:
         client.chat_postMessage(
             channel=command['channel_id'],
-            text="Invalid mode. Use `/fx run dryrun` or `/fx run production`"
+            text="Invalid mode. Use `/fx run dryrun` or `/fx run production` (optionally followed by `profile`)"
         )
         return
     
+    environment = [
+        {'name': 'RUN_MODE', 'value': mode},
+        {'name': 'TRIGGERED_BY', 'value': f"slack:{command['user_id']}"},
+        {'name': 'SLACK_RESPONSE_URL', 'value': command['response_url']}
+    ]
+    if profile:
+        environment.append({'name': 'PROFILE_ENABLED', 'value': 'true'})
+    
     try:
         # Run ECS task
         response = ecs_client.run_task(
@@ -192,11 +203,7 @@ def handle_run_command(command, client, args):
             overrides={
                 'containerOverrides': [{
                     'name': 'analyze-fx',
-                    'environment': [
-                        {'name': 'RUN_MODE', 'value': mode},
-                        {'name': 'TRIGGERED_BY', 'value': f"slack:{command['user_id']}"},
-                        {'name': 'SLACK_RESPONSE_URL', 'value': command['response_url']}
-                    ]
+                    'environment': environment
                 }]
             }
         )
@@ -235,6 +242,15 @@ def handle_run_command(command, client, args):
             }
         ]
         
+        if profile:
+            blocks.append({
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": "🔬 *Profiling:* flamegraph (`_profile.speedscope.json`) and hot functions (`_profile.top.json`) will be uploaded next to the run artifacts in S3"
+                }
+            })
+        
         if mode == 'dryrun':
             blocks.append({
                 "type": "section",
@@ -247,7 +263,7 @@ def handle_run_command(command, client, args):
         client.chat_postMessage(
             channel=command['channel_id'],
             blocks=blocks,
-            text=f"Analysis started in {mode} mode"
+            text=f"Analysis started in {mode} mode" + (" with profiling" if profile else "")
         )
         
     except Exception as e:
@@ -281,7 +297,7 @@ def handle_help_command(command, client):
             "text": {
                 "type": "mrkdwn",
                 "text": "• `/fx status` - Show system health and metrics\n"
-                        "• `/fx run [mode]` - Run analysis (dryrun or production)\n"
+                        "• `/fx run [mode] [profile]` - Run analysis (dryrun or production), optionally profiled\n"
                         "• `/fx help` - Show this help message"
             }
         },
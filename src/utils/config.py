@@ -22,22 +22,66 @@ class Config:
     symbol: str = os.getenv("SYMBOL", "USD/JPY")
     timeframes: List[str] = field(default_factory=lambda: os.getenv("TIMEFRAMES", "5m,1h").split(","))
     
+    # Batch mode (several pairs in one task)
+    pairs: List[str] = field(default_factory=lambda: os.getenv("PAIRS", os.getenv("PAIR", "USDJPY")).split(","))
+    batch_workers: int = int(os.getenv("BATCH_WORKERS", "4"))
+    
     # Data source
     data_source: str = os.getenv("DATA_SOURCE", "twelvedata")
     twelvedata_api_key: str = os.getenv("TWELVEDATA_API_KEY", "")
+    twelvedata_credits_per_minute: int = int(os.getenv("TWELVEDATA_CREDITS_PER_MINUTE", "8"))
+    fetch_workers: int = int(os.getenv("FETCH_WORKERS", "8"))
+    
+    # Local bar store (incremental fetching)
+    bar_store_enabled: bool = os.getenv("BAR_STORE_ENABLED", "true").lower() == "true"
+    bar_store_dir: str = os.getenv("BAR_STORE_DIR", "/tmp/fx-bars")
+    bar_store_s3_sync: bool = os.getenv("BAR_STORE_S3_SYNC", "false").lower() == "true"
+    bar_store_s3_prefix: str = os.getenv("BAR_STORE_S3_PREFIX", "bars")
+    
+    # Run history (columnar analysis/outcome dataset)
+    history_enabled: bool = os.getenv("HISTORY_ENABLED", "true").lower() == "true"
+    history_dir: str = os.getenv("HISTORY_DIR", "/tmp/fx-history")
+    history_s3_sync: bool = os.getenv("HISTORY_S3_SYNC", "false").lower() == "true"
+    history_s3_prefix: str = os.getenv("HISTORY_S3_PREFIX", "history")
     
     # AWS
     s3_bucket: str = os.getenv("S3_BUCKET", "")
     s3_prefix: str = os.getenv("S3_PREFIX", "charts")
     aws_region: str = os.getenv("AWS_DEFAULT_REGION", "ap-northeast-1")
+    s3_upload_workers: int = int(os.getenv("S3_UPLOAD_WORKERS", "8"))
+    s3_multipart_threshold_mb: int = int(os.getenv("S3_MULTIPART_THRESHOLD_MB", "8"))
+    
+    # Health heartbeats (s3://$S3_BUCKET/{health_prefix}/heartbeats/, read by the health Lambda)
+    heartbeat_enabled: bool = os.getenv("HEARTBEAT_ENABLED", "true").lower() == "true"
+    health_prefix: str = os.getenv("HEALTH_PREFIX", "health")
+    
+    # Run metrics (CloudWatch embedded metric format in the runner logs)
+    metrics_namespace: str = os.getenv("METRICS_NAMESPACE", "FX/Runner")
+    
+    # Sampling profiler (opt-in; outputs upload next to the run artifacts)
+    profile_enabled: bool = os.getenv("PROFILE_ENABLED", "false").lower() == "true"
+    profile_interval_ms: float = float(os.getenv("PROFILE_INTERVAL_MS", "10"))
+    profile_top_n: int = int(os.getenv("PROFILE_TOP_N", "25"))
+    
+    # Charting
+    chart_workers: int = int(os.getenv("CHART_WORKERS", "0"))  # 0 = render in-process
+    chart_renderer: str = os.getenv("CHART_RENDERER", "mplfinance")  # mplfinance | agg
+    chart_cache_size: int = int(os.getenv("CHART_CACHE_SIZE", "32"))  # 0 = no in-memory cache
+    chart_cache_s3: bool = os.getenv("CHART_CACHE_S3", "false").lower() == "true"
     
     # Notion
     notion_api_key: str = os.getenv("NOTION_API_KEY", "")
     notion_db_id: str = os.getenv("NOTION_DB_ID", "")
+    notion_requests_per_second: float = float(os.getenv("NOTION_REQUESTS_PER_SECOND", "3"))
+    notion_workers: int = int(os.getenv("NOTION_WORKERS", "4"))
     
     # Slack
     slack_webhook_url: str = os.getenv("SLACK_WEBHOOK_URL", "")
     
+    # External publishing (optional)
+    enable_wordpress: bool = os.getenv("ENABLE_WORDPRESS", "false").lower() == "true"
+    enable_twitter: bool = os.getenv("ENABLE_TWITTER", "false").lower() == "true"
+    
     # Model
     model_api_key: Optional[str] = os.getenv("MODEL_API_KEY")
     
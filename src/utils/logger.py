@@ -3,10 +3,41 @@
 import structlog
 import logging
 import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict
 from src.utils.config import config
 
-def setup_logging():
-    """Configure structured logging."""
+_configured = False
+_configure_lock = threading.Lock()
+
+# Error-level events per logger name, drained by ``pop_error_counts``; inside
+# an ``error_scope`` (one run) they are counted for that scope only
+_error_counts: Counter = Counter()
+_error_counts_lock = threading.Lock()
+_scoped_error_counts: ContextVar = ContextVar("error_counts", default=None)
+
+def setup_logging(force: bool = False):
+    """
+    Configure structured logging.
+    
+    Runs once, on the first ``get_logger`` call, so importing this module has
+    no side effects on the root logger.
+    
+    Args:
+        force: Reconfigure even if logging was already set up
+    """
+    global _configured
+    with _configure_lock:
+        if _configured and not force:
+            return
+        _configure()
+        _configured = True
+
+def _configure():
+    """Apply the logging and structlog configuration."""
     
     # Set logging level
     log_level = getattr(logging, config.log_level.upper(), logging.INFO)
@@ -23,6 +54,7 @@ def setup_logging():
         processors=[
             structlog.stdlib.filter_by_level,
             structlog.stdlib.add_logger_name,
+            _count_errors,
             structlog.stdlib.add_log_level,
             structlog.stdlib.PositionalArgumentsFormatter(),
             structlog.processors.TimeStamper(fmt="iso"),
@@ -37,9 +69,34 @@ def setup_logging():
         cache_logger_on_first_use=True,
     )
 
+def _count_errors(logger, method_name: str, event_dict: Dict) -> Dict:
+    """Processor counting error-level events by logger name."""
+    if method_name in ("error", "exception", "critical"):
+        counts = _scoped_error_counts.get()
+        with _error_counts_lock:
+            (_error_counts if counts is None else counts)[event_dict.get("logger", "unknown")] += 1
+    return event_dict
+
+@contextmanager
+def error_scope():
+    """Count error events logged in this context separately (e.g., per run)."""
+    token = _scoped_error_counts.set(Counter())
+    try:
+        yield
+    finally:
+        _scoped_error_counts.reset(token)
+
+def pop_error_counts() -> Dict[str, int]:
+    """Return error counts per logger (of the current scope) since the last call and reset them."""
+    scoped = _scoped_error_counts.get()
+    counts_source = _error_counts if scoped is None else scoped
+    with _error_counts_lock:
+        counts = dict(counts_source)
+        counts_source.clear()
+    return counts
+
 def get_logger(name: str):
     """Get a structured logger instance."""
+    if not _configured:
+        setup_logging()
     return structlog.get_logger(name)
-
-# Initialize logging on import
-setup_logging()
\ No newline at end of file
@@ -0,0 +1,237 @@
+"""Low-overhead wall-clock sampling profiler (stdlib only) for production runs."""
+
+import json
+import os
+import sys
+import sysconfig
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.config import config
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Only one profiler samples the process at a time (batch runs share it)
+_active_lock = threading.Lock()
+
+Stack = Tuple[int, ...]
+
+
+class SamplingProfiler:
+    """
+    Sample the Python stacks of every thread from a background thread.
+
+    Every ``interval_ms`` the sampler reads ``sys._current_frames()`` and
+    counts each thread's stack, so the cost is independent of how many
+    functions run (unlike cProfile's per-call hooks). Samples are wall
+    clock: time blocked on the network or in C code (mplfinance, pandas)
+    is attributed to the Python frame waiting on it.
+
+    Stacks whose leaf is a ``threading`` wait (idle pool workers, waiting
+    on futures) are kept in the flamegraph but left out of the hot
+    function summary.
+    """
+
+    def __init__(self, interval_ms: Optional[float] = None, name: str = "run"):
+        """
+        Initialize profiler.
+
+        Args:
+            interval_ms: Sampling interval (defaults to config.profile_interval_ms)
+            name: Profile name shown in speedscope
+        """
+        self.interval = (interval_ms or config.profile_interval_ms) / 1000
+        self.name = name
+        self.frames: List[Dict] = []
+        self._frame_index: Dict[object, int] = {}
+        self.samples: Dict[str, Counter] = {}
+        self.sample_count = 0
+        self.started = 0.0
+        self.duration_s = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._owns_lock = False
+
+    def __enter__(self) -> "SamplingProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def start(self) -> bool:
+        """
+        Start sampling.
+
+        Returns:
+            False when another profiler is already running in this process
+        """
+        if not _active_lock.acquire(blocking=False):
+            logger.warning("Profiler already running, not profiling this run", name=self.name)
+            return False
+        self._owns_lock = True
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._sample_loop, name="profiler", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread."""
+        if not self._owns_lock:
+            return
+        self._stop.set()
+        self._thread.join()
+        self.duration_s = time.perf_counter() - self.started
+        self._owns_lock = False
+        _active_lock.release()
+
+    @property
+    def active(self) -> bool:
+        """Whether this profiler collected (or is collecting) samples."""
+        return self._thread is not None
+
+    def _sample_loop(self) -> None:
+        """Take one sample per interval until stopped."""
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._frame_id(frame.f_code))
+                    frame = frame.f_back
+                stack.reverse()
+                thread_name = names.get(thread_id, str(thread_id))
+                self.samples.setdefault(thread_name, Counter())[tuple(stack)] += 1
+            self.sample_count += 1
+
+    def _frame_id(self, code) -> int:
+        """Index of a code object in the shared frame table."""
+        index = self._frame_index.get(code)
+        if index is None:
+            index = len(self.frames)
+            self._frame_index[code] = index
+            self.frames.append({
+                "name": getattr(code, "co_qualname", code.co_name),
+                "file": _short_path(code.co_filename),
+                "line": code.co_firstlineno,
+            })
+        return index
+
+    def _label(self, index: int) -> str:
+        """Readable frame name: "qualname (file:line)"."""
+        frame = self.frames[index]
+        return f"{frame['name']} ({frame['file']}:{frame['line']})"
+
+    def _is_idle(self, stack: Stack) -> bool:
+        """Whether a stack is parked in a threading wait."""
+        leaf = self.frames[stack[-1]] if stack else None
+        return leaf is None or (leaf["file"].endswith("threading.py") and leaf["name"].endswith("wait"))
+
+    def collapsed(self) -> str:
+        """Folded stacks ("thread;frame;frame count"), for flamegraph.pl or speedscope."""
+        lines = []
+        for thread_name, stacks in self.samples.items():
+            for stack, count in stacks.items():
+                labels = ";".join(self._label(index).replace(";", ",") for index in stack)
+                lines.append(f"{thread_name};{labels} {count}")
+        return "\n".join(sorted(lines)) + "\n"
+
+    def speedscope(self) -> Dict:
+        """Speedscope file with one sampled profile per thread."""
+        weight = round(self.interval * 1000, 3)
+        profiles = []
+        for thread_name, stacks in sorted(self.samples.items(), key=lambda item: -sum(item[1].values())):
+            total = sum(stacks.values())
+            profiles.append({
+                "type": "sampled",
+                "name": thread_name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": round(total * weight, 3),
+                "samples": [list(stack) for stack in stacks],
+                "weights": [round(count * weight, 3) for count in stacks.values()],
+            })
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": self.name,
+            "exporter": "fx-analysis sampling profiler",
+            "activeProfileIndex": 0,
+            "shared": {"frames": self.frames},
+            "profiles": profiles,
+        }
+
+    def top(self, n: Optional[int] = None) -> List[Dict]:
+        """
+        Hottest functions over the busy (non-idle) samples.
+
+        Args:
+            n: Number of functions (defaults to config.profile_top_n)
+
+        Returns:
+            Dicts with function, self/total sample counts and percentages,
+            sorted by self time
+        """
+        own: Counter = Counter()
+        total: Counter = Counter()
+        busy = 0
+        for stacks in self.samples.values():
+            for stack, count in stacks.items():
+                if self._is_idle(stack):
+                    continue
+                busy += count
+                own[stack[-1]] += count
+                for index in set(stack):
+                    total[index] += count
+
+        ranked = sorted(total, key=lambda index: (own[index], total[index]), reverse=True)
+        return [
+            {
+                "function": self._label(index),
+                "self_samples": own[index],
+                "total_samples": total[index],
+                "self_pct": round(own[index] / busy * 100, 1) if busy else 0.0,
+                "total_pct": round(total[index] / busy * 100, 1) if busy else 0.0,
+            }
+            for index in ranked[:n or config.profile_top_n]
+        ]
+
+    def summary(self, n: Optional[int] = None) -> Dict:
+        """Profile metadata plus the top-N hot functions."""
+        return {
+            "name": self.name,
+            "duration_s": round(self.duration_s, 3),
+            "interval_ms": round(self.interval * 1000, 3),
+            "samples": self.sample_count,
+            "threads": {name: sum(stacks.values()) for name, stacks in self.samples.items()},
+            "top": self.top(n),
+        }
+
+    def artifacts(self) -> Dict[str, Tuple[bytes, str]]:
+        """
+        Serialized outputs keyed by file suffix.
+
+        Returns:
+            Dict of suffix to (body, content type)
+        """
+        return {
+            "speedscope.json": (json.dumps(self.speedscope(), separators=(",", ":")).encode("utf-8"), "application/json"),
+            "collapsed.txt": (self.collapsed().encode("utf-8"), "text/plain"),
+            "top.json": (json.dumps(self.summary(), indent=2).encode("utf-8"), "application/json"),
+        }
+
+
+def _short_path(path: str) -> str:
+    """Trim site-packages, stdlib and working directory prefixes from a file path."""
+    marker = f"site-packages{os.sep}"
+    if marker in path:
+        return path.split(marker, 1)[1]
+    for prefix in (os.getcwd(), sysconfig.get_paths()["stdlib"]):
+        if path.startswith(prefix + os.sep):
+            return path[len(prefix) + 1:]
+    return path
@@ -0,0 +1,78 @@
+"""Thread-safe token-bucket rate limiting."""
+
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Token bucket shared between worker threads.
+
+    Tokens refill continuously at ``rate`` per ``period`` seconds up to
+    ``capacity``. ``acquire`` blocks until enough tokens are available.
+    """
+
+    def __init__(self, rate: float, period: float = 60.0, capacity: Optional[float] = None):
+        """
+        Initialize token bucket.
+
+        Args:
+            rate: Tokens granted per period (e.g., API credits per minute)
+            period: Period length in seconds
+            capacity: Maximum burst size (defaults to ``rate``)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.rate = rate
+        self.period = period
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        """Add tokens earned since the last refill (caller holds the lock)."""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate / self.period)
+        self._last_refill = now
+
+    def set_rate(self, rate: float) -> None:
+        """
+        Change the refill rate, e.g. to back off after throttling.
+
+        Args:
+            rate: New tokens per period (capacity is left unchanged)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        with self._lock:
+            self._refill()
+            self.rate = rate
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Block until ``tokens`` are available and consume them.
+
+        Args:
+            tokens: Number of tokens to consume
+
+        Returns:
+            Seconds spent waiting
+        """
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot acquire {tokens} tokens from bucket of capacity {self.capacity}")
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                wait = (tokens - self._tokens) * self.period / self.rate
+            time.sleep(wait)
+            waited += wait